@@ -1,5 +1,25 @@
 import tkinter as tk
+from tkinter import filedialog
+import os
 import random 
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from array import array
+from dfs_core import CSRGraph
+from dfs_cache import DFS_CACHE, layout_key
+from dfs_incremental import IncrementalDFS
+import dfs_analytics
+import perf_stats
+from spatial_index import GridIndex
+import dfs_trace
+from dfs_trace import record_dfs, open_trace, save_trace, MappedTrace, TraceFileWriter
+from graph_gen import generate_graph, random_positions
+from graph_import import load_graph
+from graph_layout import ForceLayout, LayoutJob, can_layout
+import frame_export
+from frame_export import ARROW_SHAPE, edge_line
 
 #added colors for the UI, better readability 
 PRIMARY_BG = "#f5f7fa"
@@ -13,6 +33,22 @@ TRACKER_BORDER = "#3a506b"
 BUTTON_BG = "#5c7cfa"
 BUTTON_FG = "#ffffff"
 HIGHLIGHT_COLOR = "#ffd6a5"
+EDGE_COLOR = "#adb5bd"
+MARK_COLOR = "#e03131"  # cut vertices, bridges and cycle edges in the analysis view
+GROUP_COLORS = ["#a7c7e7", "#b6e2d3", "#ffe066", "#ffadad", "#d0bfff", "#ffd6a5", "#99e9f2", "#c0eb75"]
+LAYOUT_POLL_MS = 50
+ROUND_POLL_MS = 30
+PAGE_CACHE_SIZE = None  # pages kept alive by ProjectScreen; None keeps all of them
+WARM_UP_MS = 20
+IMPORT_DRAW_LIMIT = 30  # imported graphs up to this many nodes are drawn on the step-through pages
+TRACE_TO_DISK_EDGES = 1 << 20  # record traces of bigger imported graphs to a temporary file
+PERF_REFRESH_MS = 500
+PERF_ROWS = 10
+FRAME_FILETYPES = [("SVG frames", "*.svg"), ("PostScript frames", "*.eps"), ("PNG frames", "*.png")]
+FRAME_FORMATS = {".svg": "svg", ".eps": "ps", ".ps": "ps", ".png": "png"}
+EXPORT_POLL_MS = 200
+GRAPH_FILETYPES = [("Edge lists", "*.txt *.edges *.el *.tsv *.gz"), ("CSV files", "*.csv"), ("CSR graphs", "*.csr"),
+                   ("All files", "*")]
 
 DFSCode = """
 def dfs(start):
@@ -32,14 +68,11 @@ def dfs(start):
 """
 
 def draw_directed_edge(canvas, x1, y1, x2, y2, r, **kw):
-    dx, dy = x2 - x1, y2 - y1
-    dist = (dx*dx + dy*dy) ** 0.5
-    if dist == 0:
+    # same geometry as the frames frame_export writes
+    line = edge_line(x1, y1, x2, y2, r)
+    if line is None:
         return
-    ux, uy = dx / dist, dy / dist
-    sx, sy = x1 + ux * r, y1 + uy * r
-    ex, ey = x2 - ux * r, y2 - uy * r
-    canvas.create_line(sx, sy, ex, ey, arrow=tk.LAST, arrowshape=(16, 18, 8), width=2, **kw)
+    canvas.create_line(*line, arrow=tk.LAST, arrowshape=ARROW_SHAPE, width=2, **kw)
 
 def draw_graph(canvas, nodes, edges, node_radius=20):
     for u, v in edges:
@@ -52,6 +85,239 @@ def draw_graph(canvas, nodes, edges, node_radius=20):
                            fill=NODE_COLOR, outline=NODE_OUTLINE, width=3, tags=f"node_{node_id}")
         canvas.create_text(x, y, text=str(node_id), font=("Arial", 16, "bold"), fill=NODE_OUTLINE, tags=f"label_{node_id}")
 
+# ----------- Large-graph view ------------
+# Draws a CSR graph through a zoom/pan transform. Only nodes inside the
+# viewport (found with the spatial index) get canvas items, and those items
+# come from pools that are re-used between renders instead of delete("all").
+# Zoomed out, labels and arrowheads are dropped; undirected edges draw once.
+LABEL_MIN_ZOOM = 0.6
+ARROW_MIN_ZOOM = 0.8
+EDGE_MIN_ZOOM = 0.05
+MIN_NODE_PX = 2
+MAX_NODE_ITEMS = 4000
+CROWD_CELL_PX = 8
+
+class ItemPool:
+    def __init__(self, canvas, kind, tag):
+        self.canvas = canvas
+        self.create = getattr(canvas, "create_" + kind)
+        self.tag = tag
+        self.items = []
+        self.used = 0
+        self.shown = 0
+        self.created = False
+
+    def begin(self):
+        self.used = 0
+        self.created = False
+
+    def take(self, coords, **kw):
+        if self.used < len(self.items):
+            item = self.items[self.used]
+            self.canvas.coords(item, *coords)
+            self.canvas.itemconfig(item, state=tk.NORMAL, **kw)
+        else:
+            item = self.create(*coords, tags=self.tag, **kw)
+            self.items.append(item)
+            self.created = True
+        self.used += 1
+        return item
+
+    def finish(self):
+        # hide whatever was on screen last time but is not needed now
+        for item in self.items[self.used:self.shown]:
+            self.canvas.itemconfig(item, state=tk.HIDDEN)
+        self.shown = self.used
+
+class GraphView:
+    def __init__(self, canvas, radius=20, font=("Arial", 14, "bold")):
+        self.canvas = canvas
+        self.radius = radius
+        self.font = font
+        self.scale = 1.0
+        self.ox = 0.0
+        self.oy = 0.0
+        self.graph = None
+        self.spatial = None
+        self.directed = False
+        self.styles = {}
+        self.edge_styles = {}  # (u, v) -> color; undirected edges keyed with u < v
+        self.node_items = {}
+        self._pending = None
+        self._drag = None
+        self.edge_pool = ItemPool(canvas, "line", "edge")
+        self.node_pool = ItemPool(canvas, "oval", "node")
+        self.label_pool = ItemPool(canvas, "text", "label")
+
+    def bind_navigation(self):
+        # wheel zooms around the cursor, right-drag pans
+        c = self.canvas
+        c.bind("<MouseWheel>", lambda e: self.zoom_at(e.x, e.y, 1.2 if e.delta > 0 else 1 / 1.2))
+        c.bind("<Button-4>", lambda e: self.zoom_at(e.x, e.y, 1.2))
+        c.bind("<Button-5>", lambda e: self.zoom_at(e.x, e.y, 1 / 1.2))
+        c.bind("<ButtonPress-3>", self.start_pan)
+        c.bind("<B3-Motion>", self.pan)
+
+    def load(self, graph, spatial, directed=False):
+        self.graph = graph
+        self.spatial = spatial
+        self.directed = directed
+        self.styles = {}
+        self.edge_styles = {}
+        self.fit()
+        self.render()
+
+    def clear(self):
+        for pool in (self.edge_pool, self.node_pool, self.label_pool):
+            pool.begin()
+            pool.finish()
+        self.node_items = {}
+
+    def viewport_size(self):
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if w <= 1 or h <= 1:
+            # not mapped yet, fall back to the requested size
+            w, h = int(self.canvas.cget("width")), int(self.canvas.cget("height"))
+        return w, h
+
+    def fit(self, margin=30):
+        xs, ys, r = self.spatial.xs, self.spatial.ys, self.radius
+        self.scale, self.ox, self.oy = 1.0, 0.0, 0.0
+        if not xs:
+            return
+        min_x, max_x, min_y, max_y = min(xs), max(xs), min(ys), max(ys)
+        w, h = self.viewport_size()
+        if min_x - r >= 0 and min_y - r >= 0 and max_x + r <= w and max_y + r <= h:
+            return  # already fits: keep the 1:1 layout small graphs are drawn with
+        self.scale = min((w - 2 * margin) / max(max_x - min_x, 1), (h - 2 * margin) / max(max_y - min_y, 1))
+        self.ox = min_x - margin / self.scale
+        self.oy = min_y - margin / self.scale
+
+    def to_world(self, sx, sy):
+        return sx / self.scale + self.ox, sy / self.scale + self.oy
+
+    def zoom_at(self, sx, sy, factor):
+        wx, wy = self.to_world(sx, sy)
+        self.scale *= factor
+        self.ox = wx - sx / self.scale
+        self.oy = wy - sy / self.scale
+        self.request_render()
+
+    def start_pan(self, event):
+        self._drag = (event.x, event.y)
+
+    def pan(self, event):
+        if self._drag is None:
+            return
+        self.ox -= (event.x - self._drag[0]) / self.scale
+        self.oy -= (event.y - self._drag[1]) / self.scale
+        self._drag = (event.x, event.y)
+        self.request_render()
+
+    def request_render(self):
+        # coalesce bursts of wheel / drag events into one redraw
+        if self._pending is None:
+            self._pending = self.canvas.after_idle(self.render)
+
+    def set_node_style(self, node_id, fill=NODE_COLOR, outline=NODE_OUTLINE):
+        if fill == NODE_COLOR and outline == NODE_OUTLINE:
+            self.styles.pop(node_id, None)
+        else:
+            self.styles[node_id] = (fill, outline)
+        item = self.node_items.get(node_id)
+        if item is not None:
+            self.canvas.itemconfig(item, fill=fill, outline=outline)
+
+    def set_styles(self, node_fills, edge_fills=None):
+        # replace every node / edge color at once (analysis results), one redraw
+        self.styles = {u: (fill, NODE_OUTLINE) for u, fill in node_fills.items()}
+        self.edge_styles = edge_fills or {}
+        self.request_render()
+
+    @perf_stats.timed("graph_view.render")
+    def render(self):
+        self._pending = None
+        if self.graph is None:
+            return
+        s, ox, oy = self.scale, self.ox, self.oy
+        w, h = self.viewport_size()
+        x0, y0 = self.to_world(0, 0)
+        x1, y1 = self.to_world(w, h)
+        pad = self.radius
+        visible = self.spatial.query_rect(x0 - pad, y0 - pad, x1 + pad, y1 + pad)
+        xs, ys = self.spatial.xs, self.spatial.ys
+        rs = max(self.radius * s, MIN_NODE_PX)
+        for pool in (self.edge_pool, self.node_pool, self.label_pool):
+            pool.begin()
+
+        if len(visible) > MAX_NODE_ITEMS:
+            self.render_crowded(visible)
+            return
+
+        if s >= EDGE_MIN_ZOOM:
+            neighbors = self.graph.neighbors  # CSRGraph or an EditableGraph being edited
+            edge_styles = self.edge_styles
+            on_screen = bytearray(self.graph.n)
+            for u in visible:
+                on_screen[u] = 1
+            if s >= ARROW_MIN_ZOOM:
+                arrow, width = (tk.LAST if self.directed else tk.BOTH), 2
+            else:
+                arrow, width = tk.NONE, 1
+            # Directed graphs only get the out-edges of visible nodes; undirected
+            # edges with both ends visible are drawn from the lower id only.
+            for u in visible:
+                ux, uy = (xs[u] - ox) * s, (ys[u] - oy) * s
+                for v in neighbors(u):
+                    if not self.directed and on_screen[v] and v < u:
+                        continue
+                    vx, vy = (xs[v] - ox) * s, (ys[v] - oy) * s
+                    dx, dy = vx - ux, vy - uy
+                    dist = (dx * dx + dy * dy) ** 0.5
+                    if dist <= 2 * rs:
+                        continue
+                    tx, ty = dx / dist * rs, dy / dist * rs
+                    fill = edge_styles.get((u, v) if self.directed or u < v else (v, u), EDGE_COLOR) if edge_styles else EDGE_COLOR
+                    self.edge_pool.take((ux + tx, uy + ty, vx - tx, vy - ty), fill=fill, width=width if fill == EDGE_COLOR else width + 2,
+                                        arrow=arrow, arrowshape=(16, 18, 8))
+
+        show_labels = s >= LABEL_MIN_ZOOM
+        labels, styles = self.graph.labels, self.styles
+        outline_width = 3 if rs >= 6 else 1
+        self.node_items = {}
+        for u in visible:
+            cx, cy = (xs[u] - ox) * s, (ys[u] - oy) * s
+            fill, outline = styles.get(u, (NODE_COLOR, NODE_OUTLINE))
+            self.node_items[u] = self.node_pool.take((cx - rs, cy - rs, cx + rs, cy + rs),
+                                                     fill=fill, outline=outline, width=outline_width)
+            if show_labels:
+                self.label_pool.take((cx, cy), text=str(labels[u]), font=self.font, fill=NODE_OUTLINE)
+
+        for pool in (self.edge_pool, self.node_pool, self.label_pool):
+            pool.finish()
+        if self.edge_pool.created or self.node_pool.created or self.label_pool.created:
+            self.canvas.tag_raise("node")
+            self.canvas.tag_raise("label")
+
+    def render_crowded(self, visible):
+        # Too many nodes on screen to draw one by one: draw one dot per
+        # CROWD_CELL_PX screen cell instead, and no edges or labels.
+        s, ox, oy = self.scale, self.ox, self.oy
+        xs, ys, styles = self.spatial.xs, self.spatial.ys, self.styles
+        cells = {}
+        for u in visible:
+            key = (int((xs[u] - ox) * s) // CROWD_CELL_PX, int((ys[u] - oy) * s) // CROWD_CELL_PX)
+            if key not in cells or u in styles:
+                cells[key] = u
+        half = CROWD_CELL_PX // 2 - 1
+        for (kx, ky), u in cells.items():
+            cx, cy = kx * CROWD_CELL_PX + half, ky * CROWD_CELL_PX + half
+            fill, outline = styles.get(u, (NODE_COLOR, NODE_OUTLINE))
+            self.node_pool.take((cx - half, cy - half, cx + half, cy + half), fill=fill, outline=fill, width=1)
+        self.node_items = {}
+        for pool in (self.edge_pool, self.node_pool, self.label_pool):
+            pool.finish()
+
 # ----------- Home Button Class ------------
 class HomeButtonMixin:
     def add_home_button(self, master):
@@ -59,14 +325,147 @@ class HomeButtonMixin:
                                 font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG, activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0)
         home_button.place(x=10, y=10)
 
-# ----------- Graph Node Class ------------
-class GraphNode:
-    def __init__(self, name, x, y, neighbors):
-        self.name = name
-        self.x = x
-        self.y = y
-        self.neighbors = neighbors
-        self.visited = False
+def ask_graph_path():
+    return filedialog.askopenfilename(title="Open graph (edge list, SNAP, CSV or .csr)", filetypes=GRAPH_FILETYPES)
+
+# ---------- Virtualized list ----------
+# Keeps the items in a Python list and only puts the rows that fit in the
+# Listbox into Tk. Appends and pops at the end (which is all a DFS stack or
+# visited order ever does) touch one or two rows, not the whole list, and
+# all changes made in one event-loop turn are written out in one after_idle.
+class VirtualList(tk.Frame):
+    def __init__(self, master, rows=8, **listbox_kw):
+        super().__init__(master, bg=master.cget("bg"))
+        self.rows = rows
+        self.items = []
+        self.top = 0
+        self.follow = True  # keep the newest item in view until the user scrolls up
+        self.shown = []
+        self._refresh_job = None
+        self.listbox = tk.Listbox(self, height=rows, **listbox_kw)
+        self.listbox.pack(side=tk.LEFT)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll_by(-1))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll_by(1))
+
+    def __len__(self):
+        return len(self.items)
+
+    def set_items(self, items):
+        self.items = items if isinstance(items, LazyLabels) else list(items)
+        self.follow = True
+        self.changed()
+
+    def append(self, item):
+        self.items.append(item)
+        self.changed()
+
+    def pop(self):
+        item = self.items.pop()
+        self.changed()
+        return item
+
+    def truncate(self, length):
+        del self.items[length:]
+        self.changed()
+
+    def clear(self):
+        self.set_items([])
+
+    def scroll_by(self, delta):
+        self.scroll_to(self.top + delta)
+
+    def scroll_to(self, top):
+        last = max(0, len(self.items) - self.rows)
+        self.top = min(max(0, top), last)
+        self.follow = self.top == last
+        self.changed()
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.items)))
+        elif unit == "pages":
+            self.scroll_by(int(amount) * self.rows)
+        else:
+            self.scroll_by(int(amount))
+
+    def changed(self):
+        if self._refresh_job is None:
+            self._refresh_job = self.after_idle(self.refresh)
+
+    @perf_stats.timed("tracker.refresh")
+    def refresh(self):
+        self._refresh_job = None
+        if not self.winfo_exists():
+            return
+        total = len(self.items)
+        if self.follow:
+            self.top = max(0, total - self.rows)
+        else:
+            self.top = min(self.top, max(0, total - self.rows))
+        window = self.items[self.top:self.top + self.rows]
+        shown, box = self.shown, self.listbox
+        if window != shown:
+            # apply the smallest edit: slide by one, or rewrite from the first changed row
+            if len(shown) == len(window) == self.rows and shown[1:] == window[:-1]:
+                box.delete(0)
+                box.insert(tk.END, window[-1])
+            else:
+                same = 0
+                while same < len(shown) and same < len(window) and shown[same] == window[same]:
+                    same += 1
+                if same < len(shown):
+                    box.delete(same, tk.END)
+                if same < len(window):
+                    box.insert(tk.END, *window[same:])
+            self.shown = window
+        if total > self.rows:
+            self.scrollbar.set(self.top / total, (self.top + len(window)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+class LazyLabels:
+    # labels[ids[i]] for the first `length` ids, then any items appended later;
+    # a far seek hands the tracker millions of entries without building them,
+    # and only the rows on screen are ever looked up
+    def __init__(self, labels, ids, length):
+        self.labels = labels
+        self.ids = ids
+        self.length = length
+        self.tail = []
+
+    def __len__(self):
+        return self.length + len(self.tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < self.length:
+            return self.labels[self.ids[index]]
+        return self.tail[index - self.length]
+
+    def __delitem__(self, index):
+        # only `del items[k:]`, which is all VirtualList.truncate needs
+        start = index.indices(len(self))[0]
+        if start <= self.length:
+            self.length, self.tail = start, []
+        else:
+            del self.tail[start - self.length:]
+
+    def append(self, item):
+        self.tail.append(item)
+
+    def pop(self):
+        if self.tail:
+            return self.tail.pop()
+        if not self.length:
+            raise IndexError("pop from empty list")
+        self.length -= 1
+        return self.labels[self.ids[self.length]]
 
 # ---------- Tracker panel ----------
 class TrackerPanel(tk.Frame):
@@ -74,38 +473,155 @@ class TrackerPanel(tk.Frame):
         super().__init__(master, bd=2, relief=tk.GROOVE, bg=TRACKER_BG, highlightbackground=TRACKER_BORDER, highlightthickness=2)
         tk.Label(self, text=title, font=("Arial", 13, "bold"), bg=TRACKER_BG, fg=NODE_OUTLINE).pack(pady=6)
         tk.Label(self, text="Stack (bottom → top)", bg=TRACKER_BG, fg=NODE_OUTLINE).pack(anchor="w", padx=8)
-        self.stack_box = tk.Listbox(self, width=22, height=8, font=("Arial", 12), bg="#f8f9fa", fg=NODE_OUTLINE, bd=1, relief=tk.FLAT)
+        self.stack_box = VirtualList(self, rows=8, width=22, font=("Arial", 12), bg="#f8f9fa", fg=NODE_OUTLINE, bd=1, relief=tk.FLAT)
         self.stack_box.pack(padx=8, pady=4)
         tk.Label(self, text="Visited order", bg=TRACKER_BG, fg=NODE_OUTLINE).pack(anchor="w", padx=8)
-        self.visited_box = tk.Listbox(self, width=22, height=8, font=("Arial", 12), bg="#f8f9fa", fg=NODE_OUTLINE, bd=1, relief=tk.FLAT)
+        self.visited_box = VirtualList(self, rows=8, width=22, font=("Arial", 12), bg="#f8f9fa", fg=NODE_OUTLINE, bd=1, relief=tk.FLAT)
         self.visited_box.pack(padx=8, pady=4)
 
     def set_stack(self, items):
-        self.stack_box.delete(0, tk.END)
-        for it in items:
-            self.stack_box.insert(tk.END, it)
+        self.stack_box.set_items(items)
 
     def set_visited(self, items):
-        self.visited_box.delete(0, tk.END)
-        for it in items:
-            self.visited_box.insert(tk.END, it)
+        self.visited_box.set_items(items)
+
+    # incremental updates, constant Tk work per DFS step
+    def push_stack(self, item):
+        self.stack_box.append(item)
+
+    def pop_stack(self):
+        return self.stack_box.pop()
+
+    def append_visited(self, item):
+        self.visited_box.append(item)
+
+    def pop_visited(self):
+        return self.visited_box.pop()
+
+    def truncate_visited(self, length):
+        self.visited_box.truncate(length)
+
+    def clear(self):
+        self.stack_box.clear()
+        self.visited_box.clear()
 
 # ----------- Main App ------------
 class ProjectScreen(tk.Tk):
-    def __init__(self):
+    def __init__(self, cache_size=PAGE_CACHE_SIZE):
         super().__init__()
         self.geometry("900x650")
         self.title("DFS Visualizer")
         self.configure(bg=PRIMARY_BG)
         self._frame = None
+        # built pages by class, least recently shown first; pages are hidden
+        # and shown again instead of rebuilt, so they keep their state
+        self._pages = OrderedDict()
+        self.cache_size = cache_size
         self.switch_frame(StartPage)
-
+        # F12 shows the timing overlay (and turns instrumentation on while it is up)
+        self.perf_overlay = PerfOverlay(self)
+        self.bind_all("<F12>", lambda e: self.perf_overlay.toggle())
+        if perf_stats.enabled():
+            self.perf_overlay.show()
+        self.after(WARM_UP_MS, self.warm_up, [WhatDFSPage, PracticeProblemTreePage, GraphProblemPage, DFSPage])
+
+    def get_page(self, frame_class):
+        page = self._pages.get(frame_class)
+        if page is None:
+            page = frame_class(self)
+            self._pages[frame_class] = page
+        self._pages.move_to_end(frame_class)
+        return page
+
+    @perf_stats.timed("switch_frame")
     def switch_frame(self, frame_class):
-        new_frame = frame_class(self)
+        new_frame = self.get_page(frame_class)
+        if new_frame is self._frame:
+            return
         if self._frame is not None:
-            self._frame.destroy()
+            self._frame.pack_forget()
         self._frame = new_frame
         self._frame.pack(fill='both', expand=True)
+        self.evict_pages()
+
+    def evict_pages(self):
+        # drop the least recently shown pages over the cache limit
+        if self.cache_size is None:
+            return
+        for frame_class in list(self._pages):
+            if len(self._pages) <= max(self.cache_size, 1):
+                break
+            if self._pages[frame_class] is not self._frame:
+                self._pages.pop(frame_class).destroy()
+
+    def warm_up(self, classes):
+        # build the heavier pages one per idle slot, hidden, so the first visit is instant
+        if not classes:
+            return
+        frame_class = classes[0]
+        if frame_class not in self._pages and (self.cache_size is None or len(self._pages) < self.cache_size):
+            self._pages[frame_class] = frame_class(self)
+            self._pages.move_to_end(frame_class, last=False)
+        self.after(WARM_UP_MS, self.warm_up, classes[1:])
+
+# ----------- Timing overlay ------------
+# Heaviest timers from perf_stats (calls, mean / p95 / max in ms) and the
+# counters, refreshed every PERF_REFRESH_MS, with JSON / CSV export.
+class PerfOverlay(tk.Frame):
+    def __init__(self, master):
+        super().__init__(master, bg=NODE_OUTLINE, bd=0)
+        self.text = tk.Label(self, font=("Courier New", 10), justify="left", anchor="w", bg="#f8f9fa", fg=NODE_OUTLINE)
+        self.text.pack(padx=1, pady=(1, 0))
+        buttons = tk.Frame(self, bg=NODE_OUTLINE)
+        buttons.pack(fill="x")
+        for text, command in (("Export JSON", lambda: self.export("json")), ("Export CSV", lambda: self.export("csv")),
+                              ("Reset", perf_stats.REGISTRY.reset)):
+            tk.Button(buttons, text=text, command=command, font=("Arial", 9), bg=BUTTON_BG, fg=BUTTON_FG,
+                      activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0, padx=6).pack(side="left", padx=2, pady=2)
+        self.lag = perf_stats.LagMonitor(master)
+        self.shown = False
+        self._job = None
+
+    def toggle(self):
+        if self.shown:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        perf_stats.enable()
+        self.lag.start()
+        self.shown = True
+        self.place(relx=1.0, x=-10, y=10, anchor="ne")
+        self.refresh()
+
+    def hide(self):
+        perf_stats.disable()
+        self.lag.stop()
+        self.shown = False
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+        self.place_forget()
+
+    def refresh(self):
+        rows = perf_stats.REGISTRY.rows()
+        lines = [f"{'timer':<26}{'calls':>7}{'mean':>8}{'p95':>8}{'max':>8}"]
+        for row in [r for r in rows if "total_ms" in r][:PERF_ROWS]:
+            lines.append(f"{row['name'][:26]:<26}{row['count']:>7}{row['mean_ms']:>8.2f}{row['p95_ms']:>8.2f}{row['max_ms']:>8.2f}")
+        lines.extend(f"{row['name'][:26]:<26}{row['count']:>7}" for row in rows if "total_ms" not in row)
+        self.text.config(text="\n".join(lines))
+        self.lift()  # pages packed later would cover it
+        self._job = self.after(PERF_REFRESH_MS, self.refresh)
+
+    def export(self, kind):
+        path = filedialog.asksaveasfilename(title="Export timings", defaultextension=f".{kind}", filetypes=[(kind.upper(), f"*.{kind}")])
+        if not path:
+            return
+        if kind == "json":
+            perf_stats.REGISTRY.export_json(path)
+        else:
+            perf_stats.REGISTRY.export_csv(path)
 
 # ----------- Start Page ------------
 class StartPage(tk.Frame, HomeButtonMixin):
@@ -143,8 +659,366 @@ class WhatDFSPage(tk.Frame, HomeButtonMixin):
         tk.Button(self, text="Graph Problem", command=lambda: master.switch_frame(GraphProblemPage),
                   font=("Arial", 13, "bold"), bg=BUTTON_BG, fg=BUTTON_FG, activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0, padx=12, pady=6).pack(pady=5)
 
+# ----------- Auto-play scheduler ------------
+# Calls advance(n) at most `fps` times a second with however many steps are
+# due at the current speed. When rendering can't keep up, the steps that
+# piled up are handed over in one go (intermediate frames are skipped) and
+# the next tick is only scheduled once this one is done, so the Tk event
+# queue never backs up.
+class AutoPlayer:
+    def __init__(self, widget, advance, speed=5, fps=30):
+        self.widget = widget
+        self.advance = advance  # advance(n) -> False once there is nothing left to play
+        self.speed = speed      # steps per second
+        self.fps = fps
+        self.playing = False
+        self._job = None
+        self._last = 0.0
+        self._owed = 0.0
+
+    def play(self):
+        if not self.playing:
+            self.playing = True
+            self._last = time.perf_counter()
+            self._owed = 1.0  # show the first step right away
+            self._job = self.widget.after(0, self._tick)
+
+    def pause(self):
+        self.playing = False
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def set_speed(self, speed):
+        self.speed = speed
+
+    def _tick(self):
+        self._job = None
+        if not self.playing:
+            return
+        now = time.perf_counter()
+        self._owed += (now - self._last) * self.speed
+        self._last = now
+        steps = int(self._owed)
+        self._owed -= steps
+        if steps and not self.advance(steps):
+            self.pause()
+            return
+        spent_ms = (time.perf_counter() - now) * 1000
+        self._job = self.widget.after(max(1, int(1000 / self.fps - spent_ms)), self._tick)
+
+# ----------- Trace playback ------------
+# Shared by the step-through pages: plays a DFSTrace one event at a time,
+# applying each event to the tracker as a delta (push / pop / append), and
+# seeks through checkpoints when jumping far ahead or back. Node colors, the
+# step text, the code highlight and the slider are only written to Tk once
+# per batch (in an after_idle), however many steps the batch covered.
+PLAY_SPEEDS = {"1 step/s": 1, "5 steps/s": 5, "20 steps/s": 20, "100 steps/s": 100,
+               "1,000 steps/s": 1000, "10,000 steps/s": 10000, "100,000 steps/s": 100000}
+SEEK_INSTEAD_OF_REPLAY = 256
+
+class TracePlayerMixin:
+    def load_trace(self, trace):
+        self.trace = trace
+        self.current_step = -1
+        self.step_scale.config(to=len(trace))
+        self.code_text.tag_config("highlight", background=HIGHLIGHT_COLOR)
+        self.show_step()
+
+    def add_step_controls(self, master):
+        self.pending_nodes = {}
+        self.pending_step = False
+        self._render_job = None
+        self.pending_graph = None
+        self.player = AutoPlayer(self, self.advance, speed=PLAY_SPEEDS["5 steps/s"])
+
+        self.play_button = tk.Button(master, text="▶ Play", command=self.toggle_play, width=7,
+                                     font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG, activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0, padx=12, pady=6)
+        self.play_button.pack(side="left", padx=10)
+        self.speed_var = tk.StringVar(self, value="5 steps/s")
+        speed_menu = tk.OptionMenu(master, self.speed_var, *PLAY_SPEEDS, command=lambda label: self.player.set_speed(PLAY_SPEEDS[label]))
+        speed_menu.config(font=("Arial", 11), bg=ACCENT_BG, fg=NODE_OUTLINE, bd=0, highlightthickness=0)
+        speed_menu.pack(side="left", padx=6)
+
+        # the slider and the file actions get a row of their own under `master`
+        row = tk.Frame(self, bg=PRIMARY_BG)
+        row.pack(pady=(0, 6))
+        self.step_scale = tk.Scale(row, from_=0, to=0, orient=tk.HORIZONTAL, length=240, showvalue=True,
+                                   bg=PRIMARY_BG, fg=NODE_OUTLINE, highlightthickness=0, troughcolor=ACCENT_BG)
+        self.step_scale.bind("<ButtonRelease-1>", lambda e: self.goto_step(self.step_scale.get() - 1))
+        self.step_scale.pack(side="left", padx=10)
+
+        file_button = tk.Menubutton(row, text="File ▾", font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG,
+                                    activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0, padx=12, pady=6)
+        file_menu = tk.Menu(file_button, tearoff=0, font=("Arial", 11))
+        for text, command in (("Open Trace…", self.open_trace_file), ("Save Trace…", self.save_trace_file),
+                              ("Open Graph…", self.open_graph_file), ("Export Frames…", self.export_frames)):
+            file_menu.add_command(label=text, command=command)
+        file_button.config(menu=file_menu)
+        file_button.pack(side="left", padx=10)
+
+    def open_trace_file(self):
+        path = filedialog.askopenfilename(title="Open DFS trace", filetypes=[("DFS traces", "*.dfstrace"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            trace = open_trace(path)
+        except (OSError, ValueError) as e:
+            self.text_label.config(text=f"Could not open trace: {e}")
+            return
+        self.stop_playing()
+        self.goto_step(-1)
+        if isinstance(self.trace, MappedTrace):
+            self.trace.close()
+        self.load_trace(trace)
+
+    def save_trace_file(self):
+        path = filedialog.asksaveasfilename(title="Save DFS trace", defaultextension=".dfstrace", filetypes=[("DFS traces", "*.dfstrace")])
+        if not path:
+            return
+        if isinstance(self.trace, MappedTrace) and os.path.exists(path) and os.path.samefile(path, self.trace.path):
+            # rewriting the file we are reading from would pull the pages out from under the map
+            self.text_label.config(text=f"This trace is already saved as {os.path.basename(path)}.")
+            return
+        tmp = path + ".tmp"
+        try:
+            save_trace(self.trace, tmp).close()
+            os.replace(tmp, path)  # a new file: anyone mapping the old one keeps reading it
+        except OSError as e:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            self.text_label.config(text=f"Could not save trace: {e}")
+            return
+        self.text_label.config(text=f"💾 Saved {os.path.basename(path)}.")
+
+    # ---------- Frame export ----------
+    def export_frames(self):
+        # one picture per step into the chosen folder (walk.svg -> walk000000.svg, ...),
+        # encoded by worker processes while the page stays usable
+        if not self.nodes:
+            self.text_label.config(text="This graph is too big to draw, so there are no frames to export.")
+            return
+        path = filedialog.asksaveasfilename(title="Export frames", defaultextension=".svg", filetypes=FRAME_FILETYPES)
+        if not path:
+            return
+        prefix, ext = os.path.splitext(os.path.basename(path))
+        labels = self.trace.labels
+        positions = {str(name): xy for name, xy in self.nodes.items()}
+        ids = {str(labels[u]): u for u in range(len(labels))}
+        if set(ids) != set(positions):
+            self.text_label.config(text="This trace is for a different graph than the one drawn here.")
+            return
+        xs = [positions[str(labels[u])][0] for u in range(len(labels))]
+        ys = [positions[str(labels[u])][1] for u in range(len(labels))]
+        us = [ids[str(u)] for u, _ in self.edges]
+        vs = [ids[str(v)] for _, v in self.edges]
+        self.frames_done = 0
+        pool = ThreadPoolExecutor(max_workers=1)
+        job = pool.submit(frame_export.export_frames, self.trace, xs, ys, us, vs, os.path.dirname(path),
+                          FRAME_FORMATS.get(ext.lower(), "svg"), prefix=prefix,
+                          progress=lambda done: setattr(self, "frames_done", done))
+        pool.shutdown(wait=False)
+        self.after(EXPORT_POLL_MS, self.wait_for_frames, job, len(self.trace) + 1)
+
+    def wait_for_frames(self, job, total):
+        if not job.done():
+            self.text_label.config(text=f"🎞️ Exported {self.frames_done:,} of {total:,} frames...")
+            self.after(EXPORT_POLL_MS, self.wait_for_frames, job, total)
+            return
+        try:
+            self.text_label.config(text=f"🎞️ Exported {job.result():,} frames.")
+        except Exception as e:  # includes BrokenProcessPool; export_frames already shut its pool down
+            self.text_label.config(text=f"Could not export frames: {str(e) or type(e).__name__}")
+
+    # ---------- Imported graphs ----------
+    def open_graph_file(self):
+        path = ask_graph_path()
+        if not path:
+            return
+        self.text_label.config(text=f"⏳ Loading {os.path.basename(path)}...")
+        # import and record on a worker thread; the thread ends with the job
+        pool = ThreadPoolExecutor(max_workers=1)
+        self.pending_graph = pool.submit(self.prepare_graph_trace, path)
+        pool.shutdown(wait=False)
+        self.after(ROUND_POLL_MS, self.wait_for_graph_trace, self.pending_graph, path)
+
+    @staticmethod
+    def prepare_graph_trace(path):
+        # worker thread: DFS from the first node, traced to disk if the graph is big
+        # (into the cache directory when there is one, so reopening the file is instant)
+        graph = load_graph(path)
+        if graph.m <= TRACE_TO_DISK_EDGES or DFS_CACHE.disk_dir:
+            return graph, DFS_CACHE.trace(graph, 0, to_disk=graph.m > TRACE_TO_DISK_EDGES)
+        fd, trace_path = tempfile.mkstemp(suffix=".dfstrace")
+        os.close(fd)
+        trace = record_dfs(graph, 0, TraceFileWriter(trace_path, graph.labels))
+        try:
+            os.remove(trace_path)  # the open map keeps the data alive
+        except OSError:
+            pass
+        return graph, trace
+
+    def wait_for_graph_trace(self, future, path):
+        if future is not self.pending_graph:
+            return
+        if not future.done():
+            self.after(ROUND_POLL_MS, self.wait_for_graph_trace, future, path)
+            return
+        self.pending_graph = None
+        try:
+            graph, trace = future.result()
+        except Exception as e:
+            self.text_label.config(text=f"Could not open graph: {e}")
+            return
+        self.stop_playing()
+        self.goto_step(-1)
+        if isinstance(self.trace, MappedTrace):
+            self.trace.close()
+        self.show_imported_graph(graph, os.path.basename(path))
+        self.load_trace(trace)
+
+    def show_imported_graph(self, graph, name):
+        self.canvas.delete("all")
+        width, height = int(self.canvas.cget("width")), int(self.canvas.cget("height"))
+        if graph.n > IMPORT_DRAW_LIMIT:
+            self.nodes, self.edges = {}, []
+            self.canvas.create_text(width / 2, height / 2, font=("Arial", 14), fill=NODE_OUTLINE, justify="center",
+                                    text=f"{name}\n{graph.n:,} nodes, {graph.m:,} edge entries\n"
+                                         f"Too big to draw here; follow the tracker.")
+            return
+        labels = graph.labels
+        xs, ys = random_positions(graph.n, seed=0, width=width, height=height, margin=40)
+        self.nodes = {labels[u]: (xs[u], ys[u]) for u in range(graph.n)}
+        self.edges = [(labels[u], labels[v]) for u in range(graph.n) for v in graph.neighbors(u) if u < v]
+        draw_graph(self.canvas, self.nodes, self.edges)
+
+    # ---------- Auto-play ----------
+    def toggle_play(self):
+        if self.player.playing:
+            self.stop_playing()
+        else:
+            if self.current_step + 1 >= len(self.trace):
+                self.goto_step(-1)  # play again from the start
+            self.player.play()
+            self.play_button.config(text="⏸ Pause")
+
+    def stop_playing(self):
+        self.player.pause()
+        self.play_button.config(text="▶ Play")
+
+    def advance(self, steps):
+        target = min(self.current_step + steps, len(self.trace) - 1)
+        self.goto_step(target)
+        if target + 1 >= len(self.trace):
+            self.play_button.config(text="▶ Play")
+            return False
+        return True
+
+    # ---------- Batched rendering ----------
+    def schedule_render(self):
+        if self._render_job is None:
+            self._render_job = self.after_idle(self.flush_render)
+
+    @perf_stats.timed("trace_player.flush_render")
+    def flush_render(self):
+        self._render_job = None
+        for node_id, (fill, outline) in self.pending_nodes.items():
+            self.canvas.itemconfig(f"node_{node_id}", fill=fill, outline=outline)
+        self.pending_nodes = {}
+        if self.pending_step:
+            self.pending_step = False
+            if self.current_step >= 0:
+                self.text_label.config(text=self.trace.describe(self.current_step))
+                self.highlight_code_line(self.trace.code_lines(self.current_step))
+            else:
+                self.text_label.config(text="")
+                self.highlight_code_line([])
+            self.step_scale.set(self.current_step + 1)
+
+    def highlight_code_line(self, line_nums):
+        # tags work on a disabled Text, no need to toggle its state
+        self.code_text.tag_remove("highlight", "1.0", tk.END)
+        for ln in line_nums:
+            if ln >= 1:
+                self.code_text.tag_add("highlight", f"{ln}.0", f"{ln}.end")
+
+    def highlight_node(self, node_id, fill_color=NODE_VISITED, outline_color=NODE_OUTLINE):
+        if node_id not in self.nodes:
+            return  # not drawn (graphs too big for the canvas draw nothing)
+        self.pending_nodes[node_id] = (fill_color, outline_color)
+        self.schedule_render()
+
+    def show_step(self):
+        self.pending_step = True
+        self.schedule_render()
+
+    # ---------- Stepping ----------
+    def visit_color(self, position):
+        return NODE_START if position == 0 else NODE_VISITED
+
+    def apply_event(self, step):
+        op, node = self.trace.event(step)
+        label = self.trace.labels[node] if node >= 0 else None
+        if op == dfs_trace.START or op == dfs_trace.PUSH:
+            self.tracker.push_stack(label)
+        elif op == dfs_trace.POP:
+            self.tracker.pop_stack()
+        elif op == dfs_trace.VISIT:
+            self.highlight_node(label, self.visit_color(len(self.tracker.visited_box)))
+            self.tracker.append_visited(label)
+
+    def undo_event(self, step):
+        op, node = self.trace.event(step)
+        label = self.trace.labels[node] if node >= 0 else None
+        if op == dfs_trace.START or op == dfs_trace.PUSH:
+            self.tracker.pop_stack()
+        elif op == dfs_trace.POP:
+            self.tracker.push_stack(label)
+        elif op == dfs_trace.VISIT:
+            self.tracker.pop_visited()
+            self.highlight_node(label, NODE_COLOR, NODE_OUTLINE)
+
+    def next_step(self):
+        if self.current_step + 1 < len(self.trace):
+            self.current_step += 1
+            self.apply_event(self.current_step)
+            self.show_step()
+
+    def prev_step(self):
+        if self.current_step >= 0:
+            self.undo_event(self.current_step)
+            self.current_step -= 1
+            self.show_step()
+
+    def goto_step(self, step):
+        step = max(-1, min(step, len(self.trace) - 1))
+        if abs(step - self.current_step) <= SEEK_INSTEAD_OF_REPLAY:
+            while self.current_step < step:
+                self.current_step += 1
+                self.apply_event(self.current_step)
+            while self.current_step > step:
+                self.undo_event(self.current_step)
+                self.current_step -= 1
+        else:
+            # far jump: rebuild the state from the nearest checkpoint
+            labels, order = self.trace.labels, self.trace.order
+            top, seen = self.trace.state_at(step)
+            before = len(self.tracker.visited_box)
+            if self.nodes:
+                for i in range(seen, before):
+                    self.highlight_node(labels[order[i]], NODE_COLOR, NODE_OUTLINE)
+                for i in range(before, seen):
+                    self.highlight_node(labels[order[i]], self.visit_color(i))
+            stack = self.trace.stack_from(top)
+            self.tracker.set_stack(LazyLabels(labels, stack, len(stack)))
+            self.tracker.set_visited(LazyLabels(labels, order, seen) if seen else [])  # [] lets go of a mapped trace
+            self.current_step = step
+        self.show_step()
+
 # ----------- Practice Problem Tree Page ------------
-class PracticeProblemTreePage(tk.Frame, HomeButtonMixin):
+class PracticeProblemTreePage(tk.Frame, HomeButtonMixin, TracePlayerMixin):
     def __init__(self, master):
         super().__init__(master, bg=PRIMARY_BG)
         self.add_home_button(master)
@@ -167,26 +1041,13 @@ class PracticeProblemTreePage(tk.Frame, HomeButtonMixin):
         self.edges = [(0, 1), (0, 2), (0, 3), (2, 4)]
         draw_graph(self.canvas, self.nodes, self.edges)
 
-        self.steps = [
-            {"node": 0, "text": "We start at node 0 because it is the root.", "fill": NODE_START, "outline": NODE_OUTLINE},
-            {"node": 2, "text": "Visit node 2 as it is the left-most child node.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-            {"node": 4, "text": "Visit node 4 next.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-            {"node": 4, "text": "Node 4 is a leaf node so we backtrack up to node 2.", "fill": NODE_VISITED},
-            {"node": 2, "text": "Node 2 has no more unvisited child nodes so we backtrack.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-            {"node": 3, "text": "Visit the next child node from 0, node 3.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-            {"node": 3, "text": "Node 3 is a leaf node so we backtrack to node 0.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-            {"node": 1, "text": "Visit the last child of node 0, node 1.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-            {"node": 1, "text": "All nodes in the tree graph have been visited.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-        ]
-
-        self.current_step = -1
-
         button_frame = tk.Frame(self, bg=PRIMARY_BG)
         button_frame.pack(pady=10)
         tk.Button(button_frame, text="← Back", command=self.prev_step,
                   font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG, activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0, padx=12, pady=6).pack(side="left", padx=10)
         tk.Button(button_frame, text="→ Next", command=self.next_step,
                   font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG, activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0, padx=12, pady=6).pack(side="left", padx=10)
+        self.add_step_controls(button_frame)
         tk.Button(self, text="Try on your own!", command=lambda: master.switch_frame(DFSPage),
                   font=("Arial", 13, "bold"), bg=BUTTON_BG, fg=BUTTON_FG, activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0, padx=12, pady=6).pack(pady=10)
         self.code_text = tk.Text(self, wrap=tk.WORD, width=50, height=15, font=("Courier New", 11), bg="#f8f9fa", fg=NODE_OUTLINE, insertbackground=NODE_OUTLINE, bd=2, relief=tk.GROOVE)
@@ -194,71 +1055,16 @@ class PracticeProblemTreePage(tk.Frame, HomeButtonMixin):
         self.code_text.insert(tk.END, DFSCode)
         self.code_text.config(state=tk.DISABLED)
 
-        self.step_to_code_line = {
-            0: [2,3],
-            1: [4],
-            2: [5,6],
-            3: [7],
-            4: [6,7],
-            5: [8,9,10],
-            6: [5,6,7],
-            7: [5,6,7],
-            8: [11]
-        }
-
-        self.tracker_stack_steps = [
-            [0], [2,0], [4,2,0], [2,0], [0], [3,0], [0], [1], []
-        ]
-        self.tracker_visited_steps = [
-            [0], [0,2], [0,2,4], [0,2,4], [0,2,4], [0,2,4,3], [0,2,4,3], [0,2,4,3,1], [0,2,4,3,1]
-        ]
-
-    def highlight_code_line(self, line_num):
-        self.code_text.config(state=tk.NORMAL)
-        self.code_text.tag_remove("highlight", "1.0", tk.END)
-        for line_num in line_num:
-            if line_num >= 1:
-                self.code_text.tag_add("highlight", f"{line_num}.0", f"{line_num}.end")
-        self.code_text.tag_config("highlight", background=HIGHLIGHT_COLOR)
-        self.code_text.config(state=tk.DISABLED)
-
-    def highlight_node(self, node_id, fill_color=NODE_VISITED, outline_color=NODE_OUTLINE):
-        self.canvas.itemconfig(f"node_{node_id}", fill=fill_color, outline=outline_color)
+        # children listed left to right, so DFS goes down the left-most branch first
+        tree = {0: [2, 3, 1], 1: [], 2: [4], 3: [], 4: []}
+        self.load_trace(DFS_CACHE.trace(CSRGraph.from_adjacency(tree), 0))
 
     def reset_all_nodes(self):
         for node_id in self.nodes:
             self.canvas.itemconfig(f"node_{node_id}", fill=NODE_COLOR, outline=NODE_OUTLINE)
 
-    def next_step(self):
-        if self.current_step + 1 < len(self.steps):
-            self.current_step += 1
-            step = self.steps[self.current_step]
-            self.text_label.config(text=step["text"])
-            self.highlight_node(step["node"], step["fill"], step.get("outline", NODE_OUTLINE))
-            self.highlight_code_line(self.step_to_code_line[self.current_step])
-            self.tracker.set_stack(self.tracker_stack_steps[self.current_step] if self.current_step < len(self.tracker_stack_steps) else [])
-            self.tracker.set_visited(self.tracker_visited_steps[self.current_step] if self.current_step < len(self.tracker_visited_steps) else [])
-
-    def prev_step(self):
-        if self.current_step >= 0:
-            self.code_text.config(state=tk.NORMAL)
-            self.code_text.tag_remove("highlight", "1.0", tk.END)
-            self.code_text.config(state=tk.DISABLED)
-            prev_node = self.steps[self.current_step]["node"]
-            self.highlight_node(prev_node, NODE_COLOR, NODE_OUTLINE)
-            self.current_step -= 1
-            if self.current_step >= 0:
-                step = self.steps[self.current_step]
-                self.text_label.config(text=step["text"])
-                self.tracker.set_stack(self.tracker_stack_steps[self.current_step] if self.current_step < len(self.tracker_stack_steps) else [])
-                self.tracker.set_visited(self.tracker_visited_steps[self.current_step] if self.current_step < len(self.tracker_visited_steps) else [])
-            else:
-                self.text_label.config(text="")
-                self.tracker.set_stack([])
-                self.tracker.set_visited([])
-
 # ----------- Graph Practice Problem Page -----------
-class GraphProblemPage(tk.Frame, HomeButtonMixin):
+class GraphProblemPage(tk.Frame, HomeButtonMixin, TracePlayerMixin):
     def __init__(self, master):
         super().__init__(master, bg=PRIMARY_BG)
         self.add_home_button(master)
@@ -292,82 +1098,31 @@ class GraphProblemPage(tk.Frame, HomeButtonMixin):
         ]
         draw_graph(self.canvas, self.nodes, self.edges)
 
-        self.steps = [
-            {"node": 0, "text": "Start DFS at node 0.", "fill": NODE_START, "outline": NODE_OUTLINE},
-            {"node": 1, "text": "Visit neighbor node 1 from 0.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-            {"node": 2, "text": "Backtrack and visit node 2 from 0.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-            {"node": 3, "text": "Visit neighbor node 3 from 2.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-            {"node": 4, "text": "Backtrack to 2, then visit node 4.", "fill": NODE_VISITED, "outline": NODE_OUTLINE},
-        ]
-
-        self.current_step = -1
-
-        self.tracker_stack_steps = [
-            [0], [1,0], [2,0], [3,2,0], [4,2,0]
-        ]
-        self.tracker_visited_steps = [
-            [0], [0,1], [0,1,2], [0,1,2,3], [0,1,2,3,4]
-        ]
-
-        self.step_to_code_line = {
-            0: [2,3],
-            1: [4,5],
-            2: [6,7],
-            3: [8,9,10],
-            4: [11]
-        }
-
         button_frame = tk.Frame(self, bg=PRIMARY_BG)
         button_frame.pack(pady=10)
         tk.Button(button_frame, text="← Back", command=self.prev_step,
                   font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG, activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0, padx=12, pady=6).pack(side="left", padx=10)
         tk.Button(button_frame, text="→ Next", command=self.next_step,
                   font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG, activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0, padx=12, pady=6).pack(side="left", padx=10)
+        self.add_step_controls(button_frame)
         tk.Button(self, text="Try on your own!", command=lambda: master.switch_frame(DFSPage),
                   font=("Arial", 13, "bold"), bg=BUTTON_BG, fg=BUTTON_FG, activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE, bd=0, padx=12, pady=6).pack(pady=10)
 
-    def highlight_code_line(self, line_num):
-        self.code_text.config(state=tk.NORMAL)
-        self.code_text.tag_remove("highlight", "1.0", tk.END)
-        for ln in line_num:
-            if ln >= 1:
-                self.code_text.tag_add("highlight", f"{ln}.0", f"{ln}.end")
-        self.code_text.tag_config("highlight", background=HIGHLIGHT_COLOR)
-        self.code_text.config(state=tk.DISABLED)
-
-    def highlight_node(self, node_id, fill_color=NODE_VISITED, outline_color=NODE_OUTLINE):
-        self.canvas.itemconfig(f"node_{node_id}", fill=fill_color, outline=outline_color)
-
-    def next_step(self):
-        if self.current_step + 1 < len(self.steps):
-            self.current_step += 1
-            step = self.steps[self.current_step]
-            self.text_label.config(text=step["text"])
-            self.highlight_node(step["node"], step["fill"], step["outline"])
-            self.tracker.set_stack(self.tracker_stack_steps[self.current_step] if self.current_step < len(self.tracker_stack_steps) else [])
-            self.tracker.set_visited(self.tracker_visited_steps[self.current_step] if self.current_step < len(self.tracker_visited_steps) else [])
-            self.highlight_code_line(self.step_to_code_line[self.current_step])
-
-    def prev_step(self):
-        if self.current_step >= 0:
-            prev_node = self.steps[self.current_step]["node"]
-            self.highlight_node(prev_node, NODE_COLOR, NODE_OUTLINE)
-            self.current_step -= 1
-            if self.current_step >= 0:
-                self.text_label.config(text=self.steps[self.current_step]["text"])
-                self.tracker.set_stack(self.tracker_stack_steps[self.current_step] if self.current_step < len(self.tracker_stack_steps) else [])
-                self.tracker.set_visited(self.tracker_visited_steps[self.current_step] if self.current_step < len(self.tracker_visited_steps) else [])
-                self.highlight_code_line(self.step_to_code_line[self.current_step])
-            else:
-                self.text_label.config(text="")
-                self.tracker.set_stack([])
-                self.tracker.set_visited([])
-                self.code_text.config(state=tk.NORMAL)
-                self.code_text.tag_remove("highlight", "1.0", tk.END)
-                self.code_text.config(state=tk.DISABLED)
+        # undirected: every edge goes in both adjacency lists, smaller ids first
+        adj = {node_id: [] for node_id in self.nodes}
+        for u, v in self.edges:
+            adj[u].append(v)
+            adj[v].append(u)
+        self.load_trace(DFS_CACHE.trace(CSRGraph.from_adjacency({u: sorted(vs) for u, vs in adj.items()}), 0))
 
 # ----------- DFS Graph Page ------------
 class DFSPage(tk.Frame, HomeButtonMixin):
+    # label -> node count (None keeps the original 5-7 node rounds)
+    GAME_SIZES = {"5-7 nodes": None, "50 nodes": 50, "1,000 nodes": 1000, "10,000 nodes": 10000, "100,000 nodes": 100000}
+    GAME_PROFILES = {"Tree + extras": "tree", "Grid": "grid", "Random": "random", "Power law": "power_law"}
+    ANALYSES = {"No analysis": None, "Components": "components", "Cycle": "cycle",
+                "Cut vertices": "cuts", "Bridges": "bridges"}
+
     def __init__(self, master):
         super().__init__(master, bg=PRIMARY_BG)
         self.add_home_button(master)
@@ -386,14 +1141,33 @@ class DFSPage(tk.Frame, HomeButtonMixin):
         self.tracker.pack(side=tk.RIGHT, fill=tk.Y, padx=10, pady=10)
         self.canvas = tk.Canvas(self, width=800, height=500, bg=ACCENT_BG, bd=0, highlightthickness=0)
         self.canvas.pack(padx=10, pady=4)
-        self.graph = {} 
-        self.edges = [] 
+        self.core = None
+        self.visited = bytearray()
+        self.spatial = GridIndex(radius=20)
         self.expected_order = []
         self.current_index = 0 
         self.rounds_cleared = 0
+        self.seed = None
+        self.layout_job = None
+        self.start = None
+        # while editing, an IncrementalDFS owns the graph and keeps the order current
+        self.editor = None
+        self.selected = None
+        # rounds are generated and solved on a worker thread; the next one is
+        # prefetched while the current one is played
+        self.worker = ThreadPoolExecutor(max_workers=1)
+        self.pending_round = None
+        self.prefetched = None
+        self.view = GraphView(self.canvas, radius=20)
+        self.view.bind_navigation()
         self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Shift-Button-1>", self.on_remove_click)
+        # two rows under the canvas and tracker, packed ahead of them so they
+        # keep their height (the canvas gives up what the window lacks)
+        options = tk.Frame(self, bg=PRIMARY_BG)
+        options.pack(side="bottom", pady=(0, 8), before=self.tracker)
         controls = tk.Frame(self, bg=PRIMARY_BG)
-        controls.pack(pady=8)
+        controls.pack(side="bottom", pady=(6, 4), before=self.tracker)
         tk.Button(controls, text="New Graph", command=self.new_round,
                   font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG,
                   activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE,
@@ -402,24 +1176,124 @@ class DFSPage(tk.Frame, HomeButtonMixin):
                   font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG,
                   activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE,
                   bd=0, padx=12, pady=6).pack(side="left", padx=6)
+        self.edit_button = tk.Button(controls, text="Edit Graph", command=self.toggle_edit,
+                                     font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG,
+                                     activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE,
+                                     bd=0, padx=12, pady=6)
+        self.edit_button.pack(side="left", padx=6)
+        tk.Button(controls, text="Open Graph", command=self.open_graph_file,
+                  font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG,
+                  activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE,
+                  bd=0, padx=12, pady=6).pack(side="left", padx=6)
         tk.Button(controls, text="Back", command=lambda: master.switch_frame(StartPage),
                   font=("Arial", 12, "bold"), bg=BUTTON_BG, fg=BUTTON_FG,
                   activebackground=ACCENT_BG, activeforeground=NODE_OUTLINE,
                   bd=0, padx=12, pady=6).pack(side="left", padx=6)
+        self.size_var = tk.StringVar(self, value="5-7 nodes")
+        self.profile_var = tk.StringVar(self, value="Tree + extras")
+        for var, choices in ((self.size_var, self.GAME_SIZES), (self.profile_var, self.GAME_PROFILES)):
+            menu = tk.OptionMenu(options, var, *choices, command=lambda _: self.new_round())
+            menu.config(font=("Arial", 11), bg=ACCENT_BG, fg=NODE_OUTLINE, bd=0, highlightthickness=0)
+            menu.pack(side="left", padx=6)
+        self.analysis_var = tk.StringVar(self, value="No analysis")
+        self.pending_analysis = None
+        menu = tk.OptionMenu(options, self.analysis_var, *self.ANALYSES, command=lambda _: self.show_analysis())
+        menu.config(font=("Arial", 11), bg=ACCENT_BG, fg=NODE_OUTLINE, bd=0, highlightthickness=0)
+        menu.pack(side="left", padx=6)
         self.new_round()
 
     # ---------- Round lifecycle ----------
     def new_round(self):
+        settings = (self.size_var.get(), self.profile_var.get())
+        if self.prefetched is not None and self.prefetched[0] == settings:
+            future = self.prefetched[1]
+        else:
+            if self.prefetched is not None:
+                self.prefetched[1].cancel()
+            future = self.submit_round(settings)
+        self.prefetched = None
+        self.pending_round = future
+        if not future.done():
+            self.feedback.config(text="⏳ Generating a new graph...")
+        self.wait_for_round(future, settings)
+
+    def submit_round(self, settings):
+        return self.worker.submit(self.prepare_round, settings, random.randrange(2 ** 31))
+
+    def wait_for_round(self, future, settings):
+        if future is not self.pending_round:
+            return  # New Graph was pressed again meanwhile
+        if not future.done():
+            self.after(ROUND_POLL_MS, self.wait_for_round, future, settings)
+            return
+        self.pending_round = None
+        try:
+            rnd = future.result()
+        except Exception as e:
+            self.feedback.config(text=f"Could not prepare a graph: {e}")
+            return
+        self.show_round(rnd)
+        # get the next round ready while this one is played (imported graphs have no settings)
+        if settings is not None:
+            self.prefetched = (settings, self.submit_round(settings))
+
+    def prepare_round(self, settings, seed):
+        # worker thread: everything heavy, nothing that touches Tk
+        size_label, profile_label = settings
+        core, xs, ys = self.generate_connected_graph(seed, size_label, profile_label)
+        start = core.labels[random.Random(seed).randrange(core.n)]
+        return self.make_round(seed, self.GAME_PROFILES[profile_label], core, xs, ys, start)
+
+    @staticmethod
+    def grid_index(xs, ys):
+        spatial = GridIndex(radius=20)
+        spatial.build(xs, ys)
+        return spatial
+
+    def make_round(self, seed, profile, core, xs, ys, start):
+        return {
+            "seed": seed, "profile": profile, "core": core, "xs": xs, "ys": ys, "spatial": self.grid_index(xs, ys),
+            "start": start, "order": self.compute_dfs_order(start, core),
+        }
+
+    def open_graph_file(self):
+        path = ask_graph_path()
+        if not path:
+            return
+        if self.prefetched is not None:
+            self.prefetched[1].cancel()
+            self.prefetched = None
+        future = self.worker.submit(self.prepare_import, path, random.randrange(2 ** 31))
+        self.pending_round = future
+        self.feedback.config(text=f"⏳ Loading {os.path.basename(path)}...")
+        self.wait_for_round(future, None)
+
+    def prepare_import(self, path, seed):
+        # worker thread: the imported graph becomes a round starting at its first node
+        core = load_graph(path)
+        xs, ys = random_positions(core.n, seed)
+        return self.make_round(seed, "random", core, xs, ys, core.labels[0])
+
+    @perf_stats.timed("dfs_page.show_round")
+    def show_round(self, rnd):
         self.clear_canvas()
-        self.graph = self.generate_connected_graph()
-        self.edges = self.build_edge_list(self.graph)
+        self.editor = None
+        self.selected = None
+        self.edit_button.config(text="Edit Graph")
+        self.analysis_var.set("No analysis")
+        self.pending_analysis = None
+        self.seed = rnd["seed"]
+        self.core = rnd["core"]
+        self.visited = bytearray(self.core.n)
+        self.spatial = rnd["spatial"]
         self.draw_current_graph()
-        start = random.choice(list(self.graph.keys()))
-        self.expected_order = self.compute_dfs_order(start)
+        self.start_layout(rnd["xs"], rnd["ys"], rnd["profile"])
+        self.expected_order = rnd["order"]
+        self.start = rnd["start"]
         self.current_index = 0
         self.tracker.set_visited([])
         self.tracker.set_stack([]) 
-        self.feedback.config(text=f"Start at node {start}. Pick nodes in correct DFS order.\n" f"Tip: DFS uses a stack; we visit as deep as possible before backtracking.")
+        self.feedback.config(text=f"Start at node {rnd['start']}. Pick nodes in correct DFS order.\n" f"Tip: DFS uses a stack; we visit as deep as possible before backtracking.")
 
     def next_round(self):
         self.rounds_cleared += 1
@@ -428,129 +1302,280 @@ class DFSPage(tk.Frame, HomeButtonMixin):
         self.after(800, self.new_round)
 
     # ---------- Graph generation & drawing ----------
-    def generate_connected_graph(self):
-        n = random.randint(5, 7)
-        names = [chr(ord('A') + i) for i in range(n)]
-        # Place nodes on a loose grid
-        positions = self.random_positions(n)
-
-        # Start with a tree to ensure connectivity
-        adj = {name: set() for name in names}
-        for i in range(1, n):
-            u = names[i]
-            v = random.choice(names[:i])
-            adj[u].add(v)
-            adj[v].add(u)
-
-        # Add a few extra edges (avoid multi-edges/self-loops)
-        extra_edges = random.randint(1, max(1, n // 2))
-        attempted = 0
-        while extra_edges > 0 and attempted < 20:
-            u, v = random.sample(names, 2)
-            attempted += 1
-            if v not in adj[u]:
-                adj[u].add(v)
-                adj[v].add(u)
-                extra_edges -= 1
-
-        graph = {}
-        for name in names:
-            x, y = positions[name]
-            neighbors = sorted(list(adj[name]))
-            graph[name] = GraphNode(name, x, y, neighbors)
-            graph[name].visited = False
-        return graph
-
-    def random_positions(self, n):
-        # grid points within canvas bounds
-        cols, rows = 3, max(2, (n + 2) // 3)
-        xs = [120, 300, 480, 660][:cols]
-        ys = [110, 230, 350, 440][:rows]
-        spots = [(x, y) for y in ys for x in xs]
-        random.shuffle(spots)
-        names = [chr(ord('A') + i) for i in range(n)]
-        return {name: spots[i] for i, name in enumerate(names)}
-
-    def build_edge_list(self, graph):
-        edges = []
-        for u, node in graph.items():
-            for v in node.neighbors:
-                edges.append((u, v))
-        return edges
-
+    def generate_connected_graph(self, seed, size_label, profile_label):
+        # same seed + size + profile gives the same round again
+        n = self.GAME_SIZES[size_label]
+        if n is None:
+            n = random.Random(seed).randint(5, 7)
+        return generate_graph(n, self.GAME_PROFILES[profile_label], seed=seed)
+
+    @perf_stats.timed("draw_current_graph")
     def draw_current_graph(self):
-        # Draw edges
-        for u, v in self.edges:
-            n1, n2 = self.graph[u], self.graph[v]
-            draw_directed_edge(self.canvas, n1.x, n1.y, n2.x, n2.y, 20, fill="#adb5bd")
-        # Draw nodes
-        for node in self.graph.values():
-            self.canvas.create_oval(node.x - 20, node.y - 20, node.x + 20, node.y + 20,
-                                    fill=NODE_COLOR, outline=NODE_OUTLINE, width=3, tags=f"node_{node.name}")
-            self.canvas.create_text(node.x, node.y, text=node.name, font=("Arial", 14, "bold"),
-                                   fill=NODE_OUTLINE, tags=f"label_{node.name}")
-
-    def flash_node(self, node_name):
-        self.canvas.itemconfig(f"node_{node_name}", fill="#ffadad")
-        self.after(220, lambda: self.canvas.itemconfig(
-            f"node_{node_name}",
-            fill=NODE_COLOR if not self.graph[node_name].visited else NODE_VISITED
+        # self.spatial already indexes the node centers (ids are the same as in self.core)
+        self.view.load(self.core, self.spatial, directed=False)
+
+    def start_layout(self, xs, ys, profile):
+        # spread the nodes out on a worker thread, showing progress as it goes
+        if self.layout_job is not None:
+            self.layout_job.cancel()
+            self.layout_job = None
+        if profile == "grid" or not can_layout(self.core.n):
+            return
+        # a graph laid out before from the same start positions goes straight to the result
+        key = layout_key(self.core, xs, ys, self.seed)
+        positions = DFS_CACHE.get(key)
+        if positions is not None:
+            self.spatial.build(*positions)
+            self.view.request_render()
+            return
+        # each snapshot's grid index is built on the layout thread, not here
+        self.layout_job = LayoutJob(ForceLayout(self.core, xs, ys, seed=self.seed), build=self.grid_index)
+        self.layout_job.start()
+        self.after(LAYOUT_POLL_MS, self.poll_layout, self.layout_job, key)
+
+    def poll_layout(self, job, key=None):
+        if job is not self.layout_job:
+            return  # a newer round replaced it
+        spatial = job.latest()
+        if spatial is not None:
+            self.spatial = self.view.spatial = spatial
+            self.view.request_render()
+        if job.is_alive() or not job.updates.empty():
+            self.after(LAYOUT_POLL_MS, self.poll_layout, job, key)
+        elif key is not None and job.layout.finished:
+            DFS_CACHE.put(key, job.layout.positions())
+
+    def destroy(self):
+        if self.layout_job is not None:
+            self.layout_job.cancel()
+        self.worker.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
+    def flash_node(self, node_id):
+        self.view.set_node_style(node_id, fill="#ffadad")
+        self.after(220, lambda: self.view.set_node_style(
+            node_id,
+            fill=NODE_VISITED if self.visited[node_id] else NODE_COLOR
         ))
 
     def clear_canvas(self):
-        self.canvas.delete("all")
+        self.view.clear()
 
     # ---------- DFS order (ground truth) ----------
-    def compute_dfs_order(self, start):
-        stack = [start]
-        visited = set()
-        order = []
-        while stack:
-            node = stack.pop()
-            if node in visited:
-                continue
-            visited.add(node)
-            order.append(node)
-            nbrs = list(self.graph[node].neighbors)
-            for nbr in reversed(nbrs):
-                if nbr not in visited:
-                    stack.append(nbr)
-        return order
+    @perf_stats.timed("compute_dfs_order")
+    def compute_dfs_order(self, start, graph=None):
+        # runs on the CSR core; same order as the reversed-neighbor stack in DFSCode.
+        # Cached by graph content, so a regenerated or replayed round is not solved again.
+        return DFS_CACHE.order_labels(graph if graph is not None else self.core, start)
 
     # ---------- Interaction ----------
+    @perf_stats.timed("on_click")
     def on_click(self, event):
-        clicked = self.get_node_at(event.x, event.y)
-        if not clicked:
+        if self.editor is not None:
+            self.on_edit_click(event)
             return
+        node_id = self.get_node_at(*self.view.to_world(event.x, event.y))
+        if node_id is None or self.current_index >= len(self.expected_order):
+            return
+        name = self.core.labels[node_id]
 
         # Already visited?
-        if clicked.visited:
-            self.flash_feedback(f"⚠️ {clicked.name} already visited. Next expected: {self.expected_order[self.current_index]}")
+        if self.visited[node_id]:
+            self.flash_feedback(f"⚠️ {name} already visited. Next expected: {self.expected_order[self.current_index]}")
             return
 
         expected = self.expected_order[self.current_index]
 
-        if clicked.name != expected:
+        if name != expected:
             # Wrong pick — flash node and message
-            self.flash_node(clicked.name)
+            perf_stats.count("clicks.wrong")
+            self.flash_node(node_id)
             self.flash_feedback(f"❌ Not quite. Try node {expected} next.")
             return
 
         # Correct pick
-        clicked.visited = True
-        self.canvas.itemconfig(f"node_{clicked.name}", fill=NODE_VISITED)
-        visited_order = [n for n in self.expected_order[:self.current_index + 1]]
-        self.tracker.set_visited(visited_order)
+        perf_stats.count("clicks.correct")
+        self.visited[node_id] = 1
+        self.view.set_node_style(node_id, fill=NODE_VISITED)
+        self.tracker.append_visited(name)
         self.current_index += 1
 
         if self.current_index == len(self.expected_order):
             self.next_round()
 
     def get_node_at(self, x, y):
-        for node in self.graph.values():
-            if (node.x - 20 <= x <= node.x + 20) and (node.y - 20 <= y <= node.y + 20):
-                return node
-        return None
+        # node id under the point, or None
+        return self.spatial.query_point(x, y)
+
+    # ---------- Edit mode ----------
+    # Click empty space to add a node (joined to the selected node, if any),
+    # click two nodes to add or remove the edge between them, shift-click a
+    # node to delete it. The order is patched by IncrementalDFS after each edit.
+    def toggle_edit(self):
+        if self.core is None:
+            return
+        if self.editor is None:
+            if self.layout_job is not None:
+                self.layout_job.cancel()
+                self.layout_job = None
+            self.editor = IncrementalDFS(self.core, self.core.id_of(self.start))
+            self.core = self.view.graph = self.editor.graph
+            self.edit_button.config(text="Done Editing")
+            self.feedback.config(text="✏️ Editing: click empty space to add a node, click two nodes to add/remove an edge, "
+                                      "shift-click a node to delete it. The DFS order updates as you go.")
+            return
+        self.select_node(None)
+        graph = self.editor.graph
+        live = graph.live_ids()
+        self.core = self.view.graph = graph.to_csr()
+        if len(live) != graph.n:
+            # deleted nodes are gone from the new core: renumber what is kept by id
+            old = self.spatial
+            self.spatial = self.view.spatial = GridIndex(radius=old.radius)
+            self.spatial.build([old.xs[u] for u in live], [old.ys[u] for u in live])
+            self.visited = bytearray(self.visited[u] for u in live)
+            self.view.styles = {}
+            for u in range(self.core.n):
+                if self.visited[u]:
+                    self.view.set_node_style(u, fill=NODE_VISITED)
+        self.editor = None
+        self.edit_button.config(text="Edit Graph")
+        self.view.request_render()
+        if self.ANALYSES[self.analysis_var.get()] is not None:
+            self.show_analysis()
+        if self.current_index == len(self.expected_order):
+            self.next_round()
+        else:
+            self.feedback.config(text=f"Back to the game. Next: pick node {self.expected_order[self.current_index]}.")
+
+    def select_node(self, node_id):
+        if self.selected is not None and self.editor.graph.alive[self.selected]:
+            self.view.set_node_style(self.selected, fill=NODE_VISITED if self.visited[self.selected] else NODE_COLOR)
+        self.selected = node_id
+        if node_id is not None:
+            self.view.set_node_style(node_id, fill=HIGHLIGHT_COLOR)
+
+    def on_edit_click(self, event):
+        x, y = self.view.to_world(event.x, event.y)
+        node_id = self.get_node_at(x, y)
+        editor = self.editor
+        if node_id is None:
+            new_id = editor.add_node()
+            self.visited.append(0)
+            self.spatial.insert(new_id, x, y)
+            kept = len(self.expected_order) if self.selected is None else editor.add_edge(self.selected, new_id)
+            self.select_node(new_id)
+        elif self.selected is None or node_id == self.selected:
+            self.select_node(None if node_id == self.selected else node_id)
+            return
+        else:
+            u, v = self.selected, node_id
+            kept = editor.remove_edge(u, v) if editor.graph.has_edge(u, v) else editor.add_edge(u, v)
+            self.select_node(None)
+        self.apply_edit(kept)
+
+    def on_remove_click(self, event):
+        if self.editor is None:
+            return
+        node_id = self.get_node_at(*self.view.to_world(event.x, event.y))
+        if node_id is None:
+            return
+        if node_id == self.editor.start:
+            self.flash_feedback("⚠️ The start node stays; delete other nodes instead.")
+            return
+        if node_id == self.selected:
+            self.select_node(None)
+        kept = self.editor.remove_node(node_id)
+        self.spatial.remove(node_id)
+        self.view.set_node_style(node_id)
+        self.apply_edit(kept)
+
+    def apply_edit(self, kept):
+        # the first `kept` names of the order are unchanged; patch the rest, and
+        # undo the player's picks past that point since they may be wrong now
+        graph = self.editor.graph
+        for name in self.expected_order[kept:self.current_index]:
+            node_id = graph.index.get(name)
+            if node_id is not None:
+                self.visited[node_id] = 0
+                if node_id != self.selected:
+                    self.view.set_node_style(node_id)
+        if self.current_index > kept:
+            self.current_index = kept
+            self.tracker.truncate_visited(kept)
+        labels = graph.labels
+        self.expected_order[kept:] = [labels[u] for u in self.editor.order[kept:]]
+        self.view.request_render()
+        total = len(self.editor.rec.ops)
+        shown = self.expected_order[:60]
+        more = f" … ({len(self.expected_order)} nodes)" if len(self.expected_order) > len(shown) else ""
+        self.feedback.config(text=f"✏️ Recomputed {self.editor.replayed} of {total} DFS steps. "
+                                  f"Order: {' → '.join(shown)}{more}")
+        if self.ANALYSES[self.analysis_var.get()] is not None:
+            self.show_analysis()
+
+    # ---------- Analytics overlay ----------
+    # Colors the graph by the chosen dfs_analytics result, computed on the
+    # worker thread. "No analysis" puts the game colors back.
+    def show_analysis(self):
+        kind = self.ANALYSES[self.analysis_var.get()]
+        if self.core is None:
+            return
+        if kind is None:
+            self.pending_analysis = None
+            self.view.set_styles({u: NODE_VISITED for u in range(self.core.n) if self.visited[u]})
+            return
+        # while editing, analyse the live nodes only and map the results back
+        graph, ids = (self.core, None) if self.editor is None else (self.core.to_csr(), self.core.live_ids())
+        self.pending_analysis = self.worker.submit(self.run_analysis, kind, graph)
+        self.wait_for_analysis(self.pending_analysis, kind, graph, ids)
+
+    @staticmethod
+    def run_analysis(kind, graph):
+        # worker thread
+        if kind == "components":
+            return dfs_analytics.connected_components(graph)
+        if kind == "cycle":
+            return dfs_analytics.find_cycle(graph)
+        return dfs_analytics.articulation_points_and_bridges(graph)
+
+    def wait_for_analysis(self, future, kind, graph, ids=None):
+        if future is not self.pending_analysis:
+            return  # another analysis, an edit or a new round came first
+        if not future.done():
+            self.after(ROUND_POLL_MS, self.wait_for_analysis, future, kind, graph, ids)
+            return
+        self.pending_analysis = None
+        try:
+            result = future.result()
+        except Exception as e:  # out of memory on a big graph, or cancelled by destroy()
+            self.view.set_styles({})
+            self.feedback.config(text=f"Could not run the analysis: {str(e) or type(e).__name__}")
+            return
+        labels = graph.labels
+        at = int if ids is None else ids.__getitem__  # analysed id -> view id
+        if kind == "components":
+            comp, count = result
+            self.view.set_styles({at(u): GROUP_COLORS[comp[u] % len(GROUP_COLORS)] for u in range(graph.n)})
+            self.feedback.config(text=f"🧩 {count:,} connected component{'s' if count != 1 else ''}, one color each.")
+        elif kind == "cycle":
+            if result is None:
+                self.view.set_styles({})
+                self.feedback.config(text="✅ No cycle: this graph is a tree (or a forest).")
+                return
+            ring = result + result[:1]
+            self.view.set_styles({at(u): HIGHLIGHT_COLOR for u in result},
+                                 {(at(min(u, v)), at(max(u, v))): MARK_COLOR for u, v in zip(ring, ring[1:])})
+            shown = " → ".join(labels[u] for u in ring[:30]) + (" → …" if len(ring) > 30 else "")
+            self.feedback.config(text=f"🔁 Found a cycle of {len(result)} nodes: {shown}")
+        else:
+            cuts, (bridge_us, bridge_vs) = result
+            if kind == "cuts":
+                self.view.set_styles({at(u): MARK_COLOR for u in cuts})
+                self.feedback.config(text=f"📍 {len(cuts):,} cut vertices: removing any one disconnects the graph.")
+            else:
+                self.view.set_styles({}, {(at(u), at(v)): MARK_COLOR for u, v in zip(bridge_us, bridge_vs)})
+                self.feedback.config(text=f"🌉 {len(bridge_us):,} bridges: removing any one disconnects the graph.")
 
     # ---------- UX helpers ----------
     def flash_feedback(self, msg):
@@ -560,7 +1585,9 @@ class DFSPage(tk.Frame, HomeButtonMixin):
         self.after(250, lambda: self.feedback.config(bg=PRIMARY_BG))
 
     def reveal_order(self):
-        self.feedback.config(text=f"True DFS order: {' → '.join(self.expected_order)}")
+        shown = self.expected_order[:60]
+        more = f" … ({len(self.expected_order)} nodes, seed {self.seed})" if len(self.expected_order) > len(shown) else ""
+        self.feedback.config(text=f"True DFS order: {' → '.join(shown)}{more}")
 
 if __name__ == "__main__":
     app = ProjectScreen()
@@ -0,0 +1,183 @@
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from dfs_core import dfs_order_labels, edge_list, np
+from graph_gen import PROFILES, generate_graph
+
+# ----------- Benchmarks ------------
+# Headless timings for the engine paths the app runs on every round, plus
+# optional Tk canvas / tracker timings when a display is available (for a CI
+# box without one: xvfb-run python bench.py --canvas). Every case uses a fixed
+# seed, so runs on the same machine measure the same graphs.
+#
+#   python bench.py                          sizes 10 .. 10^5, every profile
+#   python bench.py --full                   adds 10^6 nodes
+#   python bench.py --save bench_baseline.json
+#   python bench.py --compare bench_baseline.json   exit code 1 on regressions
+#
+# Times are the best of several batches of calls; peak memory is measured in
+# one more call under tracemalloc (Python allocations only), so it doesn't
+# slow the timed runs.
+
+BENCH_SEED = 171
+SIZES = (10, 100, 1000, 10000, 100000)
+FULL_SIZES = SIZES + (1000000,)
+CANVAS_SIZES = (10, 100, 1000, 10000)
+BATCH_TIME = 0.05  # fast cases are timed in batches of calls at least this long
+REPEATS = 5        # best of this many batches...
+MAX_TIME = 2.0     # ...unless they already took this long (the big graphs)
+REGRESSION_RATIO = 1.5
+NOISE_FLOOR = 0.001  # cases faster than 1 ms in the baseline are shown but never flagged
+
+def load_app():
+    # the app's file name starts with a digit, so it can't be imported by name
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "171_project__part1.py")
+    spec = importlib.util.spec_from_file_location("dfs_app", path)
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+def _batch(func, args, loops):
+    gc.collect()
+    t0 = time.perf_counter()
+    for _ in range(loops):
+        func(*args)
+    return time.perf_counter() - t0
+
+def measure(func, *args):
+    # best time per call over the batches, then peak traced memory of one more call
+    loops = 1
+    elapsed = _batch(func, args, loops)
+    while elapsed < BATCH_TIME:
+        loops = max(2 * loops, min(100 * loops, int(BATCH_TIME / max(elapsed, 1e-9) * loops) + 1))
+        elapsed = _batch(func, args, loops)
+    best, total, runs = elapsed / loops, elapsed, 1
+    while runs < REPEATS and total < MAX_TIME:
+        elapsed = _batch(func, args, loops)
+        best = min(best, elapsed / loops)
+        total += elapsed
+        runs += 1
+    gc.collect()
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+# ---------- Cases ----------
+# Each yields (case name, units of work, unit name, callable, args).
+def engine_cases(sizes, profiles):
+    for profile in profiles:
+        for n in sizes:
+            yield f"generate_graph/{profile}/{n}", n, "nodes", generate_graph, (n, profile, BENCH_SEED)
+            graph = generate_graph(n, profile, seed=BENCH_SEED)[0]
+            start = graph.labels[0]
+            yield f"compute_dfs_order/{profile}/{n}", graph.m, "edges", dfs_order_labels, (graph, start)
+            yield f"build_edge_list/{profile}/{n}", graph.m, "edges", edge_list, (graph,)
+
+def canvas_cases(app, sizes, profiles):
+    tk = app.tk
+    root = tk.Tk()
+    root.withdraw()
+    canvas = tk.Canvas(root, width=800, height=500)
+    tracker = app.TrackerPanel(root)
+
+    def draw(nodes, edges):
+        canvas.delete("all")
+        app.draw_graph(canvas, nodes, edges)
+        canvas.update_idletasks()
+
+    def fill_tracker(labels):
+        tracker.clear()
+        for label in labels:
+            tracker.push_stack(label)
+            tracker.append_visited(label)
+        for _ in labels:
+            tracker.pop_stack()
+        tracker.update_idletasks()
+
+    for profile in profiles:
+        for n in sizes:
+            graph, xs, ys = generate_graph(n, profile, seed=BENCH_SEED)
+            labels = graph.labels
+            nodes = {labels[u]: (xs[u], ys[u]) for u in range(n)}
+            us, vs = edge_list(graph)
+            edges = [(labels[u], labels[v]) for u, v in zip(us, vs)]
+            yield f"draw_graph/{profile}/{n}", n + len(edges), "items", draw, (nodes, edges)
+            yield f"tracker/{profile}/{n}", 3 * n, "updates", fill_tracker, ([labels[u] for u in range(n)],)
+    root.destroy()
+
+def run(cases):
+    results = {}
+    for name, units, unit, func, args in cases:
+        seconds, peak = measure(func, *args)
+        results[name] = {"seconds": seconds, "units": units, "unit": unit,
+                         "per_second": units / seconds if seconds > 0 else float("inf"), "peak_bytes": peak}
+        print(f"{name:<36}{seconds * 1000:>11.2f} ms{units / max(seconds, 1e-12):>14,.0f} {unit}/s"
+              f"{peak / 2 ** 20:>10.1f} MiB", flush=True)
+    return results
+
+def compare(results, baseline, ratio):
+    # slower than baseline by more than `ratio` counts as a regression; sub-
+    # millisecond cases swing by more than that from scheduler noise alone
+    regressions = 0
+    print(f"\n{'case':<36}{'baseline':>12}{'now':>12}{'change':>9}")
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        change = now["seconds"] / before["seconds"] if before["seconds"] > 0 else 1.0
+        flag = ""
+        if before["seconds"] < NOISE_FLOOR:
+            pass
+        elif change > ratio:
+            flag, regressions = "  REGRESSION", regressions + 1
+        elif change < 1 / ratio:
+            flag = "  faster"
+        print(f"{name:<36}{before['seconds'] * 1000:>10.2f}ms{now['seconds'] * 1000:>10.2f}ms{change:>8.2f}x{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the DFS visualizer's engine and drawing paths.")
+    parser.add_argument("--full", action="store_true", help="include 10^6-node graphs")
+    parser.add_argument("--sizes", type=int, nargs="+", help="graph sizes to run (overrides --full)")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES))
+    parser.add_argument("--canvas", action="store_true", help="also time draw_graph and TrackerPanel (needs a display)")
+    parser.add_argument("--save", metavar="JSON", help="write the results as a baseline file")
+    parser.add_argument("--compare", metavar="JSON", help="compare against a baseline file")
+    parser.add_argument("--ratio", type=float, default=REGRESSION_RATIO, help="slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (FULL_SIZES if args.full else SIZES)
+    print(f"Python {platform.python_version()} on {platform.machine()}, NumPy {'yes' if np is not None else 'no'}, seed {BENCH_SEED}\n")
+    results = run(engine_cases(sizes, args.profiles))
+    if args.canvas:
+        app = load_app()  # only the canvas cases need Tk
+        try:
+            cases = canvas_cases(app, [n for n in sizes if n <= max(CANVAS_SIZES)], args.profiles)
+            results.update(run(cases))
+        except app.tk.TclError as e:
+            print(f"canvas benchmarks skipped: {e}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "numpy": np is not None, "seed": BENCH_SEED,
+                       "results": results}, f, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("numpy") != (np is not None):
+            print("note: the baseline was recorded with" + ("" if baseline.get("numpy") else "out") + " NumPy")
+        if compare(results, baseline["results"], args.ratio):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import argparse
+from array import array
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import time
+
+from dfs_core import CSRGraph, IdLabels, _little
+from dfs_trace import MappedLabels, _align, write_labels
+
+# ----------- On-disk CSR graphs and bounded-memory DFS (no tkinter in here) ------------
+# A .csr file is a CSRGraph laid out for mmap, little-endian, every section
+# 8-byte aligned:
+#   header    HEADER struct below
+#   offsets   int64, n + 1 of them
+#   targets   int32, m of them
+#   labels    (optional) int64 offsets (n + 1) into a UTF-8 blob, as in .dfstrace
+#             files; without them node u is labelled str(u)
+# MappedCSR opens one without reading it: the arrays are views into the map,
+# so the OS pages adjacency in and out as the traversal moves through it.
+#
+# iter_dfs visits nodes in the same order as dfs_order, but keeps one edge
+# cursor per stack frame instead of pushing every unvisited neighbor (the lazy
+# stack can hold O(m) entries) and a packed bitset for visited. Its memory is
+# n / 8 bytes plus 12 bytes per level of depth, whatever the edge count.
+
+CSR_MAGIC = b"DFSCSR\0\0"
+CSR_VERSION = 1
+HEADER = struct.Struct("<8sIIQQQQQQ")
+FLAG_DIRECTED = 1
+
+def write_header(f, n, m, directed, offsets_at, targets_at, label_offsets_at=0, blob_at=0):
+    f.seek(0)
+    f.write(HEADER.pack(CSR_MAGIC, CSR_VERSION, FLAG_DIRECTED if directed else 0, n, m,
+                        offsets_at, targets_at, label_offsets_at, blob_at))
+
+def write_csr(graph, path, directed=False):
+    # save an in-memory graph; generated graphs (IdLabels) store no labels
+    with open(path, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+        offsets_at = _align(f)
+        f.write(_little(graph.offsets, "q"))
+        targets_at = _align(f)
+        f.write(_little(graph.targets, "i"))
+        label_offsets_at = blob_at = 0
+        if not isinstance(graph.labels, IdLabels):
+            label_offsets_at, blob_at = write_labels(f, graph.labels)
+        write_header(f, graph.n, graph.m, directed, offsets_at, targets_at, label_offsets_at, blob_at)
+
+def is_csr_file(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(CSR_MAGIC)) == CSR_MAGIC
+    except OSError:
+        return False
+
+class MappedCSR(CSRGraph):
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("mapped CSR files need a little-endian machine")
+        self.path = path
+        self.file = open(path, "rb")
+        if os.fstat(self.file.fileno()).st_size < HEADER.size:
+            self.file.close()
+            raise ValueError(f"{path} is not a CSR graph file")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, n, m, offsets_at, targets_at, label_offsets_at, blob_at = HEADER.unpack_from(self.mm, 0)
+        if magic != CSR_MAGIC or version != CSR_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a CSR graph file (or is a newer version)")
+        self.directed = bool(flags & FLAG_DIRECTED)
+        view = memoryview(self.mm)
+        if label_offsets_at:
+            labels = MappedLabels(self.mm, view[label_offsets_at:label_offsets_at + 8 * (n + 1)].cast("q"), blob_at)
+        else:
+            labels = IdLabels(n)
+        super().__init__(labels, view[offsets_at:offsets_at + 8 * (n + 1)].cast("q"),
+                         view[targets_at:targets_at + 4 * m].cast("i"))
+        # keyed by the file rather than its contents: hashing the arrays would
+        # read the whole graph into memory, which is what mapping it avoids
+        st = os.fstat(self.file.fileno())
+        h = hashlib.blake2b(b"csr-file", digest_size=16)
+        h.update(b"%s/%d/%d/%d" % (os.fsencode(os.path.realpath(path)), st.st_size, st.st_mtime_ns, st.st_ino))
+        self._digest = h.hexdigest()
+
+    def close(self):
+        # drop every view into the map before closing it
+        self.labels = self.offsets = self.targets = None
+        try:
+            self.mm.close()
+        except BufferError:
+            pass  # someone still holds a slice; the map closes when it is collected
+        self.file.close()
+
+def open_csr(path):
+    return MappedCSR(path)
+
+# ----------- Bounded-memory DFS ------------
+def iter_dfs(graph, start):
+    # node ids in dfs_order's order, produced as they are visited
+    offsets, targets = graph.offsets, graph.targets
+    seen = bytearray((graph.n + 7) >> 3)
+    seen[start >> 3] |= 1 << (start & 7)
+    yield start
+    nodes = array("i", [start])
+    cursors = array("q", [offsets[start]])
+    while nodes:
+        u = nodes[-1]
+        i, end = cursors[-1], offsets[u + 1]
+        while i < end:
+            v = targets[i]
+            i += 1
+            if not seen[v >> 3] & (1 << (v & 7)):
+                break
+        else:
+            nodes.pop()
+            cursors.pop()
+            continue
+        cursors[-1] = i
+        seen[v >> 3] |= 1 << (v & 7)
+        yield v
+        nodes.append(v)
+        cursors.append(offsets[v])
+
+def dfs_order_bounded(graph, start):
+    return array("i", iter_dfs(graph, start))
+
+def main(argv=None):
+    # convert an edge list, or run one DFS over a .csr file and report peak memory
+    from graph_import import build_csr_file
+
+    parser = argparse.ArgumentParser(description="Build mapped CSR graph files and run bounded-memory DFS on them.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="edge list, SNAP or CSV (integer ids) -> .csr")
+    convert.add_argument("edges")
+    convert.add_argument("csr")
+    convert.add_argument("--directed", action="store_true")
+    dfs = sub.add_parser("dfs", help="DFS from one node of a .csr file")
+    dfs.add_argument("csr")
+    dfs.add_argument("--start", default=None, help="start node label (default: the first node)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.command == "convert":
+        graph = build_csr_file(args.edges, args.csr, directed=args.directed)
+        print(f"{graph.n:,} nodes, {graph.m:,} edge entries in {time.perf_counter() - t0:.1f} s -> {args.csr}")
+    else:
+        graph = open_csr(args.csr)
+        start = 0 if args.start is None else graph.id_of(args.start)
+        count = sum(1 for _ in iter_dfs(graph, start))
+        print(f"reached {count:,} of {graph.n:,} nodes in {time.perf_counter() - t0:.1f} s")
+    graph.close()
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"peak resident set {peak / (1 << 20 if sys.platform == 'darwin' else 1 << 10):,.1f} MiB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
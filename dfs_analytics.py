@@ -0,0 +1,193 @@
+from array import array
+
+# ----------- DFS-based graph analytics (no tkinter in here) ------------
+# Everything here walks the CSR arrays of a CSRGraph with an explicit stack
+# and one edge cursor per stack frame (the next offset to look at), so depth
+# is limited by memory, not by Python's recursion limit. Per-node state lives
+# in array("i") / bytearray, a few bytes per node.
+#
+# Undirected graphs are CSR graphs that list every edge in both directions
+# (as CSRGraph.from_edges builds them); directed ones list each edge once.
+
+def connected_components(graph):
+    # (component id per node, component count); ids follow the lowest node in each
+    offsets, targets = graph.offsets, graph.targets
+    comp = array("i", [-1]) * graph.n
+    count = 0
+    for root in range(graph.n):
+        if comp[root] >= 0:
+            continue
+        comp[root] = count
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if comp[v] < 0:
+                    comp[v] = count
+                    stack.append(v)
+        count += 1
+    return comp, count
+
+def find_cycle(graph, directed=False):
+    # node ids along one cycle (first node not repeated), or None if acyclic
+    offsets, targets, n = graph.offsets, graph.targets, graph.n
+    state = bytearray(n)  # 0 unseen, 1 on the current path, 2 finished
+    parent = array("i", [-1]) * n
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack, cursor = [root], [offsets[root]]
+        while stack:
+            u = stack[-1]
+            i = cursor[-1]
+            if i == offsets[u + 1]:
+                state[u] = 2
+                stack.pop()
+                cursor.pop()
+                continue
+            cursor[-1] = i + 1
+            v = targets[i]
+            if not directed and v == parent[u]:
+                continue  # the tree edge we came down, seen from below
+            if state[v] == 0:
+                state[v] = 1
+                parent[v] = u
+                stack.append(v)
+                cursor.append(offsets[v])
+            elif state[v] == 1:
+                cycle = [u]
+                while cycle[-1] != v:
+                    cycle.append(parent[cycle[-1]])
+                cycle.reverse()
+                return cycle
+    return None
+
+def topological_order(graph):
+    # directed graphs only: reverse DFS finishing order; ValueError on a cycle
+    offsets, targets, n = graph.offsets, graph.targets, graph.n
+    state = bytearray(n)
+    finished = array("i")
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack, cursor = [root], [offsets[root]]
+        while stack:
+            u = stack[-1]
+            i = cursor[-1]
+            if i == offsets[u + 1]:
+                state[u] = 2
+                finished.append(u)
+                stack.pop()
+                cursor.pop()
+                continue
+            cursor[-1] = i + 1
+            v = targets[i]
+            if state[v] == 0:
+                state[v] = 1
+                stack.append(v)
+                cursor.append(offsets[v])
+            elif state[v] == 1:
+                raise ValueError(f"the graph has a cycle through {graph.labels[v]}, so it has no topological order")
+    finished.reverse()
+    return finished
+
+def strongly_connected_components(graph):
+    # Tarjan: (component id per node, component count). Components are numbered
+    # in the order Tarjan closes them, which is a reverse topological order of
+    # the condensation. On an undirected graph these are the connected components.
+    offsets, targets, n = graph.offsets, graph.targets, graph.n
+    index = array("i", [-1]) * n
+    low = array("i", [0]) * n
+    on_stack = bytearray(n)
+    comp = array("i", [-1]) * n
+    scc_stack = []
+    counter = count = 0
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        scc_stack.append(root)
+        on_stack[root] = 1
+        stack, cursor = [root], [offsets[root]]
+        while stack:
+            u = stack[-1]
+            i = cursor[-1]
+            if i < offsets[u + 1]:
+                cursor[-1] = i + 1
+                v = targets[i]
+                if index[v] < 0:
+                    index[v] = low[v] = counter
+                    counter += 1
+                    scc_stack.append(v)
+                    on_stack[v] = 1
+                    stack.append(v)
+                    cursor.append(offsets[v])
+                elif on_stack[v] and index[v] < low[u]:
+                    low[u] = index[v]
+                continue
+            stack.pop()
+            cursor.pop()
+            if stack and low[u] < low[stack[-1]]:
+                low[stack[-1]] = low[u]
+            if low[u] == index[u]:
+                while True:
+                    w = scc_stack.pop()
+                    on_stack[w] = 0
+                    comp[w] = count
+                    if w == u:
+                        break
+                count += 1
+    return comp, count
+
+def articulation_points_and_bridges(graph):
+    # undirected graphs: (cut vertex ids, bridges as parallel arrays us, vs with u < v)
+    offsets, targets, n = graph.offsets, graph.targets, graph.n
+    disc = array("i", [-1]) * n
+    low = array("i", [0]) * n
+    parent = array("i", [-1]) * n
+    is_cut = bytearray(n)
+    bridge_us, bridge_vs = array("i"), array("i")
+    counter = 0
+    for root in range(n):
+        if disc[root] >= 0:
+            continue
+        disc[root] = low[root] = counter
+        counter += 1
+        root_children = 0
+        stack, cursor = [root], [offsets[root]]
+        while stack:
+            u = stack[-1]
+            i = cursor[-1]
+            if i < offsets[u + 1]:
+                cursor[-1] = i + 1
+                v = targets[i]
+                if disc[v] < 0:
+                    disc[v] = low[v] = counter
+                    counter += 1
+                    parent[v] = u
+                    if u == root:
+                        root_children += 1
+                    stack.append(v)
+                    cursor.append(offsets[v])
+                elif v != parent[u] and disc[v] < low[u]:
+                    low[u] = disc[v]
+                continue
+            stack.pop()
+            cursor.pop()
+            if not stack:
+                break
+            p = stack[-1]
+            if low[u] < low[p]:
+                low[p] = low[u]
+            if low[u] > disc[p]:
+                bridge_us.append(min(p, u))
+                bridge_vs.append(max(p, u))
+            if p != root and low[u] >= disc[p]:
+                is_cut[p] = 1
+        if root_children > 1:
+            is_cut[root] = 1
+    return array("i", (u for u in range(n) if is_cut[u])), (bridge_us, bridge_vs)
@@ -0,0 +1,189 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+from dfs_core import dfs_tree
+
+# ----------- Batch DFS over many graphs and start nodes (no tkinter) ------------
+# Answer keys for whole graph pools: every (graph, start) pair gets its DFS
+# order and DFS-tree parent array. Each graph's CSR arrays are copied once into
+# a shared memory block and workers attach to it by name, so no GraphNode dicts
+# or adjacency lists are pickled. Workers write their results straight into
+# shared output blocks; the parent process copies them out into array("i").
+# Starts are run in windows that fill at most WINDOW_BYTES of output, so the
+# shared memory stays bounded however many starts there are.
+
+BATCH_CHUNK = 64  # start nodes per task
+WINDOW_BYTES = 64 << 20  # shared order + parent slots per graph at a time
+MAX_RESULT_BYTES = 1 << 30  # the most batch_dfs will collect in memory
+
+class BatchResult:
+    def __init__(self, graph, starts, orders, lengths, parents):
+        self.graph = graph
+        self.starts = starts    # array("i") of start ids
+        self.orders = orders    # array("i"), n slots per start, first lengths[i] used
+        self.lengths = lengths  # array("i")
+        self.parents = parents  # array("i"), n per start
+
+    def __len__(self):
+        return len(self.starts)
+
+    def order(self, i):
+        n = self.graph.n
+        return self.orders[i * n:i * n + self.lengths[i]]
+
+    def parent(self, i):
+        n = self.graph.n
+        return self.parents[i * n:(i + 1) * n]
+
+class SharedCSR:
+    # just enough of CSRGraph for dfs_tree, backed by shared memory views
+    def __init__(self, n, offsets, targets):
+        self.n = n
+        self.offsets = offsets
+        self.targets = targets
+
+def _new_block(nbytes):
+    return shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+
+def _attach(name):
+    # The parent owns (and unlinks) every block, so attaching must not register
+    # it with this process's resource tracker, or the tracker would unlink it
+    # (or warn about a leak) when a worker exits.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+def _run_chunk(spec, first, starts):
+    n, m = spec["n"], spec["m"]
+    blocks = [_attach(spec[part]) for part in ("csr", "orders", "lengths", "parents")]
+    csr, orders, lengths, parents = (block.buf for block in blocks)
+    views = [csr[:8 * (n + 1)].cast("q"), csr[8 * (n + 1):8 * (n + 1) + 4 * m].cast("i"),
+             orders.cast("i"), lengths.cast("i"), parents.cast("i")]
+    try:
+        graph = SharedCSR(n, views[0], views[1])
+        orders, lengths, parents = views[2:]
+        for i, start in enumerate(starts, first):
+            order, parent = dfs_tree(graph, start)
+            orders[i * n:i * n + len(order)] = order
+            lengths[i] = len(order)
+            parents[i * n:(i + 1) * n] = parent
+    finally:
+        # every view has to go before the blocks can close
+        graph = orders = lengths = parents = csr = None
+        for view in views:
+            view.release()
+        for block in blocks:
+            block.close()
+    return len(starts)
+
+def _free(blocks):
+    for block in blocks.values():
+        block.close()
+        block.unlink()
+
+def _share_graph(graph, count):
+    # one block at a time, so a failed allocation frees the ones before it
+    n, m = graph.n, graph.m
+    blocks = {}
+    try:
+        for part, nbytes in (("csr", 8 * (n + 1) + 4 * m), ("orders", 4 * n * count),
+                             ("lengths", 4 * count), ("parents", 4 * n * count)):
+            blocks[part] = _new_block(nbytes)
+        buf = blocks["csr"].buf
+        buf[:8 * (n + 1)] = array("q", graph.offsets).tobytes()
+        buf[8 * (n + 1):8 * (n + 1) + 4 * m] = array("i", graph.targets).tobytes()
+    except BaseException:
+        _free(blocks)
+        raise
+    spec = {part: block.name for part, block in blocks.items()}
+    spec.update(n=n, m=m)
+    return blocks, spec
+
+def _copy_out(block, count):
+    # the first `count` int32s of a shared block, copied once; the view is
+    # released here so the block can be closed afterwards
+    out = array("i")
+    with block.buf[:4 * count] as view:
+        out.frombytes(view)
+    return out
+
+def _check_starts(graph, starts):
+    # array("i") of start ids; a negative id would wrap around instead of failing
+    if starts is None:
+        return array("i", range(graph.n))
+    checked = array("i")
+    for start in starts:
+        if not 0 <= start < graph.n:
+            raise ValueError(f"start node {start} is not in a graph of {graph.n} nodes")
+        checked.append(start)
+    return checked
+
+def _window(n, count):
+    # starts per window: enough to fill WINDOW_BYTES of order + parent slots
+    return max(1, min(count, WINDOW_BYTES // max(8 * n, 1)))
+
+def _check_batch(graphs, starts):
+    if starts is None:
+        starts = [None] * len(graphs)
+    if len(starts) != len(graphs):
+        raise ValueError("need one list of start nodes per graph")
+    return [_check_starts(graph, graph_starts) for graph, graph_starts in zip(graphs, starts)]
+
+def _run_windows(graphs, starts, workers, chunk):
+    # (graph index, BatchResult) per window, graph by graph; only one graph's
+    # blocks exist at a time and they hold one window, not every start
+    pool = None if workers == 0 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        for g, (graph, graph_starts) in enumerate(zip(graphs, starts)):
+            n, window = graph.n, _window(graph.n, len(graph_starts))
+            blocks, spec = _share_graph(graph, window)
+            try:
+                for lo in range(0, len(graph_starts), window):
+                    part = graph_starts[lo:lo + window]
+                    tasks = [(spec, i, list(part[i:i + chunk])) for i in range(0, len(part), chunk)]
+                    if pool is None:
+                        for task in tasks:
+                            _run_chunk(*task)
+                    else:
+                        for _ in pool.map(_run_chunk, *zip(*tasks)):
+                            pass
+                    k = len(part)
+                    yield g, BatchResult(graph, part, _copy_out(blocks["orders"], n * k),
+                                         _copy_out(blocks["lengths"], k), _copy_out(blocks["parents"], n * k))
+            finally:
+                _free(blocks)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+def iter_batch_dfs(graphs, starts=None, workers=None, chunk=BATCH_CHUNK):
+    # batch_dfs for result sets too big to hold: yields a BatchResult per
+    # window of starts (in order, graph by graph) instead of one per graph
+    starts = _check_batch(graphs, starts)
+    return (part for _, part in _run_windows(graphs, starts, workers, chunk))
+
+def batch_dfs(graphs, starts=None, workers=None, chunk=BATCH_CHUNK):
+    # graphs: CSRGraphs; starts: one list of start ids per graph, None for every
+    # node. workers=0 runs in this process (no pool), None uses every CPU.
+    # Results past MAX_RESULT_BYTES raise ValueError; iter_batch_dfs streams them.
+    starts = _check_batch(graphs, starts)
+    total = sum(8 * graph.n * len(graph_starts) for graph, graph_starts in zip(graphs, starts))
+    if total > MAX_RESULT_BYTES:
+        raise ValueError(f"the results would take {total / (1 << 20):,.0f} MiB; "
+                         "pass fewer starts or stream them with iter_batch_dfs")
+    results = [BatchResult(graph, array("i"), array("i"), array("i"), array("i")) for graph in graphs]
+    for g, part in _run_windows(graphs, starts, workers, chunk):
+        whole = results[g]
+        whole.starts.extend(part.starts)
+        whole.orders.extend(part.orders)
+        whole.lengths.extend(part.lengths)
+        whole.parents.extend(part.parents)
+    return results
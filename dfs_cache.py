@@ -0,0 +1,239 @@
+from array import array
+from collections import OrderedDict
+import hashlib
+import os
+import sys
+import threading
+
+from csr_file import MappedCSR, dfs_order_bounded
+from dfs_core import _little, dfs_order
+from dfs_trace import DFSTrace, TraceFileWriter, open_trace, record_dfs, save_trace
+from graph_layout import ITERATIONS
+
+# ----------- Content-addressed cache for DFS results (no tkinter in here) ------------
+# Keys are (kind, graph digest, parameter): the digest is a hash of the CSR
+# arrays (CSRGraph.digest), so an identical graph built again -- the same seed
+# regenerated, a demo page rebuilt, a file reopened -- finds what was computed
+# for it before, whatever its labels are. A MappedCSR's digest hashes the
+# file's path, size and mtime instead, so it is never read in to be keyed.
+# Kinds:
+#
+#   order    DFS order (array("i") of node ids) from a start node
+#   trace    DFSTrace from a start node
+#   layout   final force-layout positions (xs, ys) for given start positions and seed
+#
+# The memory tier is an LRU bounded by max_bytes of array data. With a
+# disk_dir (or DFS_CACHE_DIR set at start) entries are also written there,
+# one file per key, and the oldest files are removed past disk_bytes. Traces
+# on disk are in the .dfstrace format and are opened through mmap, so a big
+# one costs nothing to bring back.
+
+CACHE_BYTES = 64 << 20
+DISK_BYTES = 1 << 30
+KINDS = ("order", "trace", "layout")
+
+def order_key(graph, start):
+    return ("order", graph.digest, str(start))
+
+def trace_key(graph, start):
+    return ("trace", graph.digest, str(start))
+
+def layout_key(graph, xs, ys, seed=None, iterations=ITERATIONS):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(_little(xs, "d"))
+    h.update(_little(ys, "d"))
+    h.update(b"%r/%d" % (seed, iterations))
+    return ("layout", graph.digest, h.hexdigest())
+
+def nbytes(value):
+    if isinstance(value, DFSTrace):
+        return sum(memoryview(a).nbytes for a in (value.ops, value.nodes, value.links, value.order, value.checkpoints))
+    if isinstance(value, tuple):
+        return sum(nbytes(part) for part in value)
+    return memoryview(value).nbytes
+
+class DFSCache:
+    def __init__(self, max_bytes=CACHE_BYTES, disk_dir=None, disk_bytes=DISK_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self.entries = OrderedDict()  # key -> (value, size), least recently used first
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.counts = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self.disk_used = None  # bytes in disk_dir, counted on first write
+
+    # ---------- Memory tier ----------
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.counts["hits"] += 1
+                return entry[0]
+        value = self._read_disk(key)
+        with self.lock:
+            self.counts["disk_hits" if value is not None else "misses"] += 1
+        if value is not None and key[0] != "trace":
+            self._remember(key, value)  # mapped traces stay on disk; the caller owns them
+        return value
+
+    def put(self, key, value):
+        self._remember(key, value)
+        self._write_disk(key, value)
+
+    def _remember(self, key, value):
+        size = nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self.entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, dropped) = self.entries.popitem(last=False)
+                self.bytes -= dropped
+                self.counts["evictions"] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts, entries=len(self.entries), bytes=self.bytes)
+
+    # ---------- Compute on a miss ----------
+    def order(self, graph, start):
+        key = order_key(graph, start)
+        order = self.get(key)
+        if order is None:
+            # a mapped graph may not fit in memory, so its stack stays bounded too
+            order = dfs_order_bounded(graph, start) if isinstance(graph, MappedCSR) else dfs_order(graph, start)
+            self.put(key, order)
+        return order
+
+    def order_labels(self, graph, start_label):
+        labels = graph.labels
+        return [labels[u] for u in self.order(graph, graph.id_of(start_label))]
+
+    def trace(self, graph, start, to_disk=False):
+        # to_disk records straight into the disk tier (for traces too big to
+        # hold in memory); the trace that comes back uses this graph's labels
+        key = trace_key(graph, start)
+        trace = self.get(key)
+        if trace is None and to_disk and self.disk_dir:
+            path = self._path(key)
+            tmp = path + ".tmp"
+            record_dfs(graph, start, TraceFileWriter(tmp, graph.labels)).close()
+            os.replace(tmp, path)
+            trace = open_trace(path)  # before trimming, which may take the file (not the mapping) away
+            self._count_disk(os.path.getsize(path))
+        elif trace is None:
+            trace = record_dfs(graph, start)
+            self.put(key, trace)
+        if trace.labels is not graph.labels:
+            if type(trace) is DFSTrace:  # shared with the cache: wrap the same arrays
+                trace = DFSTrace(graph.labels, trace.ops, trace.nodes, trace.links, trace.order,
+                                 trace.checkpoints, trace.every)
+            else:  # a freshly opened mapping, nobody else has it
+                trace.labels = graph.labels
+        return trace
+
+    # ---------- Disk tier ----------
+    def _path(self, key):
+        kind, digest, param = key
+        return os.path.join(self.disk_dir, f"{digest}-{param}.{kind}")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            if key[0] == "trace":
+                value = open_trace(path)
+            else:
+                with open(path, "rb") as f:
+                    data = f.read()
+                if key[0] == "order":
+                    value = _native(array("i", data))
+                elif len(data) % 16:
+                    raise ValueError("truncated layout")
+                else:
+                    half = len(data) // 2
+                    value = _native(array("d", data[:half])), _native(array("d", data[half:]))
+            os.utime(path)  # eviction goes by modification time
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self._drop_disk(path)  # truncated or corrupt: recompute and write it again
+            return None
+        return value
+
+    def _drop_disk(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        if self.disk_used is not None:
+            self.disk_used -= size
+
+    def _write_disk(self, key, value):
+        if not self.disk_dir:
+            return
+        os.makedirs(self.disk_dir, exist_ok=True)
+        path = self._path(key)
+        tmp = path + ".tmp"
+        try:
+            if key[0] == "trace":
+                save_trace(value, tmp).close()
+            else:
+                parts = (value,) if key[0] == "order" else value
+                with open(tmp, "wb") as f:
+                    for part in parts:
+                        f.write(_little(part, part.typecode))
+            os.replace(tmp, path)
+            self._count_disk(os.path.getsize(path))
+        except OSError:
+            pass  # a full or read-only cache directory only costs recomputation
+
+    def _count_disk(self, added):
+        if self.disk_used is None:
+            self.disk_used = sum(size for _, size, _ in self._disk_files())
+        else:
+            self.disk_used += added
+        if self.disk_used > self.disk_bytes:
+            self._trim_disk()
+
+    def _disk_files(self):
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(KINDS) and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _trim_disk(self):
+        # oldest first, down to three quarters of the budget
+        files = sorted(self._disk_files())
+        used = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if used <= self.disk_bytes * 3 // 4:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # still mapped somewhere (Windows); try again next time
+            used -= size
+        self.disk_used = used
+
+def _native(values):
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+DFS_CACHE = DFSCache(disk_dir=os.environ.get("DFS_CACHE_DIR") or None)
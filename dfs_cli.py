@@ -0,0 +1,145 @@
+import argparse
+import os
+import sys
+import time
+
+# ----------- Command-line DFS queries (no tkinter in here) ------------
+# Loads one graph and answers any number of start-node queries, one DFS order
+# per output line (labels separated by spaces, the start node first), written
+# out while the traversal runs so long orders start arriving at once:
+#
+#   python dfs_cli.py graph.txt 0 17 42          starts on the command line
+#   python dfs_cli.py graph.csr -q starts.txt    one start label per line
+#   seq 0 99 | python dfs_cli.py graph.txt       starts from stdin
+#   cat edges.txt | python dfs_cli.py - 0        the graph from stdin
+#
+# Only the standard library is imported up front. NumPy makes big edge lists
+# load much faster but costs about 0.1 s to import, so it is left out for
+# .csr files and edge lists under NUMPY_MIN_BYTES (set DFS_NO_NUMPY to decide
+# yourself); the graph modules are imported after that choice is made.
+
+NUMPY_MIN_BYTES = 8 << 20
+WRITE_BATCH = 8192  # labels per write
+
+def want_numpy(path):
+    if path == "-":
+        return False  # size unknown until read; piped graphs are usually small
+    name = path.lower()
+    if name.endswith(".csr"):
+        return False
+    try:
+        return os.path.getsize(path) >= NUMPY_MIN_BYTES
+    except OSError:
+        return False  # let the loader report it
+
+def read_graph(path, fmt=None, directed=False):
+    from graph_import import EdgeReader, load_graph
+
+    if path != "-":
+        return load_graph(path, fmt, directed)
+    fmt = fmt or "edges"
+    if fmt == "csr":
+        raise ValueError("a .csr graph has to be a file (it is memory-mapped)")
+    reader = EdgeReader(b"," if fmt == "csv" else None, header=fmt == "csv")
+    stdin = sys.stdin.buffer
+    rest = b""
+    while True:
+        block = stdin.read(1 << 20)
+        if not block:
+            break
+        block = rest + block
+        cut = block.rfind(b"\n") + 1
+        rest = block[cut:]
+        if cut:
+            reader.feed(block[:cut])
+    if rest:
+        reader.feed(rest)
+    return reader.graph(directed)
+
+def read_queries(starts, query_file):
+    # start labels from the command line, else one per line from a file or stdin
+    if starts:
+        yield from starts
+        return
+    f = sys.stdin if query_file in (None, "-") else open(query_file, encoding="utf-8")
+    try:
+        for line in f:
+            label = line.strip()
+            if label and not label.startswith("#"):
+                yield label
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def write_order(out, graph, start, limit=None, ids=False):
+    from csr_file import iter_dfs
+
+    labels = graph.labels
+    batch, count, sep = [], 0, ""
+    for u in iter_dfs(graph, start):
+        batch.append(str(u) if ids else labels[u])
+        count += 1
+        if count == limit:
+            break
+        if len(batch) == WRITE_BATCH:
+            out.write(sep + " ".join(batch))
+            sep = " "
+            batch.clear()
+    if batch:
+        out.write(sep + " ".join(batch))
+    out.write("\n")
+    out.flush()
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print DFS orders of a graph file, one line per start node.")
+    parser.add_argument("graph", help="edge list, SNAP, CSV or .csr file (- reads an edge list from stdin)")
+    parser.add_argument("starts", nargs="*", help="start node labels (default: read them from --queries)")
+    parser.add_argument("-q", "--queries", help="file of start labels, one per line (default: stdin)")
+    parser.add_argument("--format", choices=("edges", "snap", "csv", "csr"), help="graph format (default: by file name)")
+    parser.add_argument("--directed", action="store_true", help="read u v as an edge from u to v only")
+    parser.add_argument("--limit", type=int, help="print at most this many nodes per order")
+    parser.add_argument("--ids", action="store_true", help="print dense node ids instead of labels")
+    parser.add_argument("-v", "--verbose", action="store_true", help="report timings on stderr")
+    args = parser.parse_args(argv)
+    if args.graph == "-" and not args.starts and args.queries in (None, "-"):
+        parser.error("with the graph on stdin, give the starts on the command line or with --queries FILE")
+
+    t0 = time.perf_counter()
+    if not want_numpy(args.graph):
+        os.environ.setdefault("DFS_NO_NUMPY", "1")
+    try:
+        graph = read_graph(args.graph, args.format, args.directed)
+    except (OSError, ValueError) as e:
+        print(f"{parser.prog}: cannot read {args.graph}: {e}", file=sys.stderr)
+        return 2
+    if args.verbose:
+        print(f"{graph.n:,} nodes, {graph.m:,} edge entries loaded in {time.perf_counter() - t0:.3f} s",
+              file=sys.stderr)
+
+    failed = queries = 0
+    out = sys.stdout
+    try:
+        for label in read_queries(args.starts, args.queries):
+            try:
+                start = graph.id_of(label)
+            except (KeyError, IndexError):
+                print(f"{parser.prog}: no node {label!r}", file=sys.stderr)
+                out.write("\n")  # keep output lines aligned with the queries
+                failed += 1
+                continue
+            t1 = time.perf_counter()
+            count = write_order(out, graph, start, args.limit, args.ids)
+            queries += 1
+            if args.verbose:
+                print(f"{label}: {count:,} nodes in {time.perf_counter() - t1:.3f} s", file=sys.stderr)
+    except BrokenPipeError:
+        # the reader went away (| head); don't let the exit flush complain again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    if args.verbose:
+        print(f"{queries:,} queries in {time.perf_counter() - t0:.3f} s", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+from array import array
+import hashlib
+import os
+import sys
+
+# DFS_NO_NUMPY=1 skips NumPy even when installed: importing it costs about a
+# tenth of a second, more than a command-line query on a small graph takes
+if os.environ.get("DFS_NO_NUMPY", "") not in ("", "0"):
+    np = None
+else:
+    try:
+        import numpy as np
+    except ImportError:  # the app itself only needs the standard library
+        np = None
+
+# ----------- Compact graph core (no tkinter in here) ------------
+# Nodes are dense integer ids 0..n-1. Adjacency is stored CSR style:
+# the neighbors of u are targets[offsets[u]:offsets[u + 1]], in the same
+# order the old GraphNode.neighbors lists had. labels[u] is the display name.
+
+class IdLabels:
+    # labels "0".."n-1" for generated graphs, without storing n strings
+    def __init__(self, n):
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        return str(i)
+
+    def __iter__(self):
+        return map(str, range(self.n))
+
+    def find(self, label):
+        try:
+            node_id = int(label)
+        except ValueError:
+            raise KeyError(label) from None
+        if not 0 <= node_id < self.n:
+            raise KeyError(label)
+        return node_id
+
+class CSRGraph:
+    def __init__(self, labels, offsets, targets):
+        self.labels = labels
+        self.offsets = offsets
+        self.targets = targets
+        self._index = None
+        self._digest = None
+
+    @property
+    def n(self):
+        return len(self.offsets) - 1
+
+    @property
+    def m(self):
+        return len(self.targets)
+
+    @property
+    def index(self):
+        # label -> id, only built when someone asks for it
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.labels)}
+        return self._index
+
+    @property
+    def digest(self):
+        # hex hash of the adjacency alone (not the labels), built on first use;
+        # equal digests mean equal CSR arrays, so DFS results can be shared
+        if self._digest is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(_little(self.offsets, "q"))
+            h.update(_little(self.targets, "i"))
+            self._digest = h.hexdigest()
+        return self._digest
+
+    def id_of(self, label):
+        # label tables that can look labels up themselves (IdLabels, imported
+        # numeric ids) are asked directly instead of building the index dict
+        find = getattr(self.labels, "find", None)
+        if find is not None:
+            return find(label)
+        return self.index[label]
+
+    def label_of(self, node_id):
+        return self.labels[node_id]
+
+    def neighbors(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    @classmethod
+    def from_adjacency(cls, adj):
+        # adj: {label: [neighbor labels]} -- keeps both key and neighbor order
+        labels = list(adj.keys())
+        index = {name: i for i, name in enumerate(labels)}
+        offsets = array("q", [0])
+        targets = array("i")
+        for name in labels:
+            targets.extend(index[v] for v in adj[name])
+            offsets.append(len(targets))
+        g = cls(labels, offsets, targets)
+        g._index = index
+        return g
+
+    @classmethod
+    def from_edges(cls, n, us, vs, labels=None, undirected=True):
+        # Bulk build from parallel id sequences (lists, arrays or NumPy arrays).
+        # Self-loops and repeated edges are dropped; neighbors come out sorted by id.
+        if labels is None:
+            labels = IdLabels(n)
+        if np is not None:
+            # one int64 key per directed edge, sorted in place; imported graphs
+            # can have tens of millions of edges, so temporaries are kept few
+            src = np.asarray(us, dtype=np.int64)
+            dst = np.asarray(vs, dtype=np.int64)
+            keys = np.empty(2 * len(src) if undirected else len(src), dtype=np.int64)
+            np.multiply(src, n, out=keys[:len(src)])
+            keys[:len(src)] += dst
+            if undirected:
+                np.multiply(dst, n, out=keys[len(src):])
+                keys[len(src):] += src
+            keys = keys[keys // n != keys % n]
+            keys.sort()
+            if len(keys):
+                keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+            offsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys // n, minlength=n), out=offsets[1:])
+            return cls(labels, array("q", offsets.tobytes()), array("i", (keys % n).astype(np.int32).tobytes()))
+        keys = set()
+        for u, v in zip(us, vs):
+            if u != v:
+                keys.add(u * n + v)
+                if undirected:
+                    keys.add(v * n + u)
+        offsets = array("q", bytes(8 * (n + 1)))
+        targets = array("i")
+        for key in sorted(keys):
+            u, v = divmod(key, n)
+            offsets[u + 1] += 1
+            targets.append(v)
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        return cls(labels, offsets, targets)
+
+def _little(values, typecode):
+    # the bytes of `values` as little-endian `typecode` items
+    if not (isinstance(values, array) and values.typecode == typecode):
+        values = array(typecode, values)
+    if sys.byteorder != "little":
+        values = array(typecode, values)
+        values.byteswap()
+    return values
+
+def edge_list(graph):
+    # each undirected edge once (u < v), as two id arrays
+    us, vs = array("i"), array("i")
+    offsets, targets = graph.offsets, graph.targets
+    for u in range(graph.n):
+        for k in range(offsets[u], offsets[u + 1]):
+            if u < targets[k]:
+                us.append(u)
+                vs.append(targets[k])
+    return us, vs
+
+# ----------- Iterative DFS on the core ------------
+# Same visiting order as the DFSCode listing: pop, skip if seen, then push
+# the unvisited neighbors in reverse so the first neighbor is popped next.
+
+def dfs_order(graph, start):
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(graph.n)
+    order = array("i")
+    stack = [start]
+    pop, push = stack.pop, stack.append
+    while stack:
+        u = pop()
+        if visited[u]:
+            continue
+        visited[u] = 1
+        order.append(u)
+        lo, hi = offsets[u], offsets[u + 1]
+        for i in range(hi - 1, lo - 1, -1):
+            v = targets[i]
+            if not visited[v]:
+                push(v)
+    return order
+
+def dfs_order_labels(graph, start_label):
+    labels = graph.labels
+    return [labels[u] for u in dfs_order(graph, graph.id_of(start_label))]
+
+def dfs_tree(graph, start):
+    # DFS order plus the DFS-tree parent of every node it reached (-1 for the
+    # start and for nodes it never reached); same order as dfs_order
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(graph.n)
+    parent = array("i", [-1]) * graph.n
+    order = array("i")
+    stack, via = [start], [-1]
+    while stack:
+        u = stack.pop()
+        p = via.pop()
+        if visited[u]:
+            continue
+        visited[u] = 1
+        order.append(u)
+        parent[u] = p
+        for i in range(offsets[u + 1] - 1, offsets[u] - 1, -1):
+            v = targets[i]
+            if not visited[v]:
+                stack.append(v)
+                via.append(u)
+    return order, parent
@@ -0,0 +1,223 @@
+from array import array
+from bisect import bisect_left, insort
+
+from dfs_core import CSRGraph
+from dfs_trace import TraceRecorder, CHECKPOINT_EVERY
+
+# ----------- Editable graph + incremental DFS (no tkinter in here) ------------
+# DFSCode only reads G[u] right after it visits u, so an edit touching nodes
+# u, v, ... cannot change anything that happened before the first of them was
+# visited. IncrementalDFS keeps the full delta trace of the last run plus the
+# event index of every node's VISIT; after an edit it cuts the trace back to
+# the earliest affected VISIT, rebuilds the stack from the trace links, and
+# carries on from there. Edits to nodes the DFS never reached cost nothing.
+
+class EditableGraph:
+    # undirected adjacency lists with the same read interface as CSRGraph;
+    # neighbor lists stay sorted by id, like CSRGraph.from_edges builds them
+    def __init__(self, labels, adj):
+        self.labels = labels
+        self.adj = adj
+        self.alive = bytearray(b"\x01") * len(adj)
+        self._index = None
+
+    @classmethod
+    def from_csr(cls, graph):
+        offsets, targets = graph.offsets, graph.targets
+        adj = [sorted(targets[offsets[u]:offsets[u + 1]]) for u in range(graph.n)]
+        return cls(list(graph.labels), adj)
+
+    def live_ids(self):
+        # node i of to_csr() is node live_ids()[i] here
+        alive = self.alive
+        return array("i", (u for u in range(len(self.adj)) if alive[u]))
+
+    def to_csr(self):
+        # removed nodes are dropped and the rest renumbered in id order, so
+        # neighbor lists stay sorted
+        live = self.live_ids()
+        if len(live) == len(self.adj):
+            new_id = None
+        else:
+            new_id = array("i", [-1]) * len(self.adj)
+            for i, u in enumerate(live):
+                new_id[u] = i
+        offsets = array("q", [0])
+        targets = array("i")
+        for u in live:
+            nbrs = self.adj[u]
+            targets.extend(nbrs if new_id is None else [new_id[v] for v in nbrs])
+            offsets.append(len(targets))
+        if new_id is None:
+            g = CSRGraph(self.labels, offsets, targets)
+            g._index = self._index
+            return g
+        return CSRGraph([self.labels[u] for u in live], offsets, targets)
+
+    @property
+    def n(self):
+        return len(self.adj)
+
+    @property
+    def m(self):
+        return sum(len(nbrs) for nbrs in self.adj)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.labels)}
+        return self._index
+
+    def id_of(self, label):
+        node_id = self.index[label]
+        if not self.alive[node_id]:
+            raise KeyError(label)
+        return node_id
+
+    def label_of(self, node_id):
+        return self.labels[node_id]
+
+    def neighbors(self, u):
+        return self.adj[u]
+
+    def degree(self, u):
+        return len(self.adj[u])
+
+    def has_edge(self, u, v):
+        nbrs = self.adj[u]
+        i = bisect_left(nbrs, v)
+        return i < len(nbrs) and nbrs[i] == v
+
+    def add_node(self, label=None):
+        node_id = len(self.adj)
+        if label is None:
+            # A, B, ... then the id, with a suffix if an imported label took it
+            base = label = chr(ord("A") + node_id) if node_id < 26 else str(node_id)
+            suffix = 1
+            while label in self.index:
+                suffix += 1
+                label = f"{base}_{suffix}"
+        if label in self.index:
+            raise ValueError(f"there is already a node called {label!r}")
+        self.labels.append(label)
+        self.index[label] = node_id
+        self.adj.append([])
+        self.alive.append(1)
+        return node_id
+
+    def remove_node(self, u):
+        # ids are never reused; the node just loses its edges and its label
+        nbrs = self.adj[u]
+        for v in nbrs:
+            self.adj[v].pop(bisect_left(self.adj[v], u))
+        self.adj[u] = []
+        self.alive[u] = 0
+        self.index.pop(self.labels[u], None)
+        return nbrs
+
+    def add_edge(self, u, v):
+        if u == v or self.has_edge(u, v):
+            return False
+        if not (self.alive[u] and self.alive[v]):
+            raise ValueError("cannot connect a removed node")
+        insort(self.adj[u], v)
+        insort(self.adj[v], u)
+        return True
+
+    def remove_edge(self, u, v):
+        if not self.has_edge(u, v):
+            return False
+        self.adj[u].pop(bisect_left(self.adj[u], v))
+        self.adj[v].pop(bisect_left(self.adj[v], u))
+        return True
+
+class IncrementalDFS:
+    def __init__(self, graph, start, every=CHECKPOINT_EVERY):
+        if isinstance(graph, CSRGraph):
+            graph = EditableGraph.from_csr(graph)
+        self.graph = graph
+        self.start = start
+        self.rec = TraceRecorder(graph.labels, every)
+        self.visited = bytearray(graph.n)
+        self.visit_step = array("i", [-1]) * graph.n  # event index of each node's VISIT
+        self.replayed = 0  # events recomputed by the last run or edit
+        self.rec.start(start)
+        self._run([start], len(self.rec.ops))
+
+    @property
+    def order(self):
+        return self.rec.order
+
+    def trace(self):
+        return self.rec.finish()
+
+    # ---------- Edits ----------
+    # Each returns how many entries at the front of `order` are unchanged.
+    def add_edge(self, u, v):
+        if not self.graph.add_edge(u, v):
+            return len(self.order)
+        return self._rerun_from((u, v))
+
+    def remove_edge(self, u, v):
+        if not self.graph.remove_edge(u, v):
+            return len(self.order)
+        return self._rerun_from((u, v))
+
+    def add_node(self, label=None):
+        # a fresh node has no edges, so the DFS cannot have reached it
+        node_id = self.graph.add_node(label)
+        self.visited.append(0)
+        self.visit_step.append(-1)
+        self.replayed = 0
+        return node_id
+
+    def remove_node(self, u):
+        if u == self.start:
+            raise ValueError("the start node cannot be removed")
+        touched = [u]
+        touched.extend(self.graph.remove_node(u))
+        return self._rerun_from(touched)
+
+    # ---------- Recomputing ----------
+    def _rerun_from(self, nodes):
+        steps = [self.visit_step[u] for u in nodes if self.visit_step[u] >= 0]
+        if not steps:
+            self.replayed = 0
+            return len(self.order)
+        step = min(steps)
+        rec, visited, visit_step = self.rec, self.visited, self.visit_step
+        kept = rec.finish().state_at(step)[1]
+        for u in rec.order[kept:]:
+            visited[u] = 0
+            visit_step[u] = -1
+        rec.truncate(step + 1)
+        stack = rec.finish().stack_from(rec.top)
+        self._expand(rec.order[-1], stack)
+        self._run(stack, step + 1)
+        return kept
+
+    def _expand(self, node, stack):
+        visited, rec = self.visited, self.rec
+        for nbr in reversed(self.graph.adj[node]):
+            if not visited[nbr]:
+                stack.append(nbr)
+                rec.push(nbr)
+
+    def _run(self, stack, first):
+        # the DFSCode loop, from wherever `stack` and the recorder left off
+        rec, visited, visit_step, adj = self.rec, self.visited, self.visit_step, self.graph.adj
+        while stack:
+            node = stack.pop()
+            rec.pop(node)
+            if visited[node]:
+                rec.skip(node)
+                continue
+            visited[node] = 1
+            visit_step[node] = len(rec.ops)
+            rec.visit(node)
+            for nbr in reversed(adj[node]):
+                if not visited[nbr]:
+                    stack.append(nbr)
+                    rec.push(nbr)
+        rec.done()
+        self.replayed = len(rec.ops) - first
@@ -0,0 +1,357 @@
+from array import array
+from bisect import bisect_right
+import mmap
+import os
+import struct
+import sys
+
+from dfs_core import _little
+
+# ----------- DFS trace (no tkinter in here) ------------
+# A trace is one event per step of the DFSCode listing. Each event is a delta
+# (op, node, link) rather than a copy of the stack and visited list:
+#   START / PUSH  link = event index of the stack entry underneath (-1 if none)
+#   POP           link = event index of the PUSH that is being popped
+# so the stack at any step is a chain of links from the current top, and the
+# visited list is always a prefix of `order`. Every CHECKPOINT_EVERY events a
+# checkpoint stores (top, visited count) so seeking replays a bounded number
+# of events.
+
+START, POP, SKIP, VISIT, PUSH, DONE = range(6)
+CHECKPOINT_EVERY = 1024
+
+# line numbers in DFSCode (it starts with a blank line)
+CODE_LINES = {
+    START: [2, 3, 4, 5],
+    POP: [6, 7],
+    SKIP: [8, 9],
+    VISIT: [10, 11],
+    PUSH: [12, 13, 14],
+    DONE: [15],
+}
+
+STEP_TEXT = {
+    START: "Push the start node {} onto the stack.",
+    POP: "Pop {} off the top of the stack.",
+    SKIP: "{} was already visited, so skip it.",
+    VISIT: "Visit {} and add it to the order.",
+    PUSH: "Push unvisited neighbor {} onto the stack.",
+    DONE: "The stack is empty, so DFS is done.",
+}
+
+class DFSTrace:
+    def __init__(self, labels, ops, nodes, links, order, checkpoints, every=CHECKPOINT_EVERY):
+        self.labels = labels
+        self.ops = ops
+        self.nodes = nodes
+        self.links = links
+        self.order = order
+        self.checkpoints = checkpoints  # flat pairs: top, visited count before event j * every
+        self.every = every
+
+    def __len__(self):
+        return len(self.ops)
+
+    def event(self, step):
+        return self.ops[step], self.nodes[step]
+
+    def code_lines(self, step):
+        return CODE_LINES[self.ops[step]]
+
+    def describe(self, step):
+        op, node = self.ops[step], self.nodes[step]
+        return STEP_TEXT[op].format(self.labels[node] if node >= 0 else "")
+
+    def state_at(self, step):
+        # (top event index, visited count) after `step`; step -1 is before anything ran
+        # (the checkpoint for the very end is only written if another event follows)
+        j = min((step + 1) // self.every, len(self.checkpoints) // 2 - 1)
+        top, seen = self.checkpoints[2 * j], self.checkpoints[2 * j + 1]
+        ops, links = self.ops, self.links
+        for e in range(j * self.every, step + 1):
+            op = ops[e]
+            if op == PUSH or op == START:
+                top = e
+            elif op == POP:
+                top = links[top]
+            elif op == VISIT:
+                seen += 1
+        return top, seen
+
+    def stack_from(self, top):
+        # node ids bottom -> top
+        nodes, links = self.nodes, self.links
+        stack = []
+        while top >= 0:
+            stack.append(nodes[top])
+            top = links[top]
+        stack.reverse()
+        return stack
+
+    def stack_at(self, step):
+        return self.stack_from(self.state_at(step)[0])
+
+    def visited_at(self, step):
+        return self.order[:self.state_at(step)[1]]
+
+# ----------- Recorder ------------
+class TraceRecorder:
+    def __init__(self, labels, every=CHECKPOINT_EVERY):
+        self.labels = labels
+        self.every = every
+        self.ops = array("b")
+        self.nodes = array("i")
+        self.links = array("i")
+        self.order = array("i")
+        self.checkpoints = array("i", [-1, 0])
+        self.top = -1
+
+    def _emit(self, op, node, link):
+        e = len(self.ops)
+        if e and e % self.every == 0:
+            self.checkpoints.append(self.top)
+            self.checkpoints.append(len(self.order))
+        self.ops.append(op)
+        self.nodes.append(node)
+        self.links.append(link)
+        return e
+
+    def start(self, node):
+        self.top = self._emit(START, node, self.top)
+
+    def push(self, node):
+        self.top = self._emit(PUSH, node, self.top)
+
+    def pop(self, node):
+        popped = self.top
+        self._emit(POP, node, popped)
+        self.top = self.links[popped]
+
+    def skip(self, node):
+        self._emit(SKIP, node, -1)
+
+    def visit(self, node):
+        self._emit(VISIT, node, -1)
+        self.order.append(node)
+
+    def done(self):
+        self._emit(DONE, -1, -1)
+
+    def truncate(self, length):
+        # forget every event from `length` on, as if recording had stopped there
+        top, seen = self.finish().state_at(length - 1)
+        del self.ops[length:]
+        del self.nodes[length:]
+        del self.links[length:]
+        del self.order[seen:]
+        del self.checkpoints[2 * max(1, -(-length // self.every)):]
+        self.top = top
+
+    def finish(self):
+        return DFSTrace(self.labels, self.ops, self.nodes, self.links, self.order, self.checkpoints, self.every)
+
+def record_dfs(graph, start, recorder=None):
+    # DFSCode, step for step, reporting every action to the recorder
+    rec = recorder if recorder is not None else TraceRecorder(graph.labels)
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(graph.n)
+    stack = [start]
+    rec.start(start)
+    while stack:
+        node = stack.pop()
+        rec.pop(node)
+        if visited[node]:
+            rec.skip(node)
+            continue
+        visited[node] = 1
+        rec.visit(node)
+        for i in range(offsets[node + 1] - 1, offsets[node] - 1, -1):
+            nbr = targets[i]
+            if not visited[nbr]:
+                stack.append(nbr)
+                rec.push(nbr)
+    rec.done()
+    return rec.finish()
+
+# ----------- On-disk trace format ------------
+# Little-endian, every section 8-byte aligned:
+#   header    HEADER struct below
+#   events    n_events records of three int32: op, node, link
+#   checks    int32 pairs (top, visited count), one per CHECKPOINT_EVERY events
+#   order     int32 node ids in visiting order
+#   labels    int64 offsets (n_labels + 1) into a UTF-8 blob of label text
+# A MappedTrace reads it through mmap, so opening is instant and seeking only
+# touches the pages of the checkpoint and the events it replays.
+
+TRACE_MAGIC = b"DFSTRACE"
+TRACE_VERSION = 1
+HEADER = struct.Struct("<8sIIQQQQQQQQQ")
+FLUSH_EVENTS = 1 << 16
+
+def _align(f):
+    pad = -f.tell() % 8
+    if pad:
+        f.write(b"\0" * pad)
+    return f.tell()
+
+def write_labels(f, labels):
+    # the label section of .dfstrace and .csr files: n + 1 int64 offsets into
+    # a UTF-8 blob (read back by MappedLabels); returns where both start
+    offsets_at = _align(f)
+    blob = bytearray()
+    offsets = array("q", [0])
+    for label in labels:
+        blob += str(label).encode("utf-8")
+        offsets.append(len(blob))
+    f.write(_little(offsets, "q"))
+    blob_at = f.tell()
+    f.write(blob)
+    return offsets_at, blob_at
+
+class TraceFileWriter:
+    # same interface as TraceRecorder, but streams events to `path`
+    def __init__(self, path, labels, every=CHECKPOINT_EVERY):
+        self.path = path
+        self.labels = labels
+        self.every = every
+        self.f = open(path, "wb")
+        self.f.write(b"\0" * HEADER.size)
+        self.events_at = _align(self.f)
+        self.buf = array("i")
+        self.count = 0
+        self.order = array("i")
+        self.checkpoints = array("i", [-1, 0])
+        self.tops = []  # event indices of the pushes still on the stack
+
+    def _emit(self, op, node, link):
+        e = self.count
+        if e and e % self.every == 0:
+            self.checkpoints.append(self.tops[-1] if self.tops else -1)
+            self.checkpoints.append(len(self.order))
+        self.buf.extend((op, node, link))
+        self.count += 1
+        if len(self.buf) >= 3 * FLUSH_EVENTS:
+            self.f.write(_little(self.buf, "i"))
+            self.buf = array("i")
+        return e
+
+    def start(self, node):
+        self.tops.append(self._emit(START, node, -1))
+
+    def push(self, node):
+        self.tops.append(self._emit(PUSH, node, self.tops[-1] if self.tops else -1))
+
+    def pop(self, node):
+        self._emit(POP, node, self.tops[-1])
+        self.tops.pop()
+
+    def skip(self, node):
+        self._emit(SKIP, node, -1)
+
+    def visit(self, node):
+        self._emit(VISIT, node, -1)
+        self.order.append(node)
+
+    def done(self):
+        self._emit(DONE, -1, -1)
+
+    def finish(self):
+        f = self.f
+        f.write(_little(self.buf, "i"))
+        checks_at = _align(f)
+        f.write(_little(self.checkpoints, "i"))
+        order_at = _align(f)
+        f.write(_little(self.order, "i"))
+        label_offsets_at, blob_at = write_labels(f, self.labels)
+        f.seek(0)
+        f.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, self.every, self.count, len(self.checkpoints),
+                            len(self.order), len(self.labels), self.events_at, checks_at, order_at,
+                            label_offsets_at, blob_at))
+        f.close()
+        return open_trace(self.path)
+
+class MappedLabels:
+    # labels decoded on demand from the trace file
+    def __init__(self, mm, offsets, blob_at):
+        self.mm = mm
+        self.offsets = offsets
+        self.blob_at = blob_at
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return self.mm[self.blob_at + lo:self.blob_at + hi].decode("utf-8")
+
+    def find(self, label):
+        # label -> id by searching the mapped blob, so id_of never builds an
+        # O(n) dict; a hit only counts if it starts and ends on label boundaries
+        target = str(label).encode("utf-8")
+        offsets, mm, base = self.offsets, self.mm, self.blob_at
+        n = len(offsets) - 1
+        if not target:
+            for i in range(n):
+                if offsets[i] == offsets[i + 1]:
+                    return i
+            raise KeyError(label)
+        end = base + offsets[n]
+        pos = mm.find(target, base, end)
+        while pos >= 0:
+            rel = pos - base
+            i = bisect_right(offsets, rel, 0, n) - 1  # the last label starting here (earlier ones are empty)
+            if offsets[i] == rel and offsets[i + 1] == rel + len(target):
+                return i
+            pos = mm.find(target, pos + 1, end)
+        raise KeyError(label)
+
+class MappedTrace(DFSTrace):
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("mapped traces need a little-endian machine")
+        self.path = path
+        self.file = open(path, "rb")
+        if os.fstat(self.file.fileno()).st_size < HEADER.size:
+            self.file.close()
+            raise ValueError(f"{path} is not a DFS trace file")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, every, n_events, n_checks, n_order, n_labels,
+         events_at, checks_at, order_at, label_offsets_at, blob_at) = HEADER.unpack_from(self.mm, 0)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a DFS trace file (or is a newer version)")
+        view = memoryview(self.mm)
+        events = view[events_at:events_at + 12 * n_events].cast("i")
+        super().__init__(
+            MappedLabels(self.mm, view[label_offsets_at:label_offsets_at + 8 * (n_labels + 1)].cast("q"), blob_at),
+            events[0::3],
+            events[1::3],
+            events[2::3],
+            view[order_at:order_at + 4 * n_order].cast("i"),
+            view[checks_at:checks_at + 4 * n_checks].cast("i"),
+            every,
+        )
+
+    def close(self):
+        # drop every view into the map before closing it
+        self.labels = self.ops = self.nodes = self.links = self.order = self.checkpoints = None
+        try:
+            self.mm.close()
+        except BufferError:
+            pass  # someone still holds a slice; the map closes when it is collected
+        self.file.close()
+
+def open_trace(path):
+    return MappedTrace(path)
+
+def save_trace(trace, path):
+    # write an in-memory DFSTrace out in the on-disk format
+    writer = TraceFileWriter(path, trace.labels, trace.every)
+    handlers = {START: writer.start, POP: writer.pop, SKIP: writer.skip, VISIT: writer.visit, PUSH: writer.push}
+    for step in range(len(trace)):
+        op, node = trace.ops[step], trace.nodes[step]
+        if op == DONE:
+            writer.done()
+        else:
+            handlers[op](node)
+    return writer.finish()
@@ -0,0 +1,390 @@
+import argparse
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+
+import dfs_trace
+from dfs_trace import MappedTrace, open_trace, save_trace
+
+# ----------- Offscreen frame exporter (no tkinter in here) ------------
+# Replays a DFS trace and writes one file per step, without a Tk window:
+#
+#   svg   vector frames with labels and the step caption
+#   ps    Encapsulated PostScript, the same drawing
+#   png   raster frames (nodes and edges only, no text), encoded with zlib
+#
+# A Scene holds the geometry draw_graph uses (edges shortened to the node
+# rim, Tk-style arrowheads, circles with a 3px outline) and is built once.
+# Each encoder keeps the static part of the picture -- edges, labels, the
+# raster background -- and one snippet per node; a step only redraws the
+# nodes whose color changed, then the frame is written out. Frames are cut
+# into runs of FRAMES_PER_TASK and encoded in worker processes; each worker
+# opens the trace file through mmap and rebuilds the colors at the start of
+# its run from the trace checkpoints.
+
+FORMATS = ("svg", "ps", "png")
+NODE_RADIUS = 20
+OUTLINE_WIDTH = 3
+EDGE_WIDTH = 2
+ARROW_SHAPE = (16, 18, 8)  # Tk's arrowshape: neck to tip, wings to tip, wing width
+LABEL_FONT_SIZE = 16
+CAPTION_HEIGHT = 32
+MARGIN = 20
+MIN_LABEL_RADIUS = 8   # smaller nodes (big graphs fitted into the frame) get no labels
+FRAMES_PER_TASK = 64
+PNG_LEVEL = 1          # zlib level: frames are big and mostly the same, speed matters more
+# the app's colors (see the constants at the top of 171_project__part1.py)
+DEFAULT_STYLE = {"background": "#e3eafc", "node": "#a7c7e7", "visited": "#b6e2d3", "start": "#ffe066",
+                 "outline": "#3a506b", "edge": "#adb5bd"}
+
+# ---------- Geometry shared with draw_graph ----------
+def edge_line(x1, y1, x2, y2, r):
+    # the segment between two node rims, or None for nodes on top of each other
+    dx, dy = x2 - x1, y2 - y1
+    dist = (dx * dx + dy * dy) ** 0.5
+    if dist == 0:
+        return None
+    ux, uy = dx / dist, dy / dist
+    return x1 + ux * r, y1 + uy * r, x2 - ux * r, y2 - uy * r
+
+def arrow_head(sx, sy, ex, ey, width=EDGE_WIDTH, shape=ARROW_SHAPE):
+    # tip, wing, neck, wing -- the polygon Tk draws for arrow=LAST
+    neck, wings, spread = shape
+    dx, dy = ex - sx, ey - sy
+    length = (dx * dx + dy * dy) ** 0.5 or 1.0
+    ux, uy = dx / length, dy / length
+    px, py = -uy * (spread + width / 2), ux * (spread + width / 2)
+    bx, by = ex - ux * wings, ey - uy * wings
+    return ((ex, ey), (bx + px, by + py), (ex - ux * neck, ey - uy * neck), (bx - px, by - py))
+
+class Scene:
+    # node centers, radius and edge segments in frame pixels
+    def __init__(self, xs, ys, us, vs, labels, width=None, height=None, radius=NODE_RADIUS, arrows=True):
+        n = len(xs)
+        self.labels = labels
+        self.arrows = arrows
+        x0, y0 = (min(xs), min(ys)) if n else (0, 0)
+        x1, y1 = (max(xs), max(ys)) if n else (0, 0)
+        if width is None or height is None:
+            # keep canvas coordinates, like the page the graph came from
+            width = width or math.ceil(x1 + radius + MARGIN)
+            height = height or math.ceil(y1 + radius + MARGIN) + CAPTION_HEIGHT
+            scale, ox, oy = 1.0, 0.0, 0.0
+        else:
+            room_w, room_h = width - 2 * (radius + MARGIN), height - CAPTION_HEIGHT - 2 * (radius + MARGIN)
+            scale = min(1.0, room_w / max(x1 - x0, 1e-9), room_h / max(y1 - y0, 1e-9))
+            ox, oy = radius + MARGIN - x0 * scale, radius + MARGIN - y0 * scale
+        self.width, self.height = int(width), int(height)
+        self.radius = max(1.0, radius * scale) if scale < 1 else radius
+        self.xs = array("d", (ox + x * scale for x in xs))
+        self.ys = array("d", (oy + y * scale for y in ys))
+        self.lines = []
+        for u, v in zip(us, vs):
+            line = edge_line(self.xs[u], self.ys[u], self.xs[v], self.ys[v], self.radius)
+            if line is not None:
+                self.lines.append(line)
+
+    @property
+    def n(self):
+        return len(self.xs)
+
+    def show_labels(self):
+        return self.radius >= MIN_LABEL_RADIUS
+
+def _rgb(color):
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+# ---------- SVG ----------
+def _xml(text):
+    return str(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+class SVGFrames:
+    extension = "svg"
+
+    def __init__(self, scene, style):
+        self.scene = scene
+        self.style = style
+        r = scene.radius
+        head = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{scene.width}" height="{scene.height}" '
+                f'viewBox="0 0 {scene.width} {scene.height}">\n'
+                f'<rect width="100%" height="100%" fill="{style["background"]}"/>\n'
+                f'<g stroke="{style["edge"]}" stroke-width="{EDGE_WIDTH}">\n']
+        head.extend(f'<line x1="{sx:.1f}" y1="{sy:.1f}" x2="{ex:.1f}" y2="{ey:.1f}"/>\n' for sx, sy, ex, ey in scene.lines)
+        head.append(f'</g>\n<g fill="{style["edge"]}">\n')
+        if scene.arrows:
+            for line in scene.lines:
+                points = " ".join(f"{x:.1f},{y:.1f}" for x, y in arrow_head(*line))
+                head.append(f'<polygon points="{points}"/>\n')
+        head.append(f'</g>\n<g stroke="{style["outline"]}" stroke-width="{OUTLINE_WIDTH}">\n')
+        self.head = "".join(head).encode()
+        self.circles = [b""] * scene.n
+        for u in range(scene.n):
+            self.set_node(u, style["node"])
+        tail = ["</g>\n"]
+        if scene.show_labels():
+            tail.append(f'<g font-family="Arial" font-size="{LABEL_FONT_SIZE}" font-weight="bold" text-anchor="middle" '
+                        f'dominant-baseline="central" fill="{style["outline"]}">\n')
+            tail.extend(f'<text x="{scene.xs[u]:.1f}" y="{scene.ys[u]:.1f}">{_xml(scene.labels[u])}</text>\n'
+                        for u in range(scene.n))
+            tail.append("</g>\n")
+        self.tail = "".join(tail).encode()
+        self.caption_y = scene.height - CAPTION_HEIGHT / 2
+
+    def set_node(self, u, fill):
+        s = self.scene
+        self.circles[u] = b'<circle cx="%.1f" cy="%.1f" r="%.1f" fill="%s"/>\n' % (s.xs[u], s.ys[u], s.radius, fill.encode())
+
+    def frame(self, caption):
+        text = (f'<text x="{MARGIN}" y="{self.caption_y:.0f}" font-family="Arial" font-size="14" '
+                f'dominant-baseline="central" fill="{self.style["outline"]}">{_xml(caption)}</text>\n</svg>\n')
+        return b"".join((self.head, b"".join(self.circles), self.tail, text.encode()))
+
+# ---------- PostScript ----------
+def _ps_string(text):
+    return "(" + str(text).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+def _ps_rgb(color):
+    return " ".join(f"{c / 255:.3f}" for c in _rgb(color))
+
+class PSFrames:
+    extension = "eps"
+
+    def __init__(self, scene, style):
+        # PostScript's y axis points up; everything is drawn in a flipped
+        # coordinate system so it uses the same numbers as the canvas
+        self.scene = scene
+        self.style = style
+        w, h = scene.width, scene.height
+        head = ["%!PS-Adobe-3.0 EPSF-3.0\n", f"%%BoundingBox: 0 0 {w} {h}\n",
+                f"/R {scene.radius:.2f} def\n",
+                f"/node {{ newpath R 0 360 arc gsave setrgbcolor fill grestore {_ps_rgb(style['outline'])} setrgbcolor stroke }} def\n",
+                f"/label {{ gsave translate 1 -1 scale dup stringwidth pop -2 div {-LABEL_FONT_SIZE * 0.35:.2f} moveto show grestore }} def\n",
+                f"{_ps_rgb(style['background'])} setrgbcolor 0 0 {w} {h} rectfill\n",
+                f"0 {h} translate 1 -1 scale 1 setlinejoin\n",
+                f"{_ps_rgb(style['edge'])} setrgbcolor {EDGE_WIDTH} setlinewidth\n"]
+        head.extend(f"newpath {sx:.1f} {sy:.1f} moveto {ex:.1f} {ey:.1f} lineto stroke\n" for sx, sy, ex, ey in scene.lines)
+        if scene.arrows:
+            for line in scene.lines:
+                (ax, ay), *rest = arrow_head(*line)
+                head.append(f"newpath {ax:.1f} {ay:.1f} moveto " + " ".join(f"{x:.1f} {y:.1f} lineto" for x, y in rest) + " closepath fill\n")
+        head.append(f"{OUTLINE_WIDTH} setlinewidth\n")
+        self.head = "".join(head).encode()
+        self.circles = [b""] * scene.n
+        for u in range(scene.n):
+            self.set_node(u, style["node"])
+        tail = []
+        if scene.show_labels():
+            tail.append(f"/Helvetica-Bold findfont {LABEL_FONT_SIZE} scalefont setfont {_ps_rgb(style['outline'])} setrgbcolor\n")
+            tail.extend(f"{_ps_string(scene.labels[u])} {scene.xs[u]:.1f} {scene.ys[u]:.1f} label\n" for u in range(scene.n))
+        self.tail = "".join(tail).encode()
+        self.caption_y = scene.height - CAPTION_HEIGHT / 2
+
+    def set_node(self, u, fill):
+        s = self.scene
+        self.circles[u] = b"%s %.1f %.1f node\n" % (_ps_rgb(fill).encode(), s.xs[u], s.ys[u])
+
+    def frame(self, caption):
+        text = (f"/Helvetica findfont 14 scalefont setfont {_ps_rgb(self.style['outline'])} setrgbcolor\n"
+                f"gsave {MARGIN} {self.caption_y + 5:.0f} translate 1 -1 scale 0 0 moveto {_ps_string(caption)} show grestore\n"
+                "showpage\n%%EOF\n")
+        return b"".join((self.head, b"".join(self.circles), self.tail, text.encode()))
+
+# ---------- PNG ----------
+class PNGFrames:
+    # RGB rows with their PNG filter byte already in place, so a frame is the
+    # buffer as is, compressed; a node change repaints only that node's disc
+    extension = "png"
+
+    def __init__(self, scene, style):
+        self.scene = scene
+        self.style = style
+        self.stride = 1 + 3 * scene.width
+        self.buf = bytearray((b"\x00" + bytes(_rgb(style["background"])) * scene.width) * scene.height)
+        edge = _rgb(style["edge"])
+        for line in scene.lines:
+            self._line(*line, edge)
+            if scene.arrows:
+                self._polygon(arrow_head(*line), edge)
+        for u in range(scene.n):
+            self.set_node(u, style["node"])
+
+    def _span(self, y, xa, xb, color):
+        if 0 <= y < self.scene.height:
+            xa, xb = max(0, xa), min(self.scene.width - 1, xb)
+            if xa <= xb:
+                start = y * self.stride + 1 + 3 * xa
+                self.buf[start:start + 3 * (xb - xa + 1)] = bytes(color) * (xb - xa + 1)
+
+    def _line(self, x0, y0, x1, y1, color):
+        steps = int(max(abs(x1 - x0), abs(y1 - y0))) + 1
+        half = EDGE_WIDTH // 2
+        for i in range(steps + 1):
+            t = i / steps
+            x, y = round(x0 + (x1 - x0) * t), round(y0 + (y1 - y0) * t)
+            for yy in range(y - half, y - half + EDGE_WIDTH):
+                self._span(yy, x - half, x - half + EDGE_WIDTH - 1, color)
+
+    def _polygon(self, points, color):
+        # even-odd scanline fill
+        ys = [y for _, y in points]
+        for y in range(int(min(ys)), int(math.ceil(max(ys))) + 1):
+            cy = y + 0.5
+            xs = []
+            for (ax, ay), (bx, by) in zip(points, points[1:] + points[:1]):
+                if (ay <= cy) != (by <= cy):
+                    xs.append(ax + (cy - ay) * (bx - ax) / (by - ay))
+            xs.sort()
+            for xa, xb in zip(xs[0::2], xs[1::2]):
+                self._span(y, int(round(xa)), int(round(xb)) - 1, color)
+
+    def set_node(self, u, fill):
+        s = self.scene
+        cx, cy, r = s.xs[u], s.ys[u], s.radius
+        inner = max(0.0, r - OUTLINE_WIDTH)
+        outline, fill = _rgb(self.style["outline"]), _rgb(fill)
+        for y in range(int(cy - r), int(math.ceil(cy + r)) + 1):
+            dy = y + 0.5 - cy
+            if abs(dy) > r:
+                continue
+            half = math.sqrt(r * r - dy * dy)
+            self._span(y, int(round(cx - half)), int(round(cx + half)) - 1, outline)
+            if abs(dy) < inner:
+                half = math.sqrt(inner * inner - dy * dy)
+                self._span(y, int(round(cx - half)), int(round(cx + half)) - 1, fill)
+
+    def frame(self, caption):
+        def chunk(kind, data):
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+        header = struct.pack(">IIBBBBB", self.scene.width, self.scene.height, 8, 2, 0, 0, 0)
+        return b"".join((b"\x89PNG\r\n\x1a\n", chunk(b"IHDR", header),
+                         chunk(b"IDAT", zlib.compress(self.buf, PNG_LEVEL)), chunk(b"IEND", b"")))
+
+ENCODERS = {"svg": SVGFrames, "ps": PSFrames, "png": PNGFrames}
+
+# ---------- Replay ----------
+def frame_path(out_dir, prefix, step, extension):
+    # step -1 (before the first event) is frame 0
+    return os.path.join(out_dir, f"{prefix}{step + 1:06d}.{extension}")
+
+def caption(trace, step):
+    if step < 0:
+        return "Ready: press Next to start."
+    return f"Step {step + 1}/{len(trace)}: {trace.describe(step)}"
+
+def _export_run(spec, trace=None):
+    # one run of frames: rebuild the colors at the first frame, then step
+    own = trace is None
+    if own:
+        trace = open_trace(spec["trace_path"])
+    try:
+        style = spec["style"]
+        scene = Scene(*spec["scene"])
+        encoder = ENCODERS[spec["format"]](scene, style)
+        first, stop, every = spec["steps"]
+        order = trace.order
+        _, seen = trace.state_at(first)
+        for i in range(seen):
+            encoder.set_node(order[i], style["start"] if i == 0 else style["visited"])
+        written = 0
+        for step in range(first, stop):
+            if step > first and trace.ops[step] == dfs_trace.VISIT:
+                encoder.set_node(trace.nodes[step], style["start"] if seen == 0 else style["visited"])
+                seen += 1
+            if (step - first) % every == 0:
+                with open(frame_path(spec["out_dir"], spec["prefix"], step, encoder.extension), "wb") as f:
+                    f.write(encoder.frame(caption(trace, step)))
+                written += 1
+        return written
+    finally:
+        if own:
+            trace.close()
+
+def export_frames(trace, xs, ys, us, vs, out_dir, fmt="svg", every=1, first=-1, last=None, prefix="frame",
+                  width=None, height=None, arrows=True, style=None, workers=None, chunk=FRAMES_PER_TASK,
+                  progress=None):
+    # Writes the frames for steps first, first + every, ... up to `last` (the
+    # final step by default) and returns how many. xs / ys are node positions
+    # by node id, us / vs the edges to draw. workers=0 encodes in this process.
+    if fmt not in ENCODERS:
+        raise ValueError(f"unknown frame format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    if every < 1:
+        raise ValueError("every must be at least 1")
+    last = len(trace) - 1 if last is None else min(last, len(trace) - 1)
+    os.makedirs(out_dir, exist_ok=True)
+    base = {"scene": (array("d", xs), array("d", ys), array("i", us), array("i", vs),
+                      [str(label) for label in trace.labels], width, height, NODE_RADIUS, arrows),
+            "style": dict(DEFAULT_STYLE, **(style or {})), "format": fmt, "out_dir": out_dir, "prefix": prefix}
+    span = chunk * every
+    runs = [dict(base, steps=(lo, min(lo + span, last + 1), every)) for lo in range(first, last + 1, span)]
+    done = 0
+    if workers == 0:
+        for spec in runs:
+            done += _export_run(spec, trace)
+            if progress is not None:
+                progress(done)
+        return done
+    # workers open the trace by path; an in-memory (or already deleted) trace is saved first
+    temp = None
+    path = getattr(trace, "path", None) if isinstance(trace, MappedTrace) else None
+    if path is None or not os.path.exists(path):
+        fd, temp = tempfile.mkstemp(suffix=".dfstrace")
+        os.close(fd)
+        save_trace(trace, temp).close()
+        path = temp
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for written in pool.map(_export_run, [dict(spec, trace_path=path) for spec in runs]):
+            done += written
+            if progress is not None:
+                progress(done)
+    except BaseException:
+        # a failed run (or a dead worker) ends the export: drop the runs not started yet
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    else:
+        pool.shutdown()
+    finally:
+        if temp is not None:
+            os.remove(temp)
+    return done
+
+def main(argv=None):
+    # batch export for a graph file: same positions as the step-through pages give imported graphs
+    from dfs_cache import DFS_CACHE
+    from dfs_core import edge_list
+    from graph_gen import random_positions
+    from graph_import import load_graph
+
+    parser = argparse.ArgumentParser(description="Export a DFS walkthrough of a graph file as one frame per step.")
+    parser.add_argument("graph", help="edge list, SNAP or CSV file")
+    parser.add_argument("out_dir")
+    parser.add_argument("--format", choices=FORMATS, default="svg")
+    parser.add_argument("--start", default=None, help="start node label (default: the first node)")
+    parser.add_argument("--every", type=int, default=1, help="write every k-th step")
+    parser.add_argument("--limit", type=int, help="stop after this many steps")
+    parser.add_argument("--size", type=int, nargs=2, default=(800, 600), metavar=("W", "H"))
+    parser.add_argument("--workers", type=int, help="encoding processes (0 encodes in this process)")
+    args = parser.parse_args(argv)
+
+    graph = load_graph(args.graph)
+    start = 0 if args.start is None else graph.id_of(args.start)
+    trace = DFS_CACHE.trace(graph, start)
+    width, height = args.size
+    xs, ys = random_positions(graph.n, seed=0, width=width, height=height - CAPTION_HEIGHT, margin=40)
+    us, vs = edge_list(graph)
+    t0 = time.perf_counter()
+    last = None if args.limit is None else args.limit - 1
+    count = export_frames(trace, xs, ys, us, vs, args.out_dir, args.format, args.every, last=last,
+                          width=width, height=height, arrows=False, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+    print(f"{count:,} frames in {elapsed:.1f} s ({count / max(elapsed, 1e-9):,.0f} frames/s) -> {args.out_dir}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,569 @@
+import argparse
+import asyncio
+import base64
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import hashlib
+import json
+import os
+import random
+import secrets
+import sys
+import time
+from array import array
+from urllib.parse import parse_qs
+
+from dfs_core import CSRGraph, dfs_order, edge_list
+import perf_stats
+from graph_gen import PROFILES, generate_graph, make_labels
+
+# ----------- Multi-session DFS game server (no tkinter in here) ------------
+# The DFS game over HTTP and WebSocket for a whole classroom, on asyncio
+# streams and the standard library only. Rounds are generated and solved by
+# background workers into a pool per (size, profile); a round is immutable, so
+# many sessions can play the same one at once, and it is retired after
+# ROUND_REUSE plays and replaced by a fresh one. Every round stores its
+# expected DFS order and each node's rank in it, so a click is checked with
+# two array lookups; a session only keeps its round and how far it got.
+#
+#   python game_server.py serve [--port 8171]
+#   python game_server.py load --clients 200 --seconds 10    (against a running server)
+#
+# HTTP (JSON bodies and replies):
+#   POST   /sessions                 {"size": 1000, "profile": "grid"}  -> {"session", "round"}
+#   GET    /sessions/<id>            current round and progress
+#   POST   /sessions/<id>/click      {"node": 3}  -> {"result": "correct" | "wrong" | "visited" | "done", ...}
+#   POST   /sessions/<id>/new        skip to a new round
+#   DELETE /sessions/<id>
+#   GET    /stats
+#   GET    /ws?size=1000&profile=grid   WebSocket: the server sends {"session", "round"}, then
+#                                        answers every {"click": 3} or {"new": true} message
+#
+# A round is {"n", "profile", "seed", "start", "us", "vs", "xs", "ys"} plus
+# "labels" for rounds small enough to use letters; nodes are ids 0..n-1 and
+# edges are listed once each as parallel id lists us, vs.
+
+DEFAULT_PORT = 8171
+ROUND_SIZES = (None, 50, 1000, 10000, 100000)  # None is the original 5-7 node round
+POOL_SIZE = 16         # rounds kept ready per (size, profile)
+ROUND_REUSE = 64       # plays of one round before it is replaced
+REFILL_BATCH = 8       # rounds built per worker task
+SESSION_TTL = 30 * 60  # seconds an idle HTTP session is kept
+SWEEP_SECONDS = 60
+MAX_SESSIONS = 100000
+MAX_BODY_BYTES = 64 << 10
+MAX_MESSAGE_BYTES = 64 << 10
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error",
+               503: "Service Unavailable"}
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# ---------- Rounds ----------
+def build_rounds(size, profile, seeds):
+    # worker process: generate, solve and encode a batch of rounds; only bytes come back
+    built = []
+    for seed in seeds:
+        n = size if size is not None else random.Random(seed).randint(5, 7)
+        graph, xs, ys = generate_graph(n, profile, seed=seed)
+        start = random.Random(seed).randrange(graph.n)
+        order = dfs_order(graph, start)
+        rank = array("i", [-1]) * graph.n
+        for i, u in enumerate(order):
+            rank[u] = i
+        us, vs = edge_list(graph)
+        payload = {"n": graph.n, "profile": profile, "seed": seed, "start": start,
+                   "us": us.tolist(), "vs": vs.tolist(),
+                   "xs": [round(x, 1) for x in xs], "ys": [round(y, 1) for y in ys]}
+        if isinstance(graph.labels, list):
+            payload["labels"] = graph.labels
+        built.append((graph.n, order.tobytes(), rank.tobytes(),
+                      json.dumps(payload, separators=(",", ":")).encode()))
+    return built
+
+class Round:
+    __slots__ = ("n", "order", "rank", "labels", "payload", "plays")
+
+    def __init__(self, n, order, rank, payload):
+        self.n = n
+        self.order = array("i", order)  # node ids in DFS order
+        self.rank = array("i", rank)    # position of each node in order, -1 if unreachable
+        self.labels = make_labels(n)
+        self.payload = payload          # the round as JSON bytes, sent as is
+        self.plays = 0
+
+class Shelf:
+    # the ready rounds for one (size, profile)
+    def __init__(self):
+        self.rounds = []
+        self.next = 0
+        self.building = False
+        self.error = None
+        self.filled = asyncio.Event()
+
+class RoundPool:
+    def __init__(self, executor, size=POOL_SIZE, reuse=ROUND_REUSE):
+        self.executor = executor
+        self.size = size
+        self.reuse = reuse
+        self.shelves = {}
+        self.built = 0
+
+    def shelf(self, key):
+        shelf = self.shelves.get(key)
+        if shelf is None:
+            shelf = self.shelves[key] = Shelf()
+            self.refill(key)
+        return shelf
+
+    async def take(self, key):
+        shelf = self.shelf(key)
+        while not shelf.rounds:
+            if shelf.error is not None:
+                error, shelf.error = shelf.error, None
+                self.refill(key)
+                raise RequestError(503, f"could not build a round: {error}")
+            shelf.filled.clear()
+            await shelf.filled.wait()
+        i = shelf.next % len(shelf.rounds)
+        rnd = shelf.rounds[i]
+        shelf.next = i + 1
+        rnd.plays += 1
+        if rnd.plays >= self.reuse and len(shelf.rounds) > 1:
+            # retire it; the last round of a shelf stays until its replacements arrive
+            shelf.rounds[i] = shelf.rounds[-1]
+            shelf.rounds.pop()
+            self.refill(key)
+        return rnd
+
+    def refill(self, key):
+        shelf = self.shelves[key]
+        missing = self.size - len(shelf.rounds)
+        if shelf.building or missing <= 0:
+            return
+        shelf.building = True
+        # an empty shelf gets one round first, so the first player isn't kept
+        # waiting for a whole batch of big graphs; batches then double
+        batch = min(missing, REFILL_BATCH, max(1, len(shelf.rounds)))
+        seeds = [random.randrange(2 ** 31) for _ in range(batch)]
+        future = asyncio.get_running_loop().run_in_executor(self.executor, build_rounds, *key, seeds)
+        future.add_done_callback(lambda f: self.stock(key, f))
+
+    def stock(self, key, future):
+        shelf = self.shelves[key]
+        shelf.building = False
+        try:
+            built = future.result()
+        except Exception as e:  # a dead worker pool, bad settings...
+            shelf.error = e
+        else:
+            shelf.rounds.extend(Round(*parts) for parts in built)
+            self.built += len(built)
+            shelf.error = None
+            self.refill(key)
+        shelf.filled.set()
+
+    def levels(self):
+        return {f"{size or 'small'}/{profile}": len(shelf.rounds) for (size, profile), shelf in self.shelves.items()}
+
+# ---------- Sessions ----------
+class Session:
+    __slots__ = ("id", "key", "round", "index", "score", "mistakes", "touched")
+
+    def __init__(self, session_id, key, rnd):
+        self.id = session_id
+        self.key = key
+        self.round = rnd
+        self.index = 0  # how many nodes of round.order were picked so far
+        self.score = 0
+        self.mistakes = 0
+        self.touched = time.monotonic()
+
+    def state(self):
+        return b'{"session":"%s","score":%d,"next":%d,"round":%s}' % (
+            self.id.encode(), self.score, self.index, self.round.payload)
+
+def parse_settings(size, profile):
+    if size in (None, "", "small"):
+        size = None
+    else:
+        try:
+            size = int(size)
+        except (TypeError, ValueError):
+            raise RequestError(400, f"size must be a number, got {size!r}") from None
+        if size not in ROUND_SIZES:
+            raise RequestError(400, f"size must be one of {', '.join(str(s) for s in ROUND_SIZES if s)}")
+    profile = profile or "tree"
+    if profile not in PROFILES:
+        raise RequestError(400, f"profile must be one of {', '.join(PROFILES)}")
+    return size, profile
+
+class GameServer:
+    def __init__(self, executor, pool_size=POOL_SIZE, reuse=ROUND_REUSE):
+        self.pool = RoundPool(executor, pool_size, reuse)
+        self.sessions = {}
+        self.counts = {"clicks": 0, "correct": 0, "wrong": 0, "rounds": 0, "sessions": 0}
+        self.started = time.monotonic()
+
+    async def new_session(self, key):
+        if len(self.sessions) >= MAX_SESSIONS:
+            raise RequestError(503, "too many sessions")
+        session = Session(secrets.token_urlsafe(12), key, await self.pool.take(key))
+        self.sessions[session.id] = session
+        self.counts["sessions"] += 1
+        self.counts["rounds"] += 1
+        return session
+
+    async def next_round(self, session):
+        session.round = await self.pool.take(session.key)
+        session.index = 0
+        self.counts["rounds"] += 1
+
+    async def click(self, session, node):
+        with perf_stats.span("server.click"):
+            rnd, i = session.round, session.index
+            if type(node) is not int or not 0 <= node < rnd.n:
+                raise RequestError(400, f"node must be an id from 0 to {rnd.n - 1}")
+            counts = self.counts
+            counts["clicks"] += 1
+            session.touched = time.monotonic()
+            if rnd.order[i] == node:
+                counts["correct"] += 1
+                i += 1
+                if i < len(rnd.order):
+                    session.index = i
+                    return b'{"result":"correct","next":%d}' % i
+                session.score += 1
+                await self.next_round(session)
+                return b'{"result":"done","score":%d,"round":%s}' % (session.score, session.round.payload)
+            counts["wrong"] += 1
+            session.mistakes += 1
+            expected = rnd.labels[rnd.order[i]].encode()
+            if 0 <= rnd.rank[node] < i:
+                return b'{"result":"visited","expected":"%s"}' % expected
+            return b'{"result":"wrong","expected":"%s"}' % expected
+
+    def session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise RequestError(404, "no such session (it may have expired)")
+        return session
+
+    def stats(self):
+        elapsed = time.monotonic() - self.started
+        stats = dict(self.counts, live_sessions=len(self.sessions), uptime_s=round(elapsed, 1),
+                     clicks_per_s=round(self.counts["clicks"] / max(elapsed, 1e-9), 1),
+                     rounds_built=self.pool.built, pool=self.pool.levels())
+        if perf_stats.enabled():
+            stats["timers"] = perf_stats.REGISTRY.rows()
+        return stats
+
+    async def sweep(self):
+        # drop HTTP sessions nobody has clicked in for SESSION_TTL
+        while True:
+            await asyncio.sleep(SWEEP_SECONDS)
+            cutoff = time.monotonic() - SESSION_TTL
+            for session_id in [s.id for s in self.sessions.values() if s.touched < cutoff]:
+                del self.sessions[session_id]
+
+    # ---------- HTTP ----------
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    writer.write(http_response(431, error_body("request headers too large"), False))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    writer.write(http_response(400, error_body("malformed request line"), False))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                path, _, query = target.partition("?")
+                if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                    await self.websocket(reader, writer, headers, parse_qs(query))
+                    break
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length > MAX_BODY_BYTES:
+                        raise RequestError(413, "request body too large")
+                    body = await reader.readexactly(length) if length else b""
+                    status, reply = 200, await self.route(method, path, parse_qs(query), body)
+                except RequestError as e:
+                    status, reply = e.status, error_body(str(e))
+                except ValueError:
+                    status, reply = 400, error_body("malformed request")
+                writer.write(http_response(status, reply, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, query, body):
+        parts = path.strip("/").split("/")
+        if parts == ["stats"]:
+            return json.dumps(self.stats()).encode()
+        if parts[0] != "sessions" or len(parts) > 3:
+            raise RequestError(404, f"no route for {path}")
+        data = json.loads(body) if body.strip() else {}
+        if not isinstance(data, dict):
+            raise RequestError(400, "the request body must be a JSON object")
+        if len(parts) == 1:
+            if method != "POST":
+                raise RequestError(405, "use POST to start a session")
+            session = await self.new_session(parse_settings(data.get("size"), data.get("profile")))
+            return session.state()
+        session = self.session(parts[1])
+        action = parts[2] if len(parts) == 3 else None
+        if action is None and method == "GET":
+            return session.state()
+        if action is None and method == "DELETE":
+            del self.sessions[session.id]
+            return b'{"deleted":true}'
+        if action == "click" and method == "POST":
+            return await self.click(session, data.get("node"))
+        if action == "new" and method == "POST":
+            await self.next_round(session)
+            return session.state()
+        raise RequestError(405, f"{method} is not supported on {path}")
+
+    # ---------- WebSocket ----------
+    async def websocket(self, reader, writer, headers, query):
+        key = headers.get("sec-websocket-key", "").encode()
+        try:
+            session = await self.new_session(parse_settings(
+                query.get("size", [None])[0], query.get("profile", [None])[0]))
+        except RequestError as e:
+            writer.write(http_response(e.status, error_body(str(e)), False))
+            return
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     b"Sec-WebSocket-Accept: %s\r\n\r\n" % accept_key(key))
+        writer.write(ws_frame(1, session.state()))
+        try:
+            while True:
+                opcode, data = await read_message(reader, require_mask=True)
+                if opcode == 8:
+                    writer.write(ws_frame(8, data[:2]))
+                    break
+                if opcode == 9:
+                    writer.write(ws_frame(10, data))
+                    continue
+                if opcode not in (1, 2):
+                    continue
+                try:
+                    message = json.loads(data)
+                    if "click" in message:
+                        reply = await self.click(session, message["click"])
+                    elif message.get("new"):
+                        await self.next_round(session)
+                        reply = session.state()
+                    else:
+                        raise RequestError(400, 'expected {"click": node} or {"new": true}')
+                except RequestError as e:
+                    reply = error_body(str(e))
+                except (ValueError, TypeError, AttributeError):
+                    reply = error_body("malformed message")
+                writer.write(ws_frame(1, reply))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError:  # oversized or unmasked frame
+            writer.write(ws_frame(8, (1002).to_bytes(2, "big")))
+        finally:
+            self.sessions.pop(session.id, None)
+
+def error_body(message):
+    return json.dumps({"error": message}).encode()
+
+def http_response(status, body, keep_alive):
+    return b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\nConnection: %s\r\n\r\n%s" % (
+        status, STATUS_TEXT.get(status, "Error").encode(), len(body), b"keep-alive" if keep_alive else b"close", body)
+
+def accept_key(key):
+    return base64.b64encode(hashlib.sha1(key + WS_GUID).digest())
+
+def apply_mask(data, mask):
+    # XOR with the repeating 4-byte mask as one big integer operation
+    n = len(data)
+    if not n:
+        return data
+    key = int.from_bytes((mask * (n // 4 + 1))[:n], "little")
+    return (int.from_bytes(data, "little") ^ key).to_bytes(n, "little")
+
+def ws_frame(opcode, data, mask=None):
+    # a single unfragmented frame; clients must mask, servers must not
+    n = len(data)
+    bit = 0x80 if mask else 0
+    if n < 126:
+        head = bytes((0x80 | opcode, bit | n))
+    elif n < 1 << 16:
+        head = bytes((0x80 | opcode, bit | 126)) + n.to_bytes(2, "big")
+    else:
+        head = bytes((0x80 | opcode, bit | 127)) + n.to_bytes(8, "big")
+    if mask:
+        return head + mask + apply_mask(data, mask)
+    return head + data
+
+async def read_message(reader, require_mask=False, limit=MAX_MESSAGE_BYTES):
+    # (opcode, payload) of the next whole message; fragments are joined
+    parts, first = [], None
+    while True:
+        b0, b1 = await reader.readexactly(2)
+        length = b1 & 0x7F
+        if length == 126:
+            length = int.from_bytes(await reader.readexactly(2), "big")
+        elif length == 127:
+            length = int.from_bytes(await reader.readexactly(8), "big")
+        if require_mask and not b1 & 0x80:
+            raise ValueError("client frames must be masked")
+        if length > limit:
+            raise ValueError("message too large")
+        mask = await reader.readexactly(4) if b1 & 0x80 else None
+        data = await reader.readexactly(length)
+        if mask:
+            data = apply_mask(data, mask)
+        opcode = b0 & 0x0F
+        if opcode >= 8:
+            return opcode, data  # control frames can come between fragments
+        if first is None:
+            first = opcode
+        parts.append(data)
+        if b0 & 0x80:
+            return first, b"".join(parts) if len(parts) > 1 else data
+
+async def serve(host, port, workers, pool_size, reuse, warm):
+    executor = ThreadPoolExecutor(max_workers=1) if workers == 0 else ProcessPoolExecutor(max_workers=workers)
+    game = GameServer(executor, pool_size, reuse)
+    for key in warm:
+        game.pool.shelf(key)
+    server = await asyncio.start_server(game.handle, host, port, backlog=1024)
+    sweeper = asyncio.ensure_future(game.sweep())
+    print(f"DFS game server on http://{host}:{port} (WebSocket at ws://{host}:{port}/ws)", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweeper.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# ---------- Load generator ----------
+# Many WebSocket players on one event loop. Each solves its round locally
+# (the same CSR build and DFS the server uses), clicks the right node, or
+# with probability `mistakes` a wrong one, waits for the reply and checks
+# the server judged the click the way it should have.
+
+async def ws_connect(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16))
+    writer.write(b"GET %s HTTP/1.1\r\nHost: %s:%d\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 b"Sec-WebSocket-Key: %s\r\nSec-WebSocket-Version: 13\r\n\r\n" % (path.encode(), host.encode(), port, key))
+    head = await reader.readuntil(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.1 101") or accept_key(key) not in head:
+        writer.close()
+        raise ConnectionError(head.split(b"\r\n", 1)[0].decode("latin-1"))
+    return reader, writer
+
+def solve(payload):
+    graph = CSRGraph.from_edges(payload["n"], payload["us"], payload["vs"])
+    return dfs_order(graph, payload["start"])
+
+async def player(host, port, path, deadline, mistakes, tally, latencies):
+    rng = random.Random()
+    reader, writer = await ws_connect(host, port, path)
+    try:
+        _, data = await read_message(reader, limit=1 << 30)
+        payload = json.loads(data)["round"]
+        order, n, i = solve(payload), payload["n"], 0
+        while time.perf_counter() < deadline:
+            wrong = n > 1 and rng.random() < mistakes
+            node = (order[i] + rng.randrange(1, n)) % n if wrong else order[i]
+            t0 = time.perf_counter()
+            writer.write(ws_frame(1, b'{"click":%d}' % node, os.urandom(4)))
+            _, data = await read_message(reader, limit=1 << 30)
+            latencies.append(time.perf_counter() - t0)
+            reply = json.loads(data)
+            result = reply.get("result")
+            tally["clicks"] += 1
+            if wrong:
+                tally["ok" if result in ("wrong", "visited") else "misjudged"] += 1
+            elif result == "correct":
+                i += 1
+                tally["ok"] += 1
+            elif result == "done":
+                payload = reply["round"]
+                order, n, i = solve(payload), payload["n"], 0
+                tally["ok"] += 1
+                tally["rounds"] += 1
+            else:
+                tally["misjudged"] += 1
+        writer.write(ws_frame(8, (1000).to_bytes(2, "big"), os.urandom(4)))
+        await writer.drain()
+    finally:
+        writer.close()
+
+async def load(host, port, clients, seconds, size, profile, mistakes):
+    path = "/ws?profile=" + profile + (f"&size={size}" if size else "")
+    tally = {"clicks": 0, "ok": 0, "misjudged": 0, "rounds": 0}
+    latencies = array("d")
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(player(host, port, path, t0 + seconds, mistakes, tally, latencies)
+                                     for _ in range(clients)), return_exceptions=True)
+    elapsed = time.perf_counter() - t0
+    failed = [r for r in results if isinstance(r, BaseException)]
+    ordered = sorted(latencies)
+
+    def ms(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000 if ordered else 0.0
+    print(f"{clients} clients, {elapsed:.1f} s: {tally['clicks']:,} clicks ({tally['clicks'] / elapsed:,.0f}/s), "
+          f"{tally['rounds']:,} rounds finished")
+    print(f"latency p50 {ms(0.5):.2f} ms, p95 {ms(0.95):.2f} ms, p99 {ms(0.99):.2f} ms")
+    print(f"misjudged clicks: {tally['misjudged']}, failed clients: {len(failed)}")
+    for error in failed[:3]:
+        print(f"  {type(error).__name__}: {error}")
+    return 1 if failed or tally["misjudged"] else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the DFS game to many players, or load-test a server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_cmd = commands.add_parser("serve", help="run the game server")
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+    serve_cmd.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_cmd.add_argument("--workers", type=int, help="round-building processes (0 builds on a thread; default every CPU)")
+    serve_cmd.add_argument("--pool", type=int, default=POOL_SIZE, help="rounds kept ready per size and profile")
+    serve_cmd.add_argument("--reuse", type=int, default=ROUND_REUSE, help="plays of a round before it is replaced")
+    load_cmd = commands.add_parser("load", help="play against a running server with many simulated clients")
+    load_cmd.add_argument("--host", default="127.0.0.1")
+    load_cmd.add_argument("--port", type=int, default=DEFAULT_PORT)
+    load_cmd.add_argument("--clients", type=int, default=100)
+    load_cmd.add_argument("--seconds", type=float, default=10.0)
+    load_cmd.add_argument("--size", type=int, choices=[s for s in ROUND_SIZES if s])
+    load_cmd.add_argument("--profile", choices=PROFILES, default="tree")
+    load_cmd.add_argument("--mistakes", type=float, default=0.1, help="share of deliberately wrong clicks")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "serve":
+            warm = [(size, "tree") for size in ROUND_SIZES[:2]]
+            asyncio.run(serve(args.host, args.port, args.workers, args.pool, args.reuse, warm))
+            return 0
+        return asyncio.run(load(args.host, args.port, args.clients, args.seconds, args.size, args.profile, args.mistakes))
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
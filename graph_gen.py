@@ -0,0 +1,150 @@
+from array import array
+import math
+import random
+
+from dfs_core import CSRGraph, IdLabels, np
+
+# ----------- Seeded graph generators (no tkinter in here) ------------
+# Every generator returns (graph, xs, ys): a connected CSRGraph plus node
+# positions as array("d"). The same seed gives the same graph again (with the
+# same backend: NumPy when it is installed, the random module otherwise).
+# Edges are produced as whole id arrays and turned into CSR in one go by
+# CSRGraph.from_edges, so big graphs never go through per-edge tuples.
+#
+#   tree       random recursive tree plus `density` extra edges per node
+#   grid       rows x cols lattice
+#   random     Erdos-Renyi G(n, m) around a random Hamiltonian path, avg degree `density`
+#   power_law  Chung-Lu graph with power-law weights around a random tree, avg degree `density`
+
+PROFILES = ("tree", "grid", "random", "power_law")
+DEFAULT_DENSITY = {"tree": 0.3, "grid": 0.0, "random": 4.0, "power_law": 4.0}
+POWER_LAW_EXPONENT = 2.5
+
+def make_labels(n):
+    # single letters while they last, like the original game, then numbers
+    if n <= 26:
+        return [chr(ord("A") + i) for i in range(n)]
+    return IdLabels(n)
+
+def generate_graph(n, profile="tree", seed=None, density=None):
+    if profile not in PROFILES:
+        raise ValueError(f"unknown graph profile {profile!r}, expected one of {', '.join(PROFILES)}")
+    if n < 1:
+        raise ValueError("a graph needs at least one node")
+    if density is None:
+        density = DEFAULT_DENSITY[profile]
+    rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+    if profile == "grid":
+        cols = max(1, math.ceil(math.sqrt(n)))
+        us, vs = grid_edges(n, cols)
+        xs, ys = lattice_positions(n, cols)
+        return CSRGraph.from_edges(n, us, vs, make_labels(n)), xs, ys
+    if profile == "tree":
+        us, vs = tree_edges(n, rng)
+        eu, ev = random_pairs(n, int(density * n), rng)
+    elif profile == "random":
+        us, vs = path_edges(n, rng)
+        eu, ev = random_pairs(n, max(0, int(density * n / 2) - (n - 1)), rng)
+    else:
+        us, vs = tree_edges(n, rng)
+        eu, ev = weighted_pairs(n, max(0, int(density * n / 2) - (n - 1)), rng)
+    us, vs = concat(us, eu), concat(vs, ev)
+    xs, ys = scatter_positions(n, rng)
+    return CSRGraph.from_edges(n, us, vs, make_labels(n)), xs, ys
+
+# ---------- Edge builders ----------
+def concat(a, b):
+    if np is not None:
+        return np.concatenate((a, b))
+    return a + b
+
+def tree_edges(n, rng):
+    # node i hangs off a uniformly random earlier node
+    if np is not None:
+        child = np.arange(1, n, dtype=np.int64)
+        parent = (rng.random(n - 1) * child).astype(np.int64)
+        return child, parent
+    child = array("i", range(1, n))
+    parent = array("i", (int(rng.random() * i) for i in range(1, n)))
+    return child, parent
+
+def path_edges(n, rng):
+    if np is not None:
+        perm = rng.permutation(n)
+        return perm[:-1], perm[1:]
+    perm = array("i", range(n))
+    rng.shuffle(perm)
+    return perm[:-1], perm[1:]
+
+def random_pairs(n, count, rng):
+    # duplicates and self-loops are dropped later by CSRGraph.from_edges
+    if np is not None:
+        return rng.integers(0, n, count), rng.integers(0, n, count)
+    return array("i", (rng.randrange(n) for _ in range(count))), array("i", (rng.randrange(n) for _ in range(count)))
+
+def weighted_pairs(n, count, rng):
+    # Chung-Lu: endpoints drawn proportional to w_i = (i + 1) ** (-1 / (gamma - 1))
+    power = -1.0 / (POWER_LAW_EXPONENT - 1)
+    if np is not None:
+        cum = np.cumsum(np.arange(1, n + 1, dtype=np.float64) ** power)
+        def pick():
+            # sorted lookups walk cum in order (much faster), then shuffle them back
+            ends = np.minimum(np.searchsorted(cum, np.sort(rng.random(count)) * cum[-1]), n - 1)
+            rng.shuffle(ends)
+            return ends
+        return pick(), pick()
+    cum, total = [], 0.0
+    for i in range(n):
+        total += (i + 1) ** power
+        cum.append(total)
+    nodes = range(n)
+    return array("i", rng.choices(nodes, cum_weights=cum, k=count)), array("i", rng.choices(nodes, cum_weights=cum, k=count))
+
+def grid_edges(n, cols):
+    if np is not None:
+        ids = np.arange(n, dtype=np.int64)
+        right = ids[(ids % cols != cols - 1) & (ids + 1 < n)]
+        down = ids[ids + cols < n]
+        return np.concatenate((right, down)), np.concatenate((right + 1, down + cols))
+    us, vs = array("i"), array("i")
+    for i in range(n):
+        if i % cols != cols - 1 and i + 1 < n:
+            us.append(i)
+            vs.append(i + 1)
+        if i + cols < n:
+            us.append(i)
+            vs.append(i + cols)
+    return us, vs
+
+# ---------- Positions ----------
+def lattice_positions(n, cols, spacing=None, width=800, height=500, margin=80):
+    rows = math.ceil(n / cols)
+    if spacing is None:
+        spacing = max(60, min((width - 2 * margin) / max(cols - 1, 1), (height - 2 * margin) / max(rows - 1, 1)))
+    if np is not None:
+        ids = np.arange(n)
+        return (array("d", (margin + (ids % cols) * spacing).astype(np.float64).tobytes()),
+                array("d", (margin + (ids // cols) * spacing).astype(np.float64).tobytes()))
+    return (array("d", (margin + (i % cols) * spacing for i in range(n))),
+            array("d", (margin + (i // cols) * spacing for i in range(n))))
+
+def random_positions(n, seed=None, **canvas):
+    # scatter_positions for graphs that did not come from generate_graph
+    return scatter_positions(n, np.random.default_rng(seed) if np is not None else random.Random(seed), **canvas)
+
+def scatter_positions(n, rng, width=800, height=500, margin=80):
+    # Nodes go into shuffled, jittered cells of a grid shaped like the canvas.
+    # Small graphs fill the canvas; big ones keep 60px spacing and get zoomed out.
+    cols = max(1, math.ceil(math.sqrt(n * width / height)))
+    rows = math.ceil(n / cols)
+    spacing = max(60, min((width - 2 * margin) / max(cols - 1, 1), (height - 2 * margin) / max(rows - 1, 1)))
+    jitter = spacing * 0.2
+    if np is not None:
+        slots = rng.permutation(rows * cols)[:n]
+        xs = margin + (slots % cols) * spacing + rng.uniform(-jitter, jitter, n)
+        ys = margin + (slots // cols) * spacing + rng.uniform(-jitter, jitter, n)
+        return array("d", xs.astype(np.float64).tobytes()), array("d", ys.astype(np.float64).tobytes())
+    slots = rng.sample(range(rows * cols), n)
+    xs = array("d", (margin + (s % cols) * spacing + rng.uniform(-jitter, jitter) for s in slots))
+    ys = array("d", (margin + (s // cols) * spacing + rng.uniform(-jitter, jitter) for s in slots))
+    return xs, ys
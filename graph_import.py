@@ -0,0 +1,415 @@
+from array import array
+from bisect import bisect_left
+import gzip
+import mmap
+import os
+import re
+import warnings
+
+from csr_file import HEADER, open_csr, is_csr_file, write_header
+from dfs_core import CSRGraph, IdLabels, _little, np
+from dfs_trace import _align
+
+# ----------- Streaming graph importer (no tkinter in here) ------------
+# Reads edge lists in CHUNK_BYTES pieces that end on a line break (through
+# mmap for plain files, buffered reads for .gz) and turns each chunk straight
+# into id arrays, so no per-edge tuples are ever built. Supported layouts:
+#
+#   edges  "u v" per line, whitespace separated, "#" / "%" comment lines
+#   snap   the SNAP edge-list format, which is the same thing
+#   csv    comma separated, optional header row, columns picked by index or name
+#
+# Integer node ids are kept as numbers and remapped to dense ids in sorted
+# order (labels stay the original ids; files that already use 0..n-1 get
+# plain IdLabels). Any other labels go through a label -> id table in order
+# of first appearance. Extra columns (weights, timestamps) are ignored.
+#
+# .csr files (see csr_file) are opened through mmap instead of read, and
+# build_csr_file turns an edge list into one without holding its edges in
+# memory, for graphs too big to load.
+
+FORMATS = ("edges", "snap", "csv", "csr")
+CHUNK_BYTES = 16 << 20
+COMMENT_LINE = re.compile(rb"^[ \t]*[#%][^\n]*(\n|$)", re.MULTILINE)
+
+class ArrayLabels:
+    # sorted original integer ids; label i is str(values[i])
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i):
+        return str(self.values[i])
+
+    def __iter__(self):
+        return map(str, self.values)
+
+    def find(self, label):
+        try:
+            value = int(label)
+        except ValueError:
+            raise KeyError(label) from None
+        i = bisect_left(self.values, value)
+        if i == len(self.values) or self.values[i] != value:
+            raise KeyError(label)
+        return i
+
+def guess_format(path):
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith(".csr"):
+        return "csr"
+    return "csv" if name.endswith(".csv") else "edges"
+
+def read_chunks(path, chunk_bytes=CHUNK_BYTES):
+    # byte chunks of whole lines; the last one may lack a trailing newline
+    if path.lower().endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            rest = b""
+            while True:
+                block = f.read(chunk_bytes)
+                if not block:
+                    break
+                block = rest + block
+                cut = block.rfind(b"\n") + 1
+                if cut:
+                    rest = block[cut:]
+                    yield block[:cut]
+                else:
+                    rest = block
+            if rest:
+                yield rest
+        return
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos, size = 0, len(mm)
+            while pos < size:
+                end = mm.find(b"\n", min(pos + chunk_bytes, size) - 1)
+                end = size if end < 0 else end + 1
+                yield mm[pos:end]
+                pos = end
+
+def load_graph(path, fmt=None, directed=False, columns=(0, 1), chunk_bytes=CHUNK_BYTES):
+    fmt = fmt or ("csr" if is_csr_file(path) else guess_format(path))
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown graph format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    if fmt == "csr":
+        return open_csr(path)  # mapped, not read; directed is whatever it was built with
+    reader = EdgeReader(b"," if fmt == "csv" else None, columns, header=fmt == "csv")
+    for chunk in read_chunks(path, chunk_bytes):
+        reader.feed(chunk)
+    return reader.graph(directed)
+
+# ----------- Edge list -> .csr file in bounded memory ------------
+# Two passes over the file: count degrees, then drop every edge into its
+# node's slot of the mapped targets section. Each node's neighbors are then
+# sorted and deduplicated in place, so the result has the same adjacency as
+# load_graph on a file whose ids are already 0..n-1. Memory is O(n) for the
+# degree counts plus one chunk of edges, never O(m).
+#
+# Only integer ids are supported (a label table would itself be O(n) strings
+# and needs a third pass); node ids are used as they are, n = largest id + 1.
+
+def build_csr_file(edge_path, csr_path, directed=False, fmt=None, columns=(0, 1), chunk_bytes=CHUNK_BYTES):
+    fmt = fmt or guess_format(edge_path)
+    if fmt not in ("edges", "snap", "csv"):
+        raise ValueError(f"cannot convert {fmt!r} files to CSR")
+    degrees = _count_degrees(edge_path, fmt, columns, chunk_bytes, directed)
+    n = len(degrees)
+    if not n:
+        raise ValueError("no edges found")
+    offsets = array("q", [0]) * (n + 1)
+    for u in range(n):
+        offsets[u + 1] = offsets[u] + degrees[u]
+    m = offsets[n]
+    del degrees
+    with open(csr_path, "w+b") as f:
+        f.write(b"\0" * HEADER.size)
+        offsets_at = _align(f)
+        targets_at = offsets_at + 8 * (n + 1)
+        f.truncate(targets_at + 4 * max(m, 1))
+        with mmap.mmap(f.fileno(), 0) as mm:
+            targets = memoryview(mm)[targets_at:targets_at + 4 * m].cast("i")
+            _fill_targets(edge_path, fmt, columns, chunk_bytes, directed, offsets, targets)
+            m = _sort_segments(offsets, targets)
+            targets.release()
+            mm[offsets_at:targets_at] = _little(offsets, "q")
+        f.truncate(targets_at + 4 * m)
+        write_header(f, n, m, directed, offsets_at, targets_at)
+    return open_csr(csr_path)
+
+def _edge_chunks(path, fmt, columns, chunk_bytes):
+    # (src, dst) id arrays per chunk, without keeping earlier chunks around
+    reader = EdgeReader(b"," if fmt == "csv" else None, columns, header=fmt == "csv")
+    for chunk in read_chunks(path, chunk_bytes):
+        reader.feed(chunk)
+        if reader.table is not None:
+            raise ValueError("only integer node ids can be converted to CSR without loading the graph")
+        for us, vs in zip(reader.src, reader.dst):
+            if len(us):
+                lo, hi = (min(int(us.min()), int(vs.min())), max(int(us.max()), int(vs.max()))) \
+                    if np is not None and not isinstance(us, array) else (min(min(us), min(vs)), max(max(us), max(vs)))
+                if lo < 0 or hi >= 2 ** 31:
+                    raise ValueError("node ids must be between 0 and 2**31 - 1")
+                yield us, vs, hi + 1
+        reader.src, reader.dst = [], []
+
+def _count_degrees(path, fmt, columns, chunk_bytes, directed):
+    degrees = array("q")
+    for us, vs, top in _edge_chunks(path, fmt, columns, chunk_bytes):
+        if top > len(degrees):
+            degrees.extend(array("q", [0]) * (top - len(degrees)))
+        pairs = ((us, vs),) if directed else ((us, vs), (vs, us))
+        if np is not None:
+            view = np.frombuffer(degrees, dtype=np.int64)
+            for src, dst in pairs:
+                src = np.asarray(src, dtype=np.int64)
+                src = src[src != np.asarray(dst, dtype=np.int64)]
+                counts = np.bincount(src)
+                view[:len(counts)] += counts
+            del view  # the array cannot grow while a view of it is alive
+        else:
+            for src, dst in pairs:
+                for u, v in zip(src, dst):
+                    if u != v:
+                        degrees[u] += 1
+    return degrees
+
+def _fill_targets(path, fmt, columns, chunk_bytes, directed, offsets, targets):
+    cursor = offsets[:-1]  # next free slot of every node
+    for us, vs, _ in _edge_chunks(path, fmt, columns, chunk_bytes):
+        pairs = ((us, vs),) if directed else ((us, vs), (vs, us))
+        if np is not None:
+            out = np.frombuffer(targets, dtype=np.int32)
+            at = np.frombuffer(cursor, dtype=np.int64)
+            for src, dst in pairs:
+                src = np.asarray(src, dtype=np.int64)
+                dst = np.asarray(dst, dtype=np.int64)
+                keep = src != dst
+                src, dst = src[keep], dst[keep]
+                if not len(src):
+                    continue
+                # group by source; rank is the position inside the group
+                by_src = np.argsort(src, kind="stable")
+                src, dst = src[by_src], dst[by_src]
+                starts = np.flatnonzero(np.concatenate(([True], src[1:] != src[:-1])))
+                group = np.cumsum(np.concatenate(([True], src[1:] != src[:-1]))) - 1
+                out[at[src] + np.arange(len(src)) - starts[group]] = dst
+                at[src[starts]] += np.diff(np.append(starts, len(src)))
+            del out, at
+        else:
+            for src, dst in pairs:
+                for u, v in zip(src, dst):
+                    if u != v:
+                        targets[cursor[u]] = v
+                        cursor[u] += 1
+
+def _sort_segments(offsets, targets):
+    # sort and dedupe every neighbor list, compacting towards the front;
+    # returns the new edge count (offsets are rewritten to match)
+    write = 0
+    n = len(offsets) - 1
+    if np is not None:
+        out = np.frombuffer(targets, dtype=np.int32)
+        starts = np.frombuffer(offsets, dtype=np.int64)
+        u = 0
+        while u < n:
+            # a block of whole nodes holding about a million edges; offsets[hi]
+            # is still the original value when the next block reads it
+            lo = int(starts[u])
+            hi = max(u + 1, int(np.searchsorted(starts, lo + (1 << 20), side="right")) - 1)
+            hi = min(hi, n)
+            end = int(starts[hi])
+            keys = np.repeat(np.arange(hi - u, dtype=np.int64), np.diff(starts[u:hi + 1])) * n + out[lo:end]
+            keys.sort()
+            if len(keys):
+                keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+            out[write:write + len(keys)] = keys % n
+            counts = np.bincount(keys // n, minlength=hi - u)
+            starts[u:hi] = write + np.concatenate(([0], np.cumsum(counts)[:-1]))
+            write += len(keys)
+            u = hi
+        del out, starts
+    else:
+        for u in range(n):
+            segment = sorted(set(targets[offsets[u]:offsets[u + 1]]))
+            offsets[u] = write
+            targets[write:write + len(segment)] = array("i", segment)
+            write += len(segment)
+    offsets[n] = write
+    return write
+
+class EdgeReader:
+    def __init__(self, sep=None, columns=(0, 1), header=False):
+        self.sep = sep
+        self.columns = columns
+        self.header = header  # a CSV may start with column names
+        self.width = None     # fields per line, from the first data line
+        self.src = []         # per-chunk id arrays
+        self.dst = []
+        self.table = None     # label -> id once a label turned out not to be an integer
+        self.lines = 0
+
+    # ---------- Chunks ----------
+    def feed(self, chunk):
+        if b"#" in chunk or b"%" in chunk:
+            chunk = COMMENT_LINE.sub(b"", chunk)
+        if self.width is None:
+            chunk = self._first_line(chunk)
+            if self.width is None:
+                return
+        if self.table is None and self._feed_numbers(chunk):
+            return
+        self._feed_lines(chunk)
+
+    def _split(self, line):
+        if self.sep is None:
+            return line.split()
+        return [field.strip().strip(b'"') for field in line.split(self.sep)]
+
+    def _first_line(self, chunk):
+        # settle the field count and columns on the first non-blank line
+        for start, line in self._lines_with_offsets(chunk):
+            fields = self._split(line)
+            if not fields or fields == [b""]:
+                continue
+            self.width = len(fields)
+            names = [f.decode("utf-8", "replace") for f in fields]
+            is_header = self.header and not all(_is_int(f) for f in fields)
+            if is_header:
+                self.columns = tuple(names.index(c) if isinstance(c, str) else c for c in self.columns)
+            elif any(isinstance(c, str) for c in self.columns):
+                raise ValueError("column names need a header row")
+            if max(self.columns) >= self.width:
+                raise ValueError(f"expected at least {max(self.columns) + 1} columns, found {self.width}")
+            return chunk[start + len(line) + 1:] if is_header else chunk[start:]
+        return b""
+
+    @staticmethod
+    def _lines_with_offsets(chunk):
+        start = 0
+        while start < len(chunk):
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                end = len(chunk)
+            yield start, chunk[start:end]
+            start = end + 1
+
+    def _feed_numbers(self, chunk):
+        # fast path: the whole chunk is integers in a regular table
+        if np is None:
+            return False
+        text = chunk if self.sep is None else chunk.replace(self.sep, b" ")
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            try:
+                values = np.fromstring(text, dtype=np.int64, sep=" ")
+            except ValueError:  # newer NumPy raises where older ones warned
+                return False
+        rows = chunk.count(b"\n") + (not chunk.endswith(b"\n") and bool(chunk.strip()))
+        if caught or len(values) != rows * self.width:
+            return False  # labels, blank lines or ragged rows: take the careful path
+        values = values.reshape(rows, self.width)
+        a, b = self.columns
+        self.src.append(values[:, a].copy())
+        self.dst.append(values[:, b].copy())
+        self.lines += rows
+        return True
+
+    def _feed_lines(self, chunk):
+        a, b = self.columns
+        width = max(a, b) + 1
+        us, vs = [], []
+        for line in chunk.split(b"\n"):
+            fields = self._split(line)
+            if len(fields) >= width and fields[a] and fields[b]:
+                us.append(fields[a])
+                vs.append(fields[b])
+        self.lines += len(us)
+        if self.table is None:
+            try:
+                src, dst = array("q", map(int, us)), array("q", map(int, vs))
+            except ValueError:
+                self._switch_to_labels()
+            else:
+                self.src.append(src)
+                self.dst.append(dst)
+                return
+        self._add_labels(us, vs)
+
+    def _add_labels(self, us, vs):
+        # ids in order of first appearance, reading the file front to back
+        table, src, dst = self.table, array("i"), array("i")
+        for u, v in zip(us, vs):
+            src.append(table.setdefault(u, len(table)))
+            dst.append(table.setdefault(v, len(table)))
+        self.src.append(src)
+        self.dst.append(dst)
+
+    def _switch_to_labels(self):
+        # the integers read so far become labels like any other
+        chunks = list(zip(self.src, self.dst))
+        self.table, self.src, self.dst = {}, [], []
+        for us, vs in chunks:
+            self._add_labels([b"%d" % u for u in us.tolist()], [b"%d" % v for v in vs.tolist()])
+
+    # ---------- Result ----------
+    def graph(self, directed=False):
+        if not self.lines:
+            raise ValueError("no edges found")
+        if self.table is not None:
+            labels = [label.decode("utf-8", "replace") for label in self.table]
+            us, vs = _concat(self.src, "i"), _concat(self.dst, "i")
+            self.src, self.dst = [], []
+            return CSRGraph.from_edges(len(labels), us, vs, labels, undirected=not directed)
+        us, vs = _concat(self.src, "q"), _concat(self.dst, "q")
+        self.src, self.dst = [], []
+        if np is not None:
+            both = np.sort(np.concatenate((us, vs)))
+            if len(both):
+                both = both[np.concatenate(([True], both[1:] != both[:-1]))]
+            n = len(both)
+            if n and (both[0] != 0 or both[-1] != n - 1):
+                us, vs = _dense_ids(both, us), _dense_ids(both, vs)
+                return CSRGraph.from_edges(n, us, vs, ArrayLabels(array("q", both.tobytes())), undirected=not directed)
+            return CSRGraph.from_edges(n, us, vs, IdLabels(n), undirected=not directed)
+        values = sorted(set(us) | set(vs))
+        n = len(values)
+        if n and (values[0] != 0 or values[-1] != n - 1):
+            dense = {v: i for i, v in enumerate(values)}
+            us, vs = array("i", map(dense.__getitem__, us)), array("i", map(dense.__getitem__, vs))
+            return CSRGraph.from_edges(n, us, vs, ArrayLabels(array("q", values)), undirected=not directed)
+        return CSRGraph.from_edges(n, us, vs, IdLabels(n), undirected=not directed)
+
+def _is_int(field):
+    try:
+        int(field)
+    except ValueError:
+        return False
+    return True
+
+def _dense_ids(values, ids):
+    # position of each id in the sorted unique `values`
+    if values[0] >= 0 and values[-1] < 4 * (len(values) + len(ids)):
+        lookup = np.zeros(int(values[-1]) + 1, dtype=np.int64)
+        lookup[values] = np.arange(len(values))
+        return lookup[ids]
+    # ids spread far apart: binary search, in sorted order because that walks
+    # `values` front to back (much faster), then put the answers back in place
+    order = np.argsort(ids, kind="stable")
+    out = np.empty(len(ids), dtype=np.int64)
+    out[order] = np.searchsorted(values, ids[order])
+    return out
+
+def _concat(chunks, typecode):
+    if np is not None and any(not isinstance(c, array) for c in chunks):
+        return np.concatenate([np.asarray(c, dtype=np.int64) for c in chunks]) if chunks else np.zeros(0, np.int64)
+    out = array(typecode)
+    for c in chunks:
+        out.extend(c)
+    return out
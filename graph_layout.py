@@ -0,0 +1,185 @@
+from array import array
+import math
+import queue
+import random
+import threading
+
+from dfs_core import np
+
+# ----------- Force-directed layout (no tkinter in here) ------------
+# Fruchterman-Reingold spring-electrical layout. Edges pull with d^2 / k,
+# every pair of nodes pushes with k^2 / d. With NumPy the forces are whole
+# array operations: pairwise repulsion is exact up to EXACT_REPULSION_LIMIT
+# nodes, past that it comes from a particle-mesh grid (node density convolved
+# with the k^2 / d kernel by FFT), so an iteration is O(n + m + G^2 log G).
+# Without NumPy only small graphs (PURE_PYTHON_LIMIT) are laid out.
+# Positions are always rescaled into the starting bounding box, so the view
+# that shows them does not need to re-fit while the layout settles.
+
+ITERATIONS = 60
+EXACT_REPULSION_LIMIT = 2000
+PURE_PYTHON_LIMIT = 300
+MAX_GRID = 256
+
+def can_layout(n):
+    return np is not None or n <= PURE_PYTHON_LIMIT
+
+class ForceLayout:
+    def __init__(self, graph, xs, ys, iterations=ITERATIONS, seed=None):
+        self.graph = graph
+        self.n = graph.n
+        self.iterations = iterations
+        self.done = 0
+        self.bounds = (min(xs), min(ys), max(xs), max(ys)) if self.n else (0, 0, 1, 1)
+        x0, y0, x1, y1 = self.bounds
+        area = max(x1 - x0, 1) * max(y1 - y0, 1)
+        self.k = math.sqrt(area / max(self.n, 1))
+        self.temperature = max(x1 - x0, y1 - y0) / 10
+        self.cooling = 0.05 ** (1 / max(iterations, 1))
+        if np is not None:
+            self.pos = np.column_stack((np.frombuffer(xs, dtype=np.float64) if isinstance(xs, array) else np.asarray(xs, dtype=np.float64),
+                                        np.frombuffer(ys, dtype=np.float64) if isinstance(ys, array) else np.asarray(ys, dtype=np.float64))).copy()
+            offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+            self.src = np.repeat(np.arange(self.n), np.diff(offsets))
+            self.dst = np.frombuffer(graph.targets, dtype=np.int32).astype(np.int64)
+            # nodes sitting exactly on top of each other never separate; nudge them
+            self.pos += np.random.default_rng(seed).uniform(-1e-3, 1e-3, self.pos.shape) * self.k
+        else:
+            if self.n > PURE_PYTHON_LIMIT:
+                raise ValueError(f"laying out {self.n} nodes needs NumPy")
+            rng = random.Random(seed)
+            self.xs = [x + rng.uniform(-1e-3, 1e-3) for x in xs]
+            self.ys = [y + rng.uniform(-1e-3, 1e-3) for y in ys]
+
+    @property
+    def finished(self):
+        return self.done >= self.iterations
+
+    def step(self):
+        if self.n > 1:
+            if np is not None:
+                self._step_numpy()
+            else:
+                self._step_python()
+        self.temperature *= self.cooling
+        self.done += 1
+
+    def _step_numpy(self):
+        pos, k = self.pos, self.k
+        if self.n <= EXACT_REPULSION_LIMIT:
+            disp = self._repulsion_exact(pos, k)
+        else:
+            disp = self._repulsion_grid(pos, k)
+        delta = pos[self.dst] - pos[self.src]
+        dist = np.sqrt((delta * delta).sum(axis=1)) + 1e-9
+        pull = delta * (dist / k)[:, None]
+        disp[:, 0] += np.bincount(self.src, weights=pull[:, 0], minlength=self.n)
+        disp[:, 1] += np.bincount(self.src, weights=pull[:, 1], minlength=self.n)
+        length = np.sqrt((disp * disp).sum(axis=1)) + 1e-9
+        pos += disp * (np.minimum(length, self.temperature) / length)[:, None]
+
+    def _repulsion_exact(self, pos, k, chunk=512):
+        disp = np.zeros_like(pos)
+        for lo in range(0, self.n, chunk):
+            delta = pos[lo:lo + chunk, None, :] - pos[None, :, :]
+            d2 = (delta * delta).sum(axis=2) + 1e-9
+            disp[lo:lo + chunk] = (delta * (k * k / d2)[:, :, None]).sum(axis=1)
+        return disp
+
+    def _repulsion_grid(self, pos, k):
+        # particle-mesh: bin nodes on a G x G grid, convolve the counts with
+        # the repulsion kernel by FFT, read the force back at each node's cell
+        g = int(min(MAX_GRID, max(16, 2 * math.sqrt(self.n))))
+        lo = pos.min(axis=0)
+        h = max((pos.max(axis=0) - lo).max(), 1e-9) / (g - 1)
+        cell = np.clip(np.rint((pos - lo) / h).astype(np.int64), 0, g - 1)
+        flat = cell[:, 0] * g + cell[:, 1]
+        density = np.bincount(flat, minlength=g * g).reshape(g, g).astype(np.float64)
+        size = 2 * g
+        offs = np.fft.fftfreq(size, 1 / size)  # 0, 1, ..., g - 1, -g, ..., -1
+        dx = (offs * h)[:, None]
+        dy = (offs * h)[None, :]
+        d2 = dx * dx + dy * dy
+        d2[0, 0] = 1.0
+        scale = k * k / d2
+        scale[0, 0] = 0.0
+        spectrum = np.fft.rfft2(density, s=(size, size))
+        fx = np.fft.irfft2(spectrum * np.fft.rfft2(dx * scale), s=(size, size))[:g, :g]
+        fy = np.fft.irfft2(spectrum * np.fft.rfft2(dy * scale), s=(size, size))[:g, :g]
+        return np.column_stack((fx.ravel()[flat], fy.ravel()[flat]))
+
+    def _step_python(self):
+        xs, ys, k, n = self.xs, self.ys, self.k, self.n
+        dx = [0.0] * n
+        dy = [0.0] * n
+        for i in range(n):
+            for j in range(i + 1, n):
+                ddx, ddy = xs[i] - xs[j], ys[i] - ys[j]
+                f = k * k / (ddx * ddx + ddy * ddy + 1e-9)
+                dx[i] += ddx * f
+                dy[i] += ddy * f
+                dx[j] -= ddx * f
+                dy[j] -= ddy * f
+        offsets, targets = self.graph.offsets, self.graph.targets
+        for u in range(n):
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                ddx, ddy = xs[v] - xs[u], ys[v] - ys[u]
+                f = math.sqrt(ddx * ddx + ddy * ddy) / k
+                dx[u] += ddx * f
+                dy[u] += ddy * f
+        t = self.temperature
+        for i in range(n):
+            length = math.sqrt(dx[i] * dx[i] + dy[i] * dy[i]) + 1e-9
+            move = min(length, t) / length
+            xs[i] += dx[i] * move
+            ys[i] += dy[i] * move
+
+    def positions(self):
+        # current positions rescaled into the starting bounds, as array("d")
+        x0, y0, x1, y1 = self.bounds
+        if np is not None:
+            pos = self.pos
+            lo, hi = pos.min(axis=0), pos.max(axis=0)
+            span = np.where(hi - lo > 0, hi - lo, 1.0)
+            out = (pos - lo) / span * np.array([x1 - x0, y1 - y0]) + np.array([x0, y0])
+            return array("d", np.ascontiguousarray(out[:, 0]).tobytes()), array("d", np.ascontiguousarray(out[:, 1]).tobytes())
+        lx, hx, ly, hy = min(self.xs), max(self.xs), min(self.ys), max(self.ys)
+        sx = (x1 - x0) / (hx - lx) if hx > lx else 0.0
+        sy = (y1 - y0) / (hy - ly) if hy > ly else 0.0
+        return (array("d", (x0 + (x - lx) * sx for x in self.xs)),
+                array("d", (y0 + (y - ly) * sy for y in self.ys)))
+
+# ----------- Background runner ------------
+# Runs a layout on a worker thread and drops (xs, ys) snapshots into a queue
+# every `every` iterations. The Tk side polls the queue with after().
+class LayoutJob(threading.Thread):
+    # `build`, if given, turns each (xs, ys) snapshot into whatever the UI
+    # needs (a spatial index, say) here on the job thread; latest() returns that
+    def __init__(self, layout, every=5, build=None):
+        super().__init__(daemon=True)
+        self.layout = layout
+        self.every = every
+        self.build = build
+        self.updates = queue.Queue()
+        self.cancelled = threading.Event()
+
+    def run(self):
+        layout = self.layout
+        while not layout.finished and not self.cancelled.is_set():
+            layout.step()
+            if layout.done % self.every == 0 or layout.finished:
+                snapshot = layout.positions()
+                self.updates.put(snapshot if self.build is None else self.build(*snapshot))
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def latest(self):
+        # newest snapshot waiting in the queue, or None
+        snapshot = None
+        while True:
+            try:
+                snapshot = self.updates.get_nowait()
+            except queue.Empty:
+                return snapshot
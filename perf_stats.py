@@ -0,0 +1,186 @@
+from array import array
+import csv
+import functools
+import json
+import os
+import threading
+import time
+
+# ----------- Hot-path timers, counters and event-loop lag (no tkinter) ------------
+# Wrap a function with @timed("name") or a block with `with span("name"):`.
+# While instrumentation is off (the default; DFS_PERF=1 turns it on at start,
+# enable() / disable() at run time) a timed call costs one attribute check.
+# While it is on, every call adds its duration to a Metric: count, total, max
+# and the last SAMPLES_KEPT samples for percentiles. Metrics can be recorded
+# from worker threads too.
+
+SAMPLES_KEPT = 1024
+LAG_INTERVAL_MS = 50
+
+class Metric:
+    __slots__ = ("name", "count", "total", "max", "samples", "next")
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = array("d")
+        self.next = 0  # ring buffer slot to overwrite once samples is full
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if len(self.samples) < SAMPLES_KEPT:
+            self.samples.append(seconds)
+        else:
+            self.samples[self.next] = seconds
+            self.next = (self.next + 1) % SAMPLES_KEPT
+
+    def percentile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def row(self):
+        ms = 1000.0
+        return {
+            "name": self.name, "count": self.count, "total_ms": self.total * ms,
+            "mean_ms": self.total * ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.5) * ms, "p95_ms": self.percentile(0.95) * ms,
+            "p99_ms": self.percentile(0.99) * ms, "max_ms": self.max * ms,
+        }
+
+class Registry:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.metrics = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = Metric(name)
+            metric.add(seconds)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        with self.lock:
+            self.metrics = {}
+            self.counters = {}
+
+    def rows(self):
+        # timers by total time (heaviest first), then counters
+        with self.lock:
+            rows = sorted((m.row() for m in self.metrics.values()), key=lambda r: -r["total_ms"])
+            rows.extend({"name": name, "count": n} for name, n in sorted(self.counters.items()))
+        return rows
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"exported_at": time.time(), "metrics": self.rows()}, f, indent=2)
+
+    def export_csv(self, path):
+        fields = ["name", "count", "total_ms", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+REGISTRY = Registry(enabled=os.environ.get("DFS_PERF", "") not in ("", "0"))
+
+def enabled():
+    return REGISTRY.enabled
+
+def enable():
+    REGISTRY.enabled = True
+
+def disable():
+    REGISTRY.enabled = False
+
+def count(name, n=1):
+    if REGISTRY.enabled:
+        REGISTRY.count(name, n)
+
+def timed(name):
+    def wrap(func):
+        @functools.wraps(func)
+        def timed_call(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return func(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.record(name, time.perf_counter() - t0)
+        return timed_call
+    return wrap
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.record(self.name, time.perf_counter() - self.t0)
+        return False
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+def span(name):
+    return _Span(name) if REGISTRY.enabled else _NO_SPAN
+
+# ----------- Event-loop lag ------------
+# Asks the widget's event loop to call back every interval_ms and records how
+# late each callback ran as "event_loop.lag"; a long Tk callback anywhere in
+# the app shows up here even if nobody timed it.
+class LagMonitor:
+    def __init__(self, widget, interval_ms=LAG_INTERVAL_MS):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.job = None
+        self.due = 0.0
+
+    @property
+    def running(self):
+        return self.job is not None
+
+    def start(self):
+        if self.job is None:
+            self._schedule()
+
+    def stop(self):
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+
+    def _schedule(self):
+        self.due = time.perf_counter() + self.interval_ms / 1000
+        self.job = self.widget.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        if REGISTRY.enabled:
+            REGISTRY.record("event_loop.lag", max(0.0, time.perf_counter() - self.due))
+        self._schedule()
@@ -0,0 +1,111 @@
+from array import array
+
+# ----------- Uniform grid spatial index ------------
+# Buckets node ids by the grid cell their center falls in. A point query only
+# looks at the few cells a node box of `radius` could reach, so click
+# hit-testing no longer depends on how many nodes are on the canvas.
+
+class GridIndex:
+    def __init__(self, radius=20, cell_size=None):
+        self.radius = radius
+        self.cell = cell_size or 2 * radius
+        self.cells = {}
+        self.xs = array("d")
+        self.ys = array("d")
+        self.alive = bytearray()
+
+    def __len__(self):
+        return sum(len(ids) for ids in self.cells.values())
+
+    def _key(self, x, y):
+        return (int(x // self.cell), int(y // self.cell))
+
+    def clear(self):
+        self.cells = {}
+        self.xs = array("d")
+        self.ys = array("d")
+        self.alive = bytearray()
+
+    def build(self, xs, ys):
+        # ids are positions in xs / ys
+        self.clear()
+        self.xs = array("d", xs)
+        self.ys = array("d", ys)
+        self.alive = bytearray(b"\x01") * len(self.xs)
+        cells, cell = self.cells, self.cell
+        for i in range(len(self.xs)):
+            key = (int(self.xs[i] // cell), int(self.ys[i] // cell))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [i]
+            else:
+                bucket.append(i)
+
+    def insert(self, i, x, y):
+        while len(self.xs) <= i:
+            self.xs.append(0.0)
+            self.ys.append(0.0)
+            self.alive.append(0)
+        if self.alive[i]:
+            self.remove(i)
+        self.xs[i], self.ys[i] = x, y
+        self.alive[i] = 1
+        self.cells.setdefault(self._key(x, y), []).append(i)
+
+    def remove(self, i):
+        if i >= len(self.alive) or not self.alive[i]:
+            return
+        key = self._key(self.xs[i], self.ys[i])
+        bucket = self.cells[key]
+        bucket.remove(i)
+        if not bucket:
+            del self.cells[key]
+        self.alive[i] = 0
+
+    def move(self, i, x, y):
+        if i >= len(self.alive) or not self.alive[i]:
+            self.insert(i, x, y)
+            return
+        old = self._key(self.xs[i], self.ys[i])
+        new = self._key(x, y)
+        if old != new:
+            self.remove(i)
+            self.insert(i, x, y)
+        else:
+            self.xs[i], self.ys[i] = x, y
+
+    def query_point(self, x, y):
+        # same box test as the old linear scan; lowest id wins on overlap
+        r = self.radius
+        kx0, ky0 = self._key(x - r, y - r)
+        kx1, ky1 = self._key(x + r, y + r)
+        xs, ys, cells = self.xs, self.ys, self.cells
+        best = None
+        for kx in range(kx0, kx1 + 1):
+            for ky in range(ky0, ky1 + 1):
+                for i in cells.get((kx, ky), ()):
+                    if abs(xs[i] - x) <= r and abs(ys[i] - y) <= r and (best is None or i < best):
+                        best = i
+        return best
+
+    def query_rect(self, x0, y0, x1, y1):
+        # ids whose centers lie inside the rectangle (rubber-band selection)
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        kx0, ky0 = self._key(x0, y0)
+        kx1, ky1 = self._key(x1, y1)
+        xs, ys, cells = self.xs, self.ys, self.cells
+        found = []
+        if (kx1 - kx0 + 1) * (ky1 - ky0 + 1) > len(cells):
+            # huge rectangle: walking the occupied cells is cheaper
+            keys = [k for k in cells if kx0 <= k[0] <= kx1 and ky0 <= k[1] <= ky1]
+        else:
+            keys = [(kx, ky) for kx in range(kx0, kx1 + 1) for ky in range(ky0, ky1 + 1)]
+        for key in keys:
+            for i in cells.get(key, ()):
+                if x0 <= xs[i] <= x1 and y0 <= ys[i] <= y1:
+                    found.append(i)
+        found.sort()
+        return found
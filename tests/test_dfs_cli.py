@@ -0,0 +1,24 @@
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dfs_cli
+from dfs_core import CSRGraph
+
+def path_graph(n):
+    return CSRGraph.from_edges(n, range(n - 1), range(1, n))
+
+def test_write_order_batches_join_without_trailing_space(monkeypatch):
+    monkeypatch.setattr(dfs_cli, "WRITE_BATCH", 2)
+    for n in (1, 3, 4):  # 4 is an exact multiple of the batch size
+        out = io.StringIO()
+        assert dfs_cli.write_order(out, path_graph(n), 0) == n
+        assert out.getvalue() == " ".join(map(str, range(n))) + "\n"
+
+def test_write_order_limit(monkeypatch):
+    monkeypatch.setattr(dfs_cli, "WRITE_BATCH", 2)
+    out = io.StringIO()
+    assert dfs_cli.write_order(out, path_graph(6), 0, limit=4) == 4
+    assert out.getvalue() == "0 1 2 3\n"
@@ -0,0 +1,39 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dfs_analytics import connected_components
+from dfs_core import CSRGraph, dfs_order
+from dfs_incremental import IncrementalDFS
+
+def path_graph():
+    return CSRGraph.from_adjacency({"A": ["B"], "B": ["A", "C"], "C": ["B", "D"], "D": ["C"]})
+
+def test_to_csr_drops_removed_nodes():
+    dfs = IncrementalDFS(path_graph(), 0)
+    dfs.remove_node(1)
+    graph = dfs.graph.to_csr()
+    assert graph.n == 3
+    assert list(graph.labels) == ["A", "C", "D"]
+    assert list(dfs.graph.live_ids()) == [0, 2, 3]
+    assert connected_components(graph)[1] == 2  # A alone, C - D; no component for B
+
+def test_to_csr_keeps_ids_without_removals():
+    dfs = IncrementalDFS(path_graph(), 0)
+    dfs.add_edge(0, 3)
+    graph = dfs.graph.to_csr()
+    assert graph.n == 4
+    assert connected_components(graph)[1] == 1
+    assert [graph.labels[u] for u in dfs_order(graph, 0)] == [graph.labels[u] for u in dfs.order]
+
+def test_add_node_picks_a_free_label():
+    graph = CSRGraph.from_adjacency({"E": ["F"], "F": ["E"]})  # the next default would be "C"...
+    dfs = IncrementalDFS(graph, 0)
+    dfs.add_node()
+    dfs.add_node()  # ...then "D", and for ids 4 and 5 "E" and "F" are taken
+    dfs.add_node()
+    new = dfs.add_node()
+    labels = dfs.graph.labels
+    assert len(set(labels)) == len(labels)
+    assert labels[new] == "F_2"